@@ -0,0 +1,44 @@
+from rest_framework.pagination import CursorPagination
+
+from dashboard.conditional import conditional_on
+from residents.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class IdCursorPagination(CursorPagination):
+    """Cursor pagination on the primary key, so every page is an index seek"""
+    ordering = 'id'
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin limiting output to a comma-separated ?fields= list"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Nested serializers are declared without a request and keep all fields
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request else None
+        if requested:
+            wanted = {name.strip() for name in requested.split(',')}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin answering conditional list and detail requests with 304
+    while the viewset's model and ``conditional_models`` are unchanged.
+    """
+    conditional_models = []
+
+    def conditional(self, action, request, *args, **kwargs):
+        labels = [self.queryset.model._meta.label, *self.conditional_models]
+        return conditional_on(*labels)(action)(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.db import connections
+
+# Alias of the read-only database report views read from (see DATABASES)
+READ_ALIAS = 'reports'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+@contextmanager
+def reading_from(alias=READ_ALIAS):
+    """Send the ORM reads made inside the block to ``alias``"""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def reads_from_replica(view):
+    """Serve a read-only view from the READ_ALIAS database"""
+    if iscoroutinefunction(view):
+        # sync_to_async and the report query pool carry the alias along
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with reading_from(READ_ALIAS):
+                return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with reading_from(READ_ALIAS):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def is_same_database(alias, other='default'):
+    # A test mirror, or a read alias left pointing at the primary file
+    return connections[alias].settings_dict['NAME'] == connections[other].settings_dict['NAME']
+
+
+class ReadReplicaRouter:
+    """
+    Writes and migrations always go to ``default``. Reads go to the alias
+    set by reads_from_replica/reading_from, unless that alias is the
+    primary database itself: with WAL a reader on the primary already
+    never blocks a writer, so a second connection would buy nothing.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or is_same_database(alias):
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,222 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Limits for every view unless QUERY_BUDGET or @query_budget says otherwise;
+# None means unlimited
+DEFAULT_BUDGET = {
+    'queries': 50,
+    # Most executions of a single SQL shape, i.e. the length of an N+1 loop
+    'duplicates': 10,
+    'db_time_ms': None,
+}
+
+PLACEHOLDER_LIST_RE = re.compile(r'\((?:%s|\?)(?:,\s*(?:%s|\?))+\)')
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# Recorder of the current request. It travels with the request's context,
+# so queries made through sync_to_async or on worker threads count too
+_active_recorder = ContextVar('query_recorder', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised instead of logging a warning when QUERY_BUDGET['RAISE'] is set, as in tests"""
+
+
+def sql_shape(sql):
+    """SQL with literals and IN lists collapsed, so the queries of an N+1 loop share one shape"""
+    return LITERAL_RE.sub('?', PLACEHOLDER_LIST_RE.sub('(...)', sql))
+
+
+class QueryRecorder:
+    """Database execute wrapper noting the shape and duration of every query"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql_shape(sql), (time.perf_counter() - started) * 1000))
+
+    @contextmanager
+    def record(self):
+        record_in_thread()
+        token = _active_recorder.set(self)
+        try:
+            yield self
+        finally:
+            _active_recorder.reset(token)
+
+    def summary(self):
+        shapes = Counter(shape for shape, _ in self.queries)
+        worst, repeats = shapes.most_common(1)[0] if shapes else ('', 0)
+        return {
+            'queries': len(self.queries),
+            'db_time_ms': round(sum(duration for _, duration in self.queries), 2),
+            'duplicates': repeats if repeats > 1 else 0,
+            'duplicate_sql': worst if repeats > 1 else '',
+        }
+
+
+def record_active(execute, sql, params, many, context):
+    """Execute wrapper handing the query to the recorder of the current context, if any"""
+    recorder = _active_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_recorder(connection, **kwargs):
+    # First in the list, so execute_wrapper() blocks still pop their own wrapper
+    if record_active not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_active)
+
+
+def record_in_thread():
+    """Make sure this thread's connections report to the active recorder"""
+    for connection in connections.all():
+        install_recorder(connection)
+
+
+connection_created.connect(install_recorder, dispatch_uid='query_budget_recorder')
+
+
+def budget_enabled():
+    """QUERY_BUDGET['ENABLED'], off unless DEBUG when not set"""
+    return getattr(settings, 'QUERY_BUDGET', {}).get('ENABLED', settings.DEBUG)
+
+
+def view_budget(view_name, view_func=None):
+    """DEFAULT_BUDGET, overridden by QUERY_BUDGET['DEFAULT'], QUERY_BUDGET['VIEWS'] and the decorator"""
+    config = getattr(settings, 'QUERY_BUDGET', {})
+    return {
+        **DEFAULT_BUDGET,
+        **config.get('DEFAULT', {}),
+        **config.get('VIEWS', {}).get(view_name, {}),
+        **getattr(view_func, 'query_budget', {}),
+    }
+
+
+def enforce_budget(request, response, recorder, view_func=None):
+    """Add the Server-Timing header, log the summary line and act on an exceeded budget"""
+    match = request.resolver_match
+    view_name = match.view_name if match else request.path
+    summary = recorder.summary()
+    budget = view_budget(view_name, view_func)
+    exceeded = {
+        key: limit for key, limit in budget.items()
+        if limit is not None and summary[key] > limit
+    }
+
+    timing = (
+        f'db;dur={summary["db_time_ms"]};desc="{summary["queries"]} queries", '
+        f'dup;desc="{summary["duplicates"]} repeats"'
+    )
+    # Query statistics are for developers, not for every client
+    if settings.DEBUG:
+        response['Server-Timing'] = ', '.join(filter(None, [response.get('Server-Timing'), timing]))
+
+    line = (
+        f'view={view_name} method={request.method} status={response.status_code} '
+        f'queries={summary["queries"]} db_ms={summary["db_time_ms"]} duplicates={summary["duplicates"]}'
+    )
+    extra = {'query_budget': {'view': view_name, 'status': response.status_code, **summary}}
+    if not exceeded:
+        logger.info(line, extra=extra)
+        return response
+
+    message = f'{line} over budget: ' + ', '.join(
+        f'{key} {summary[key]} > {limit}' for key, limit in exceeded.items()
+    )
+    if 'duplicates' in exceeded:
+        message += f'; repeated SQL: {summary["duplicate_sql"]}'
+    if getattr(settings, 'QUERY_BUDGET', {}).get('RAISE'):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message, extra=extra)
+    return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the queries of every request and hold each view to its budget
+    (see DEFAULT_BUDGET and the QUERY_BUDGET setting). Only installed when
+    QUERY_BUDGET['ENABLED'] is set, or under DEBUG. Queries run while a
+    streaming response is consumed are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not budget_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        request._query_recorder = recorder
+        with recorder.record():
+            response = self.get_response(request)
+        return enforce_budget(request, response, recorder, getattr(request, '_query_budget_view', None))
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        request._query_recorder = recorder
+        with recorder.record():
+            response = await self.get_response(request)
+        return enforce_budget(request, response, recorder, getattr(request, '_query_budget_view', None))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget_view = view_func
+
+
+def query_budget(**budget):
+    """
+    Give a sync or async view its own budget, e.g.
+    ``@query_budget(queries=5, duplicates=2)``. Without QueryBudgetMiddleware
+    installed the decorator records and enforces the budget itself.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if hasattr(request, '_query_recorder'):
+                    return await view(request, *args, **kwargs)
+                recorder = QueryRecorder()
+                with recorder.record():
+                    response = await view(request, *args, **kwargs)
+                return enforce_budget(request, response, recorder, async_wrapper)
+
+            async_wrapper.query_budget = budget
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if hasattr(request, '_query_recorder'):
+                return view(request, *args, **kwargs)
+            recorder = QueryRecorder()
+            with recorder.record():
+                response = view(request, *args, **kwargs)
+            return enforce_budget(request, response, recorder, wrapper)
+
+        wrapper.query_budget = budget
+        return wrapper
+    return decorator
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,6 +55,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'barangay_ims.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,14 +88,121 @@ WSGI_APPLICATION = 'barangay_ims.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# WAL lets report reads run alongside BHW writes; writers take the lock
+# at BEGIN and wait up to `timeout` seconds for it instead of failing
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-32000',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA temp_store=MEMORY',
+]
+
+# Persistent connections only pay off under WSGI, where a worker thread
+# serves request after request. Under ASGI every request gets a new thread,
+# so kept connections are never reused and pile up (Django ticket #33497).
+# wsgi.py defaults this to 600 seconds; runserver, ASGI and commands close
+# connections after each request.
+CONN_MAX_AGE = int(os.environ.get('BARANGAY_IMS_CONN_MAX_AGE', 0))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': '; '.join(SQLITE_PRAGMAS),
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+
+# Read-only alias for the report and dashboard views (barangay_ims.db_router).
+# Point BARANGAY_IMS_REPORTS_DB at a replica file to move report reads off the
+# primary, and refresh it with `manage.py refresh_reports_replica` from cron:
+# it copies the primary with SQLite's online backup and invalidates the cached
+# reports, so they lag the primary by at most the cron interval. Left unset,
+# reports read from the primary.
+DATABASES['reports'] = {
+    **DATABASES['default'],
+    'NAME': os.environ.get('BARANGAY_IMS_REPORTS_DB', DATABASES['default']['NAME']),
+    'OPTIONS': {
+        'init_command': '; '.join([*SQLITE_PRAGMAS, 'PRAGMA query_only=ON']),
+        'timeout': 20,
+        # Readers never need the write lock IMMEDIATE would take at BEGIN
+        'transaction_mode': 'DEFERRED',
+    },
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['barangay_ims.db_router.ReadReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Report pages are cached under per-model generation counters (see
+# dashboard/cache.py). The local-memory cache is per process, so a write
+# handled by one worker does not invalidate another worker's copy: with
+# several worker processes switch to a shared backend such as
+# 'django.core.cache.backends.filebased.FileBasedCache' (check --deploy warns
+# otherwise). Entries expire after TIMEOUT seconds, which bounds how stale a
+# report can get meanwhile.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'barangay-ims',
+        'TIMEOUT': 300,
     }
 }
 
 
+# Report query pool (see dashboard/concurrency.py)
+# Threads, shared by all requests, that run a report's slow independent
+# queries side by side; each holds a database connection. 0 runs every query
+# in the request's own thread.
+
+REPORT_QUERY_WORKERS = int(os.environ.get('BARANGAY_IMS_REPORT_QUERY_WORKERS', 4))
+
+
+# REST API (see barangay_ims/urls.py for the routes)
+# Read-only endpoints for partner systems, paged by cursor so deep pages
+# stay as cheap as the first one
+
+REST_FRAMEWORK = {
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'barangay_ims.api.IdCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
+
+# Query budgets (see barangay_ims/query_budget.py)
+# Opt-in: with ENABLED (by default only under DEBUG) every request's query
+# count, database time and most repeated SQL go to a log line, and under DEBUG
+# a Server-Timing header. Views over budget log a warning; the test runner
+# (barangay_ims.test_runner) turns that into a failure. Per-view limits are
+# keyed by URL name.
+
+QUERY_BUDGET = {
+    'ENABLED': DEBUG,
+    'DEFAULT': {'queries': 50, 'duplicates': 10},
+    'VIEWS': {
+        'dashboard:dashboard': {'queries': 10},
+        'dashboard:residents_list': {'queries': 10, 'duplicates': 2},
+    },
+    'RAISE': False,
+}
+
+TEST_RUNNER = 'barangay_ims.test_runner.TestRunner'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
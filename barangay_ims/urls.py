@@ -16,10 +16,26 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from bhw_reports import api as bhw_api
+from residents import api as residents_api
+
+router = DefaultRouter()
+router.register('residents', residents_api.ResidentViewSet)
+router.register('households', residents_api.HouseholdViewSet)
+router.register('senior-citizens', bhw_api.SeniorCitizenReportViewSet)
+router.register('businesses', bhw_api.SariSariStoreReportViewSet)
+router.register('fourps', bhw_api.FourPsBeneficiaryReportViewSet)
+router.register('pregnancies', bhw_api.PregnancyReportViewSet)
+router.register('health-reports', bhw_api.HealthReportViewSet)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('dashboard.urls')),
     path('residents/', include('residents.urls')),
     path('reports/', include('bhw_reports.urls')),
+    path('api/vitals/residents/<int:resident_id>/', bhw_api.resident_vitals_trend, name='resident_vitals'),
+    path('api/vitals/zones/<str:zone>/', bhw_api.zone_vitals_trend, name='zone_vitals'),
+    path('api/', include(router.urls)),
 ]
@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'barangay_ims.settings')
+# Each WSGI thread serves many requests, so it can keep its connections
+os.environ.setdefault('BARANGAY_IMS_CONN_MAX_AGE', '600')
 
 application = get_wsgi_application()
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import SeniorCitizenReport, SariSariStoreReport, FourPsBeneficiaryReport, PregnancyReport, HealthReport
+from dashboard.bulk import bulk_action
+from .models import SeniorCitizenReport, SariSariStoreReport, FourPsBeneficiaryReport, PregnancyReport, HealthReport, DueItem, TRIMESTER_LABELS
 
 # Register your models here.
 
@@ -8,6 +9,8 @@ class SeniorCitizenReportAdmin(admin.ModelAdmin):
     list_display = ['resident', 'pension_source', 'mobility_status', 'caregiver_name', 'last_checkup_date', 'is_active']
     list_filter = ['pension_source', 'mobility_status', 'is_active']
     search_fields = ['resident__first_name', 'resident__last_name', 'caregiver_name']
+    autocomplete_fields = ['resident']
+    actions = [bulk_action('deactivate', 'Deactivate selected senior citizen reports')]
     
     fieldsets = (
         ('Basic Information', {
@@ -33,6 +36,8 @@ class SariSariStoreReportAdmin(admin.ModelAdmin):
     list_display = ['business_name', 'owner', 'business_type', 'number_of_employees', 'has_proper_sanitation', 'last_inspection_date', 'is_active']
     list_filter = ['business_type', 'has_proper_sanitation', 'has_fire_safety_measures', 'is_active']
     search_fields = ['business_name', 'owner__first_name', 'owner__last_name']
+    autocomplete_fields = ['owner']
+    actions = [bulk_action('deactivate', 'Deactivate selected business reports')]
     
     fieldsets = (
         ('Business Information', {
@@ -58,6 +63,8 @@ class FourPsBeneficiaryReportAdmin(admin.ModelAdmin):
     list_display = ['beneficiary', 'household_id', 'set_of_year', 'monthly_grant_amount', 'education_compliance', 'health_compliance', 'is_active']
     list_filter = ['set_of_year', 'education_compliance', 'health_compliance', 'family_development_sessions', 'is_active']
     search_fields = ['beneficiary__first_name', 'beneficiary__last_name', 'household_id']
+    autocomplete_fields = ['beneficiary']
+    actions = [bulk_action('deactivate', 'Deactivate selected 4Ps beneficiary reports')]
     
     fieldsets = (
         ('Beneficiary Information', {
@@ -85,11 +92,26 @@ class FourPsBeneficiaryReportAdmin(admin.ModelAdmin):
     )
 
 
+class TrimesterFilter(admin.SimpleListFilter):
+    title = 'trimester'
+    parameter_name = 'trimester'
+    
+    def lookups(self, request, model_admin):
+        return [(str(trimester), label) for trimester, label in TRIMESTER_LABELS.items()]
+    
+    def queryset(self, request, queryset):
+        if self.value() in ('1', '2', '3'):
+            return queryset.in_trimester(int(self.value()))
+        return queryset
+
+
 @admin.register(PregnancyReport)
 class PregnancyReportAdmin(admin.ModelAdmin):
-    list_display = ['pregnant_woman', 'pregnancy_number', 'expected_due_date', 'age_of_gestation_weeks', 'high_risk_pregnancy', 'pregnancy_outcome']
-    list_filter = ['high_risk_pregnancy', 'pregnancy_outcome', 'is_active']
+    list_display = ['pregnant_woman', 'pregnancy_number', 'expected_due_date', 'trimester', 'high_risk_pregnancy', 'pregnancy_outcome']
+    list_filter = [TrimesterFilter, 'high_risk_pregnancy', 'pregnancy_outcome', 'is_active']
     search_fields = ['pregnant_woman__first_name', 'pregnant_woman__last_name']
+    autocomplete_fields = ['pregnant_woman']
+    actions = [bulk_action('deactivate', 'Deactivate selected pregnancy reports')]
     
     fieldsets = (
         ('Pregnant Woman Information', {
@@ -122,9 +144,13 @@ class PregnancyReportAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_progress()
+    
     def trimester(self, obj):
         return obj.trimester
     trimester.short_description = 'Trimester'
+    trimester.admin_order_field = 'current_trimester'
 
 
 @admin.register(HealthReport)
@@ -132,6 +158,7 @@ class HealthReportAdmin(admin.ModelAdmin):
     list_display = ['resident', 'report_type', 'report_date', 'healthcare_provider', 'follow_up_needed']
     list_filter = ['report_type', 'follow_up_needed', 'report_date']
     search_fields = ['resident__first_name', 'resident__last_name', 'healthcare_provider']
+    autocomplete_fields = ['resident']
     
     fieldsets = (
         ('Patient Information', {
@@ -150,3 +177,17 @@ class HealthReportAdmin(admin.ModelAdmin):
             'fields': ('follow_up_needed', 'follow_up_date', 'referral_facility')
         })
     )
+
+
+@admin.register(DueItem)
+class DueItemAdmin(admin.ModelAdmin):
+    list_display = ['resident', 'kind', 'due_date', 'zone', 'status', 'completed_at']
+    list_filter = ['kind', 'status', 'resident__zone']
+    search_fields = ['resident__first_name', 'resident__last_name']
+    list_select_related = ['resident']
+    readonly_fields = ['kind', 'source_id', 'resident', 'zone', 'due_date', 'created_at']
+    
+    def zone(self, obj):
+        return obj.resident.zone
+    zone.short_description = 'Zone'
+    zone.admin_order_field = 'resident__zone'
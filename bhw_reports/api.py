@@ -0,0 +1,81 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import viewsets
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from barangay_ims.api import ConditionalGetMixin
+from barangay_ims.db_router import reads_from_replica
+from residents.models import Resident
+
+from .filters import (
+    SeniorCitizenReportFilter, SariSariStoreReportFilter,
+    FourPsBeneficiaryReportFilter, PregnancyReportFilter, HealthReportFilter
+)
+from .models import (
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport, HealthReport
+)
+from .serializers import (
+    SeniorCitizenReportSerializer, SariSariStoreReportSerializer,
+    FourPsBeneficiaryReportSerializer, PregnancyReportSerializer, HealthReportSerializer,
+    VitalsQuerySerializer
+)
+from .trends import resident_vitals, zone_vitals
+
+# Reports are serialized with their resident's name, so resident edits
+# change the responses too
+RESIDENT_MODELS = ['residents.Resident']
+
+
+class SeniorCitizenReportViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_models = RESIDENT_MODELS
+    queryset = SeniorCitizenReport.objects.select_related('resident')
+    serializer_class = SeniorCitizenReportSerializer
+    filterset_class = SeniorCitizenReportFilter
+
+
+class SariSariStoreReportViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_models = RESIDENT_MODELS
+    queryset = SariSariStoreReport.objects.select_related('owner')
+    serializer_class = SariSariStoreReportSerializer
+    filterset_class = SariSariStoreReportFilter
+
+
+class FourPsBeneficiaryReportViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_models = RESIDENT_MODELS
+    queryset = FourPsBeneficiaryReport.objects.select_related('beneficiary')
+    serializer_class = FourPsBeneficiaryReportSerializer
+    filterset_class = FourPsBeneficiaryReportFilter
+
+
+class PregnancyReportViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_models = RESIDENT_MODELS
+    queryset = PregnancyReport.objects.select_related('pregnant_woman')
+    serializer_class = PregnancyReportSerializer
+    filterset_class = PregnancyReportFilter
+
+
+class HealthReportViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_models = RESIDENT_MODELS
+    queryset = HealthReport.objects.select_related('resident')
+    serializer_class = HealthReportSerializer
+    filterset_class = HealthReportFilter
+
+
+@api_view(['GET'])
+@reads_from_replica
+def resident_vitals_trend(request, resident_id):
+    """A resident's vital signs over time with rolling means, slopes and flags"""
+    get_object_or_404(Resident, pk=resident_id)
+    params = VitalsQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return Response(resident_vitals(resident_id, **params.validated_data))
+
+
+@api_view(['GET'])
+@reads_from_replica
+def zone_vitals_trend(request, zone):
+    """Daily mean vital signs across a zone's active residents"""
+    params = VitalsQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return Response(zone_vitals(zone, **params.validated_data))
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class BhwReportsConfig(AppConfig):
     name = 'bhw_reports'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
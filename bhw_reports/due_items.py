@@ -0,0 +1,106 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DueItem, HealthReport, PregnancyReport, ScanWatermark, SeniorCitizenReport
+
+WATERMARK_NAME = 'due_items'
+# Queue items this many days before they fall due
+LOOKAHEAD_DAYS = 7
+# How far back the first run picks up overdue items
+BACKFILL_DAYS = 30
+# Seniors are due for a checkup a year after the last one
+SENIOR_CHECKUP_INTERVAL_DAYS = 365
+
+ONGOING = Q(is_active=True, pregnancy_outcome='ongoing')
+
+# kind -> (model, date field, condition, resident field, days from the date to when it is due)
+DUE_SOURCES = {
+    'follow_up': (HealthReport, 'follow_up_date', Q(follow_up_needed=True), 'resident', 0),
+    'prenatal_visit': (PregnancyReport, 'next_prenatal_visit', ONGOING, 'pregnant_woman', 0),
+    'delivery': (PregnancyReport, 'expected_due_date', ONGOING, 'pregnant_woman', 0),
+    'senior_checkup': (SeniorCitizenReport, 'last_checkup_date', Q(is_active=True), 'resident', SENIOR_CHECKUP_INTERVAL_DAYS),
+}
+
+
+def due_rows(queryset, field, resident_field):
+    return queryset.order_by().values_list('pk', f'{resident_field}_id', field)
+
+
+def queue_items(kind, rows, offset, today):
+    """Queue one open DueItem per row; rows without a date are due today"""
+    items = [
+        DueItem(
+            kind=kind, source_id=pk, resident_id=resident_id,
+            due_date=value + timedelta(days=offset) if value else today,
+        )
+        for pk, resident_id, value in rows
+    ]
+    DueItem.objects.bulk_create(items, batch_size=1000, ignore_conflicts=True)
+    return len(items)
+
+
+def scan_due_items(today=None, lookahead=LOOKAHEAD_DAYS, backfill=BACKFILL_DAYS):
+    """
+    Queue everything that has fallen due since the previous run.
+
+    Two watermarks keep each run small: due dates after ``due_through`` are
+    found with a date-range query on each source's indexed date column, and
+    source rows edited after ``changed_since`` are re-queued (or dropped)
+    through the updated_at index. Deleted source rows take their open items
+    with them (bhw_reports.signals). Returns the number of items checked per
+    kind; items already queued are left as they are.
+    """
+    today = today or timezone.now().date()
+    started = timezone.now()
+    horizon = today + timedelta(days=lookahead)
+    earliest = today - timedelta(days=backfill)
+    queued = Counter()
+
+    with transaction.atomic():
+        watermark, _ = ScanWatermark.objects.select_for_update().get_or_create(name=WATERMARK_NAME)
+        # Exclusive lower bound of the due dates still to queue
+        due_after = watermark.due_through or earliest - timedelta(days=1)
+
+        for kind, (model, field, condition, resident_field, offset) in DUE_SOURCES.items():
+            shift = timedelta(days=offset)
+            sources = model.objects.filter(condition)
+
+            if watermark.changed_since is not None:
+                # Edited rows may have moved or resolved their due date. Their
+                # open items are kept, however overdue, while they still match
+                changed = model.objects.filter(updated_at__gt=watermark.changed_since)
+                rows = {row[0]: row for row in due_rows(changed.filter(condition), field, resident_field)}
+                kept, stale = set(), []
+                open_items = DueItem.objects.filter(kind=kind, status='open', source_id__in=changed.values('pk'))
+                for pk, source_id, due_date in open_items.values_list('pk', 'source_id', 'due_date'):
+                    value = rows[source_id][2] if source_id in rows else None
+                    if source_id in rows and (value is None or value + shift == due_date):
+                        kept.add(source_id)
+                    else:
+                        stale.append(pk)
+                if stale:
+                    DueItem.objects.filter(pk__in=stale).delete()
+                queued[kind] += queue_items(kind, [
+                    row for source_id, row in rows.items()
+                    if source_id not in kept and (row[2] is None or earliest - shift <= row[2] <= horizon - shift)
+                ], offset, today)
+            else:
+                # First run: rows that have never had the date set are due now
+                queued[kind] += queue_items(kind, due_rows(
+                    sources.filter(**{f'{field}__isnull': True}), field, resident_field
+                ), offset, today)
+
+            if horizon > due_after:
+                queued[kind] += queue_items(kind, due_rows(
+                    sources.filter(**{f'{field}__gt': due_after - shift, f'{field}__lte': horizon - shift}),
+                    field, resident_field
+                ), offset, today)
+
+        watermark.due_through = max(due_after, horizon)
+        watermark.changed_since = started
+        watermark.save()
+    return queued
@@ -0,0 +1,44 @@
+import django_filters
+
+from .models import (
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport, HealthReport
+)
+
+# Filters stick to the columns indexed for the reports (see each model's Meta)
+
+
+class SeniorCitizenReportFilter(django_filters.FilterSet):
+    class Meta:
+        model = SeniorCitizenReport
+        fields = ['resident', 'is_active']
+
+
+class SariSariStoreReportFilter(django_filters.FilterSet):
+    class Meta:
+        model = SariSariStoreReport
+        fields = ['owner', 'business_type', 'is_active']
+
+
+class FourPsBeneficiaryReportFilter(django_filters.FilterSet):
+    class Meta:
+        model = FourPsBeneficiaryReport
+        fields = ['beneficiary', 'set_of_year', 'is_active']
+
+
+class PregnancyReportFilter(django_filters.FilterSet):
+    due_after = django_filters.DateFilter(field_name='expected_due_date', lookup_expr='gte')
+    due_before = django_filters.DateFilter(field_name='expected_due_date', lookup_expr='lte')
+
+    class Meta:
+        model = PregnancyReport
+        fields = ['pregnant_woman', 'pregnancy_outcome', 'is_active']
+
+
+class HealthReportFilter(django_filters.FilterSet):
+    reported_after = django_filters.DateFilter(field_name='report_date', lookup_expr='gte')
+    reported_before = django_filters.DateFilter(field_name='report_date', lookup_expr='lte')
+
+    class Meta:
+        model = HealthReport
+        fields = ['resident', 'report_type']
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bhw_reports.due_items import BACKFILL_DAYS, LOOKAHEAD_DAYS, scan_due_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue follow-ups, prenatal visits, deliveries and senior checkups "
+        "that have fallen due since the last run. Schedule this daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lookahead', type=int, default=LOOKAHEAD_DAYS,
+                            help="Queue items due within this many days")
+        parser.add_argument('--backfill', type=int, default=BACKFILL_DAYS,
+                            help="On the first run, include items overdue by up to this many days")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        queued = scan_due_items(lookahead=options['lookahead'], backfill=options['backfill'])
+        elapsed = time.perf_counter() - started
+        for kind, count in sorted(queued.items()):
+            self.stdout.write(f"{kind}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {sum(queued.values())} due items in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhw_reports', '0001_initial'),
+        ('residents', '0004_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fourpsbeneficiaryreport',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['set_of_year'], name='fourps_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthreport',
+            index=models.Index(fields=['report_date'], name='health_report_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthreport',
+            index=models.Index(fields=['resident', 'report_date'], name='health_report_resident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pregnancyreport',
+            index=models.Index(condition=models.Q(('is_active', True), ('pregnancy_outcome', 'ongoing')), fields=['expected_due_date'], name='pregnancy_ongoing_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sarisaristorereport',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['business_type'], name='business_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seniorcitizenreport',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['resident'], name='senior_report_active_idx'),
+        ),
+    ]
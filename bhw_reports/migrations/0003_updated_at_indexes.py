@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhw_reports', '0002_access_path_indexes'),
+        ('residents', '0007_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fourpsbeneficiaryreport',
+            index=models.Index(fields=['updated_at'], name='fourps_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthreport',
+            index=models.Index(fields=['updated_at'], name='health_report_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pregnancyreport',
+            index=models.Index(fields=['updated_at'], name='pregnancy_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sarisaristorereport',
+            index=models.Index(fields=['updated_at'], name='business_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seniorcitizenreport',
+            index=models.Index(fields=['updated_at'], name='senior_report_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhw_reports', '0003_updated_at_indexes'),
+        ('residents', '0007_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DueItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('follow_up', 'Health Follow-up'), ('prenatal_visit', 'Prenatal Visit'), ('delivery', 'Expected Delivery'), ('senior_checkup', 'Senior Citizen Checkup')], max_length=20)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('zone', models.CharField(max_length=50)),
+                ('due_date', models.DateField()),
+                ('status', models.CharField(choices=[('open', 'Open'), ('done', 'Done')], default='open', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Due Item',
+                'verbose_name_plural': 'Due Items',
+                'ordering': ['due_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScanWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('due_through', models.DateField(blank=True, null=True)),
+                ('changed_since', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Scan Watermark',
+                'verbose_name_plural': 'Scan Watermarks',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='healthreport',
+            index=models.Index(condition=models.Q(('follow_up_needed', True)), fields=['follow_up_date'], name='health_report_follow_up_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pregnancyreport',
+            index=models.Index(condition=models.Q(('is_active', True), ('pregnancy_outcome', 'ongoing')), fields=['next_prenatal_visit'], name='pregnancy_next_visit_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seniorcitizenreport',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_checkup_date'], name='senior_report_checkup_idx'),
+        ),
+        migrations.AddField(
+            model_name='dueitem',
+            name='resident',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='due_items', to='residents.resident'),
+        ),
+        migrations.AddIndex(
+            model_name='dueitem',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['zone', 'due_date'], name='due_item_open_zone_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dueitem',
+            constraint=models.UniqueConstraint(fields=('kind', 'source_id', 'due_date'), name='unique_due_item'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhw_reports', '0004_due_items'),
+        ('residents', '0007_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='healthreport',
+            name='health_report_resident_idx',
+        ),
+        migrations.AddIndex(
+            model_name='healthreport',
+            index=models.Index(fields=['resident', 'report_date', 'temperature', 'blood_pressure_systolic', 'blood_pressure_diastolic', 'heart_rate', 'weight', 'height'], name='health_report_vitals_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhw_reports', '0005_health_report_vitals_index'),
+        ('residents', '0008_resident_admin_name_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pregnancyreport',
+            name='pregnant_woman',
+            field=models.ForeignKey(limit_choices_to={'gender': 'F'}, on_delete=django.db.models.deletion.CASCADE, related_name='pregnancy_reports', to='residents.resident'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhw_reports', '0006_pregnant_woman_choices'),
+        ('residents', '0008_resident_admin_name_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dueitem',
+            name='due_item_open_zone_idx',
+        ),
+        migrations.RemoveField(
+            model_name='dueitem',
+            name='zone',
+        ),
+        migrations.AddIndex(
+            model_name='dueitem',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['due_date', 'id'], name='due_item_open_idx'),
+        ),
+    ]
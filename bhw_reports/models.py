@@ -1,9 +1,18 @@
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import BooleanField, Case, IntegerField, Q, Value, When
 from django.utils import timezone
 from residents.models import Resident
 
 # Create your models here.
 
+# Gestation is counted from the LMP: weeks 0-12 are the 1st trimester, 13-28 the 2nd
+SECOND_TRIMESTER_DAYS = 13 * 7
+THIRD_TRIMESTER_DAYS = 29 * 7
+DUE_SOON_DAYS = 30
+TRIMESTER_LABELS = {1: '1st Trimester', 2: '2nd Trimester', 3: '3rd Trimester'}
+
 class SeniorCitizenReport(models.Model):
     """Track senior citizens in the barangay"""
     resident = models.OneToOneField(Resident, on_delete=models.CASCADE, related_name='senior_citizen_report')
@@ -40,6 +49,11 @@ class SeniorCitizenReport(models.Model):
     class Meta:
         verbose_name = 'Senior Citizen Report'
         verbose_name_plural = 'Senior Citizens Reports'
+        indexes = [
+            models.Index(fields=['resident'], condition=models.Q(is_active=True), name='senior_report_active_idx'),
+            models.Index(fields=['updated_at'], name='senior_report_updated_idx'),
+            models.Index(fields=['last_checkup_date'], condition=models.Q(is_active=True), name='senior_report_checkup_idx'),
+        ]
     
     def __str__(self):
         return f"Senior Citizen: {self.resident.full_name}"
@@ -84,6 +98,10 @@ class SariSariStoreReport(models.Model):
     class Meta:
         verbose_name = 'Sari-Sari Store/Carenderia Report'
         verbose_name_plural = 'Sari-Sari Stores/Carenderias Reports'
+        indexes = [
+            models.Index(fields=['business_type'], condition=models.Q(is_active=True), name='business_active_type_idx'),
+            models.Index(fields=['updated_at'], name='business_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.business_name} - {self.owner.full_name}"
@@ -120,14 +138,54 @@ class FourPsBeneficiaryReport(models.Model):
     class Meta:
         verbose_name = '4Ps Beneficiary Report'
         verbose_name_plural = '4Ps Beneficiaries Reports'
+        indexes = [
+            models.Index(fields=['set_of_year'], condition=models.Q(is_active=True), name='fourps_active_idx'),
+            models.Index(fields=['updated_at'], name='fourps_updated_idx'),
+        ]
     
     def __str__(self):
         return f"4Ps: {self.beneficiary.full_name} - {self.household_id}"
 
 
+class PregnancyReportQuerySet(models.QuerySet):
+    def trimester_conditions(self, today=None):
+        """LMP ranges for each trimester on ``today``"""
+        today = today or timezone.now().date()
+        second_starts = today - timedelta(days=SECOND_TRIMESTER_DAYS)
+        third_starts = today - timedelta(days=THIRD_TRIMESTER_DAYS)
+        return {
+            1: Q(last_menstrual_period__gt=second_starts),
+            2: Q(last_menstrual_period__lte=second_starts, last_menstrual_period__gt=third_starts),
+            3: Q(last_menstrual_period__lte=third_starts),
+        }
+
+    def with_progress(self, today=None):
+        """Annotate ``current_trimester`` (1-3) and ``due_soon`` as of ``today``"""
+        today = today or timezone.now().date()
+        conditions = self.trimester_conditions(today)
+        return self.annotate(
+            current_trimester=Case(
+                *[When(conditions[trimester], then=Value(trimester)) for trimester in (1, 2)],
+                default=Value(3),
+                output_field=IntegerField(),
+            ),
+            due_soon=Case(
+                When(expected_due_date__lte=today + timedelta(days=DUE_SOON_DAYS), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+
+    def in_trimester(self, trimester, today=None):
+        return self.filter(self.trimester_conditions(today)[trimester])
+
+
 class PregnancyReport(models.Model):
     """Track pregnant women in the barangay"""
-    pregnant_woman = models.ForeignKey(Resident, on_delete=models.CASCADE, related_name='pregnancy_reports')
+    pregnant_woman = models.ForeignKey(
+        Resident, on_delete=models.CASCADE, related_name='pregnancy_reports',
+        limit_choices_to={'gender': 'F'}
+    )
     pregnancy_number = models.PositiveIntegerField(verbose_name="Pregnancy Number (G)")
     
     # Pregnancy details
@@ -178,24 +236,40 @@ class PregnancyReport(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PregnancyReportQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Pregnancy Report'
         verbose_name_plural = 'Pregnancy Reports'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['expected_due_date'],
+                condition=models.Q(is_active=True, pregnancy_outcome='ongoing'),
+                name='pregnancy_ongoing_due_idx',
+            ),
+            models.Index(fields=['updated_at'], name='pregnancy_updated_idx'),
+            models.Index(
+                fields=['next_prenatal_visit'],
+                condition=models.Q(is_active=True, pregnancy_outcome='ongoing'),
+                name='pregnancy_next_visit_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"Pregnancy: {self.pregnant_woman.full_name} - EDD: {self.expected_due_date}"
     
+    @property
+    def gestation_weeks(self):
+        return max((timezone.now().date() - self.last_menstrual_period).days, 0) // 7
+    
     @property
     def trimester(self):
-        if self.age_of_gestation_weeks:
-            if self.age_of_gestation_weeks <= 12:
-                return "1st Trimester"
-            elif self.age_of_gestation_weeks <= 28:
-                return "2nd Trimester"
-            else:
-                return "3rd Trimester"
-        return "Unknown"
+        trimester = getattr(self, 'current_trimester', None)
+        if trimester is None:
+            days = (timezone.now().date() - self.last_menstrual_period).days
+            trimester = 1 if days < SECOND_TRIMESTER_DAYS else 2 if days < THIRD_TRIMESTER_DAYS else 3
+        return TRIMESTER_LABELS[trimester]
 
 
 class HealthReport(models.Model):
@@ -242,6 +316,76 @@ class HealthReport(models.Model):
         verbose_name = 'Health Report'
         verbose_name_plural = 'Health Reports'
         ordering = ['-report_date']
+        indexes = [
+            models.Index(fields=['report_date'], name='health_report_date_idx'),
+            # Covers the vitals trend queries, which read only these columns
+            models.Index(
+                fields=[
+                    'resident', 'report_date', 'temperature', 'blood_pressure_systolic',
+                    'blood_pressure_diastolic', 'heart_rate', 'weight', 'height',
+                ],
+                name='health_report_vitals_idx',
+            ),
+            models.Index(fields=['updated_at'], name='health_report_updated_idx'),
+            models.Index(fields=['follow_up_date'], condition=models.Q(follow_up_needed=True), name='health_report_follow_up_idx'),
+        ]
     
     def __str__(self):
         return f"Health Report: {self.resident.full_name} - {self.report_date}"
+
+
+class DueItem(models.Model):
+    """A follow-up, prenatal visit, delivery or checkup that is due, queued for the BHWs"""
+    KIND_CHOICES = [
+        ('follow_up', 'Health Follow-up'),
+        ('prenatal_visit', 'Prenatal Visit'),
+        ('delivery', 'Expected Delivery'),
+        ('senior_checkup', 'Senior Citizen Checkup'),
+    ]
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('done', 'Done'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Primary key of the HealthReport, PregnancyReport or SeniorCitizenReport behind the item
+    source_id = models.PositiveBigIntegerField()
+    # The zone is read through the resident, so a move is reflected at once
+    resident = models.ForeignKey(Resident, on_delete=models.CASCADE, related_name='due_items')
+    due_date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['due_date']
+        verbose_name = 'Due Item'
+        verbose_name_plural = 'Due Items'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'source_id', 'due_date'], name='unique_due_item'),
+        ]
+        indexes = [
+            # Worklist of open items, soonest first
+            models.Index(fields=['due_date', 'id'], condition=models.Q(status='open'), name='due_item_open_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.resident.full_name} - {self.due_date}"
+
+
+class ScanWatermark(models.Model):
+    """How far a scheduled scan has progressed, so the next run starts where it stopped"""
+    name = models.CharField(max_length=50, unique=True)
+    # Due dates up to this day have been queued
+    due_through = models.DateField(blank=True, null=True)
+    # Source rows changed before this moment have been queued
+    changed_since = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Scan Watermark'
+        verbose_name_plural = 'Scan Watermarks'
+    
+    def __str__(self):
+        return f"{self.name} through {self.due_through}"
@@ -0,0 +1,55 @@
+from rest_framework import serializers
+
+from barangay_ims.api import SparseFieldsetMixin
+from .vitals import DEFAULT_WINDOW
+from .models import (
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport, HealthReport
+)
+
+
+class SeniorCitizenReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    resident_name = serializers.CharField(source='resident.full_name', read_only=True)
+
+    class Meta:
+        model = SeniorCitizenReport
+        fields = '__all__'
+
+
+class SariSariStoreReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    owner_name = serializers.CharField(source='owner.full_name', read_only=True)
+
+    class Meta:
+        model = SariSariStoreReport
+        fields = '__all__'
+
+
+class FourPsBeneficiaryReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    beneficiary_name = serializers.CharField(source='beneficiary.full_name', read_only=True)
+
+    class Meta:
+        model = FourPsBeneficiaryReport
+        fields = '__all__'
+
+
+class PregnancyReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    pregnant_woman_name = serializers.CharField(source='pregnant_woman.full_name', read_only=True)
+    trimester = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = PregnancyReport
+        fields = '__all__'
+
+
+class HealthReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    resident_name = serializers.CharField(source='resident.full_name', read_only=True)
+
+    class Meta:
+        model = HealthReport
+        fields = '__all__'
+
+
+class VitalsQuerySerializer(serializers.Serializer):
+    """Query parameters of the vitals trend endpoints"""
+    since = serializers.DateField(required=False)
+    window = serializers.IntegerField(min_value=1, max_value=30, default=DEFAULT_WINDOW)
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete
+
+from .due_items import DUE_SOURCES
+from .models import DueItem
+
+
+def drop_open_due_items(sender, instance, using, **kwargs):
+    # DueItem.source_id is not a foreign key, so nothing cascades to it
+    kinds = [kind for kind, (model, *_) in DUE_SOURCES.items() if model is sender]
+    DueItem.objects.using(using).filter(kind__in=kinds, source_id=instance.pk, status='open').delete()
+
+
+def connect_signals():
+    for model in {model for model, *_ in DUE_SOURCES.values()}:
+        post_delete.connect(
+            drop_open_due_items, sender=model,
+            dispatch_uid=f'bhw_reports_due_items_{model._meta.model_name}_post_delete'
+        )
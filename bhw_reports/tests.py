@@ -1,3 +1,297 @@
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.tests import make_resident
+from .due_items import scan_due_items
+from .vitals import VITAL_FIELDS
+from .models import (
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport, HealthReport, DueItem
+)
+
+
+class BhwReportApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('partner', password='password')
+        for i in range(4):
+            resident = make_resident(first_name=f'Bhw{i}', gender='F', date_of_birth=date(1950 + i * 10, 1, 1))
+            SeniorCitizenReport.objects.create(resident=resident)
+            SariSariStoreReport.objects.create(
+                owner=resident, business_name=f'Store {i}', business_address='Zone 1',
+                business_type=['sari_sari', 'carenderia'][i % 2]
+            )
+            FourPsBeneficiaryReport.objects.create(
+                beneficiary=resident, household_id=f'4PS-{i}', set_of_year=2015 + i, monthly_grant_amount=1500
+            )
+            PregnancyReport.objects.create(
+                pregnant_woman=resident, pregnancy_number=1,
+                last_menstrual_period=date(2026, 1 + i, 1), expected_due_date=date(2026, 10 + i % 3, 1)
+            )
+            HealthReport.objects.create(
+                resident=resident, report_type='routine_checkup', healthcare_provider='RHU',
+                report_date=date(2026, 5, 1 + i)
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_every_endpoint_pages_with_a_constant_query_count(self):
+        for url in ['/api/senior-citizens/', '/api/businesses/', '/api/fourps/', '/api/pregnancies/', '/api/health-reports/']:
+            # Warm the cached conditional GET probe first
+            self.client.get(url)
+            for page_size in [1, 4]:
+                with self.subTest(url=url, page_size=page_size), self.assertNumQueries(3):
+                    response = self.client.get(url, {'page_size': page_size})
+                self.assertEqual(len(response.json()['results']), page_size)
+
+    def test_filters_and_sparse_fields(self):
+        data = self.client.get('/api/businesses/', {'business_type': 'carenderia', 'fields': 'business_name,owner_name'}).json()
+        self.assertEqual(data['results'], [
+            {'business_name': 'Store 1', 'owner_name': 'Bhw1 Dela Cruz'},
+            {'business_name': 'Store 3', 'owner_name': 'Bhw3 Dela Cruz'},
+        ])
+
+        data = self.client.get('/api/pregnancies/', {'due_before': '2026-10-31', 'fields': 'id,trimester'}).json()
+        self.assertEqual(len(data['results']), 2)
+
+        data = self.client.get('/api/health-reports/', {'reported_after': '2026-05-03'}).json()
+        self.assertEqual([row['report_date'] for row in data['results']], ['2026-05-03', '2026-05-04'])
+
+
+class PregnancyReportTests(TestCase):
+    today = date(2026, 10, 18)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        mother = make_resident(first_name='Liza', gender='F')
+        # (days since LMP, days until due, high risk); the stale week counts are ignored
+        for days, due_in, high_risk in [(0, 280, False), (90, 190, True), (91, 189, False), (202, 78, False), (203, 77, True), (270, 10, False)]:
+            PregnancyReport.objects.create(
+                pregnant_woman=mother, pregnancy_number=1, high_risk_pregnancy=high_risk,
+                age_of_gestation_weeks=4,
+                last_menstrual_period=cls.today - timedelta(days=days),
+                expected_due_date=cls.today + timedelta(days=due_in),
+            )
+        PregnancyReport.objects.create(
+            pregnant_woman=mother, pregnancy_number=2, pregnancy_outcome='live_birth',
+            last_menstrual_period=cls.today, expected_due_date=cls.today,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_trimesters_follow_the_lmp(self):
+        pregnancies = PregnancyReport.objects.filter(pregnancy_outcome='ongoing').with_progress(self.today)
+        self.assertEqual(
+            [(p.current_trimester, p.due_soon) for p in pregnancies.order_by('-last_menstrual_period')],
+            [(1, False), (1, False), (2, False), (2, False), (3, False), (3, True)]
+        )
+        self.assertEqual(PregnancyReport.objects.in_trimester(2, self.today).count(), 2)
+
+    def test_report_counts_come_from_one_aggregate(self):
+        with mock.patch('django.utils.timezone.now', return_value=timezone.make_aware(datetime(2026, 10, 18, 9))):
+            with self.assertNumQueries(3):
+                response = self.client.get(reverse('dashboard:pregnancy_report'))
+            context = response.context
+            self.assertEqual(
+                [context[key] for key in ['total_pregnancies', 'high_risk_pregnancies', 'first_trimester_count',
+                                          'second_trimester_count', 'third_trimester_count', 'upcoming_count']],
+                [6, 2, 2, 2, 2, 1]
+            )
+            self.assertEqual(len(context['upcoming_deliveries']), 1)
+
+            response = self.client.get(reverse('dashboard:pregnancy_report'), {'trimester': '3'})
+            self.assertEqual([p.current_trimester for p in response.context['active_pregnancies']], [3, 3])
+            self.assertEqual(response.context['total_pregnancies'], 6)
+            self.assertEqual(response.context['upcoming_count'], 1)
+
+            response = self.client.get(reverse('dashboard:pregnancy_report'), {'trimester': '1'})
+            self.assertEqual(response.context['upcoming_count'], 0)
+            self.assertEqual(response.context['upcoming_deliveries'], [])
+
+            self.client.force_login(self.user)
+            response = self.client.get(reverse('admin:bhw_reports_pregnancyreport_changelist'), {'trimester': '1'})
+            self.assertEqual(response.context['cl'].result_count, 3)
+
+
+class DueItemScanTests(TestCase):
+    today = date(2026, 6, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mother = make_resident(first_name='Ana', gender='F', zone='2')
+        cls.elder = make_resident(first_name='Lola', gender='F', zone='3', date_of_birth=date(1950, 1, 1))
+        cls.pregnancy = PregnancyReport.objects.create(
+            pregnant_woman=cls.mother, pregnancy_number=1, last_menstrual_period=date(2026, 1, 1),
+            expected_due_date=date(2026, 10, 8), next_prenatal_visit=date(2026, 6, 5)
+        )
+        cls.follow_up = HealthReport.objects.create(
+            resident=cls.mother, report_type='illness', healthcare_provider='RHU', report_date=date(2026, 5, 1),
+            follow_up_needed=True, follow_up_date=date(2026, 6, 20)
+        )
+        cls.senior = SeniorCitizenReport.objects.create(resident=cls.elder, last_checkup_date=date(2025, 5, 20))
+
+    def due(self):
+        return sorted(DueItem.objects.filter(status='open').values_list('kind', 'due_date'))
+
+    def test_scans_only_pick_up_newly_due_and_changed_rows(self):
+        scan_due_items(self.today)
+        self.assertEqual(self.due(), [
+            ('prenatal_visit', date(2026, 6, 5)),
+            ('senior_checkup', date(2026, 5, 20)),
+        ])
+
+        # The next day's window reaches nothing new; a rescheduled visit moves
+        self.pregnancy.next_prenatal_visit = date(2026, 6, 3)
+        self.pregnancy.save()
+        # Nothing probes the open items that did not change
+        with self.assertNumQueries(18):
+            scan_due_items(self.today + timedelta(days=1))
+        self.assertIn(('prenatal_visit', date(2026, 6, 3)), self.due())
+        self.assertNotIn(('prenatal_visit', date(2026, 6, 5)), self.due())
+
+        # The follow-up enters the window two weeks later
+        scan_due_items(self.today + timedelta(days=14))
+        self.assertIn(('follow_up', date(2026, 6, 20)), self.due())
+
+    def test_editing_an_old_overdue_source_keeps_its_item(self):
+        overdue = HealthReport.objects.create(
+            resident=self.elder, report_type='illness', healthcare_provider='RHU', report_date=date(2026, 5, 1),
+            follow_up_needed=True, follow_up_date=self.today - timedelta(days=20)
+        )
+        scan_due_items(self.today)
+        self.assertIn(('follow_up', date(2026, 5, 12)), self.due())
+
+        # Saved again without a new date, now past the backfill window
+        overdue.healthcare_provider = 'Barangay Health Center'
+        overdue.save()
+        scan_due_items(self.today + timedelta(days=15))
+        self.assertEqual(DueItem.objects.filter(kind='follow_up', source_id=overdue.pk, status='open').count(), 1)
+
+    def test_deleted_and_resolved_sources_drop_off(self):
+        scan_due_items(self.today)
+        self.senior.delete()
+        self.pregnancy.pregnancy_outcome = 'miscarriage'
+        self.pregnancy.save()
+        scan_due_items(self.today + timedelta(days=1))
+        self.assertEqual(self.due(), [])
+
+    def test_worklist_filters_by_zone_and_completes_items(self):
+        scan_due_items(self.today)
+        response = self.client.get(reverse('bhw_reports:worklist'), {'zone': '3'})
+        self.assertEqual([item.kind for item in response.context['items']], ['senior_checkup'])
+
+        item = response.context['items'][0]
+        url = reverse('bhw_reports:complete_due_item', args=[item.id])
+        # Only BHWs allowed to change due items can complete them
+        self.assertEqual(self.client.post(url, {'zone': '3'}).status_code, 403)
+        bhw = User.objects.create_user('bhw', password='password')
+        self.client.force_login(bhw)
+        self.assertEqual(self.client.post(url, {'zone': '3'}).status_code, 403)
+        bhw.user_permissions.add(Permission.objects.get(codename='change_dueitem'))
+        item.refresh_from_db()
+        self.assertEqual(item.status, 'open')
+
+        response = self.client.post(url, {'zone': '3'})
+        self.assertRedirects(response, reverse('bhw_reports:worklist') + '?zone=3')
+        item.refresh_from_db()
+        self.assertEqual(item.status, 'done')
+
+        # A completed item is not queued again
+        scan_due_items(self.today)
+        self.assertFalse(DueItem.objects.filter(kind='senior_checkup', status='open').exists())
+
+    def test_worklist_zone_follows_the_resident(self):
+        scan_due_items(self.today)
+        self.mother.zone = '5'
+        self.mother.save()
+        response = self.client.get(reverse('bhw_reports:worklist'), {'zone': '5'})
+        self.assertEqual([item.kind for item in response.context['items']], ['prenatal_visit'])
+        self.assertEqual(list(response.context['zones']), ['3', '5'])
+
+
+class VitalsTrendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('nurse', password='password')
+        cls.senior = make_resident(first_name='Lolo', zone='4', date_of_birth=date(1950, 1, 1))
+        cls.neighbour = neighbour = make_resident(first_name='Lola', gender='F', zone='4', date_of_birth=date(1952, 1, 1))
+        for day, systolic, temperature in [(1, 120, 36.5), (11, 130, None), (31, 150, 38.0)]:
+            HealthReport.objects.create(
+                resident=cls.senior, report_type='routine_checkup', healthcare_provider='RHU',
+                report_date=date(2026, 3, day), blood_pressure_systolic=systolic, temperature=temperature
+            )
+        HealthReport.objects.create(
+            resident=neighbour, report_type='routine_checkup', healthcare_provider='RHU',
+            report_date=date(2026, 3, 1), blood_pressure_systolic=140
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('resident_vitals', args=[self.senior.pk])
+
+    def test_resident_trend(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['dates'], ['2026-03-01', '2026-03-11', '2026-03-31'])
+        systolic = data['series']['blood_pressure_systolic']
+        self.assertEqual(systolic['values'], [120.0, 130.0, 150.0])
+        self.assertEqual(systolic['rolling_mean'], [120.0, 125.0, 133.33])
+        self.assertEqual(systolic['slope_per_30_days'], 30.0)
+        self.assertEqual(systolic['out_of_range'], [False, False, True])
+        # Missing readings are skipped, not treated as zero
+        self.assertEqual(data['series']['temperature']['rolling_mean'], [36.5, 36.5, 37.25])
+
+        data = self.client.get(self.url, {'since': '2026-03-10', 'window': 1}).json()
+        self.assertEqual(data['series']['blood_pressure_systolic']['rolling_mean'], [130.0, 150.0])
+        self.assertEqual(self.client.get(self.url, {'window': 0}).status_code, 400)
+
+    def test_cached_until_a_report_changes(self):
+        self.client.get(self.url)
+        # Session, user, resident and the latest-report probe
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+
+        report = self.senior.health_reports.get(report_date=date(2026, 3, 31))
+        report.blood_pressure_systolic = 110
+        report.save()
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['series']['blood_pressure_systolic']['values'], [120.0, 130.0, 110.0])
+
+    def test_zone_trend_averages_each_day(self):
+        data = self.client.get(reverse('zone_vitals', args=['4'])).json()
+        self.assertEqual(data['dates'], ['2026-03-01', '2026-03-11', '2026-03-31'])
+        systolic = data['series']['blood_pressure_systolic']
+        self.assertEqual(systolic['values'], [130.0, 130.0, 150.0])
+        self.assertEqual(systolic['out_of_range'], [1, 0, 1])
+
+    def test_zone_trend_follows_residents_moving(self):
+        newcomer = make_resident(first_name='Lito', zone='5', date_of_birth=date(1960, 1, 1))
+        HealthReport.objects.create(
+            resident=newcomer, report_type='routine_checkup', healthcare_provider='RHU',
+            report_date=date(2026, 3, 1), blood_pressure_systolic=100
+        )
+        self.senior.health_reports.latest('report_date').save()
+        url = reverse('zone_vitals', args=['4'])
+        self.client.get(url)
+
+        # One resident with one report leaves zone 4 as another arrives: same report count and latest edit
+        self.neighbour.zone = '5'
+        self.neighbour.save()
+        newcomer.zone = '4'
+        newcomer.save()
+        data = self.client.get(url).json()
+        self.assertEqual(data['series']['blood_pressure_systolic']['values'], [110.0, 130.0, 150.0])
 
-# Create your tests here.
+    def test_readings_come_from_the_covering_index(self):
+        reports = HealthReport.objects.filter(resident=self.senior).order_by('report_date', 'id')
+        plan = reports.values_list('report_date', *VITAL_FIELDS).explain()
+        self.assertIn('COVERING INDEX health_report_vitals_idx', plan)
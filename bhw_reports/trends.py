@@ -0,0 +1,70 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from dashboard.cache import get_generations
+from .models import HealthReport
+from .vitals import DEFAULT_WINDOW, VITAL_FIELDS, daily_means, out_of_range, to_arrays, trend
+
+# Keys carry the latest report timestamp, so stale entries are simply never read again
+VITALS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def cached_series(reports, key, compute, labels=()):
+    """
+    Cache ``compute()`` under the newest ``updated_at`` and the row count of
+    ``reports``, so an edited, added or deleted report starts a new entry.
+    Writes to the models in ``labels`` (dashboard.cache generations) do too.
+    """
+    state = reports.aggregate(latest=Max('updated_at'), count=Count('id'))
+    latest = state['latest'].isoformat() if state['latest'] else ''
+    generations = '.'.join(str(generation) for generation in get_generations(labels))
+    cache_key = f'vitals:{key}:{latest}:{state["count"]}:{generations}'
+    value = cache.get(cache_key)
+    if value is None:
+        value = compute()
+        cache.set(cache_key, value, VITALS_CACHE_TIMEOUT)
+    return value
+
+
+def vital_rows(reports):
+    # Only the numeric columns, read from the covering (resident, report_date, vitals) index
+    return list(reports.values_list('report_date', *VITAL_FIELDS))
+
+
+def resident_vitals(resident_id, since=None, window=DEFAULT_WINDOW):
+    """One resident's readings in date order with their trends"""
+    reports = HealthReport.objects.filter(resident_id=resident_id)
+    if since:
+        reports = reports.filter(report_date__gte=since)
+
+    def compute():
+        rows = vital_rows(reports.order_by('report_date', 'id'))
+        days, values = to_arrays(rows)
+        return {
+            'resident': resident_id,
+            'dates': [row[0] for row in rows],
+            'series': trend(days, values, out_of_range(values), window),
+        }
+
+    return cached_series(reports, f'resident:{resident_id}:{since}:{window}', compute)
+
+
+def zone_vitals(zone, since=None, window=DEFAULT_WINDOW):
+    """Daily means across a zone's residents, with the number of flagged readings per day"""
+    reports = HealthReport.objects.filter(resident__zone=zone, resident__is_active=True)
+    if since:
+        reports = reports.filter(report_date__gte=since)
+
+    def compute():
+        days, values = to_arrays(vital_rows(reports.order_by()))
+        days, means, flag_counts = daily_means(days, values, out_of_range(values))
+        return {
+            'zone': zone,
+            'dates': [date.fromordinal(int(day)) for day in days],
+            'series': trend(days, means, flag_counts, window),
+        }
+
+    # Which reports belong to the zone follows the residents' zone and is_active
+    return cached_series(reports, f'zone:{zone}:{since}:{window}', compute, ['residents.Resident'])
@@ -4,5 +4,6 @@ from . import views
 app_name = 'bhw_reports'
 
 urlpatterns = [
-    # Add BHW report-specific URLs here as needed
-]
\ No newline at end of file
+    path('worklist/', views.worklist, name='worklist'),
+    path('worklist/<int:item_id>/complete/', views.complete_due_item, name='complete_due_item'),
+]
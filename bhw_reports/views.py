@@ -1,3 +1,54 @@
-from django.shortcuts import render
+from urllib.parse import urlencode
 
-# Create your views here.
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.decorators import permission_required
+from django.views.decorators.http import require_POST
+
+from residents.models import Resident
+from residents.pagination import paginate
+from .models import DueItem
+
+WORKLIST_ORDERING = ['due_date', 'id']
+
+
+def worklist(request):
+    """Open follow-ups, prenatal visits, deliveries and checkups, soonest first"""
+    items = DueItem.objects.filter(status='open').select_related('resident')
+    
+    # Filter by zone
+    zone_filter = request.GET.get('zone')
+    if zone_filter:
+        items = items.filter(resident__zone=zone_filter)
+    
+    zones = Resident.objects.filter(due_items__status='open').values_list('zone', flat=True).distinct().order_by('zone')
+    
+    page = paginate(request, items, WORKLIST_ORDERING)
+    
+    context = {
+        'items': page.object_list,
+        'page': page,
+        'zones': zones,
+        'zone_filter': zone_filter,
+        'today': timezone.now().date(),
+    }
+    
+    return render(request, 'bhw_reports/worklist.html', context)
+
+
+@require_POST
+@permission_required('bhw_reports.change_dueitem', raise_exception=True)
+def complete_due_item(request, item_id):
+    """Mark a worklist item as done; BHWs need the change due item permission"""
+    item = get_object_or_404(DueItem, pk=item_id, status='open')
+    item.status = 'done'
+    item.completed_at = timezone.now()
+    item.save(update_fields=['status', 'completed_at'])
+    
+    # Back to the list the item was completed from
+    url = reverse('bhw_reports:worklist')
+    zone_filter = request.POST.get('zone')
+    if zone_filter:
+        url = f'{url}?{urlencode({"zone": zone_filter})}'
+    return redirect(url)
@@ -0,0 +1,102 @@
+import numpy as np
+
+VITAL_FIELDS = [
+    'temperature', 'blood_pressure_systolic', 'blood_pressure_diastolic',
+    'heart_rate', 'weight', 'height',
+]
+
+# Adult reference ranges; readings outside them are flagged
+NORMAL_RANGES = {
+    'temperature': (36.1, 37.5),
+    'blood_pressure_systolic': (90, 139),
+    'blood_pressure_diastolic': (60, 89),
+    'heart_rate': (60, 100),
+}
+
+# Rolling means cover this many readings (or days, for zones)
+DEFAULT_WINDOW = 3
+# Slopes are reported per this many days
+SLOPE_PERIOD_DAYS = 30
+
+
+def to_arrays(rows):
+    """
+    Day numbers and a float matrix, one column per vital, from (date, *vitals)
+    rows. Missing readings become NaN.
+    """
+    days = np.fromiter((row[0].toordinal() for row in rows), dtype=np.int64, count=len(rows))
+    values = np.array([row[1:] for row in rows], dtype=float).reshape(len(rows), len(VITAL_FIELDS))
+    return days, values
+
+
+def out_of_range(values):
+    """Boolean matrix marking readings outside NORMAL_RANGES; NaN is never flagged"""
+    flags = np.zeros(values.shape, dtype=bool)
+    for column, field in enumerate(VITAL_FIELDS):
+        if field in NORMAL_RANGES:
+            low, high = NORMAL_RANGES[field]
+            flags[:, column] = (values[:, column] < low) | (values[:, column] > high)
+    return flags
+
+
+def daily_means(days, values, flags):
+    """Collapse many residents' readings into one row per day: means and flag counts"""
+    unique_days, rows = np.unique(days, return_inverse=True)
+    present = ~np.isnan(values)
+    sums = np.zeros((len(unique_days), values.shape[1]))
+    counts = np.zeros(sums.shape)
+    flag_counts = np.zeros(sums.shape, dtype=np.int64)
+    np.add.at(sums, rows, np.where(present, values, 0.0))
+    np.add.at(counts, rows, present)
+    np.add.at(flag_counts, rows, flags)
+    with np.errstate(invalid='ignore'):
+        return unique_days, sums / counts, flag_counts
+
+
+def rolling_mean(values, window):
+    """Mean of the last ``window`` rows of each column, skipping NaN, via cumulative sums"""
+    present = ~np.isnan(values)
+    sums = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(np.where(present, values, 0.0), axis=0)])
+    counts = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(present, axis=0)])
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    with np.errstate(invalid='ignore'):
+        return (sums[end] - sums[start]) / (counts[end] - counts[start])
+
+
+def slopes(days, values):
+    """Least-squares slope of each column against the day number, NaN with under two readings"""
+    present = ~np.isnan(values)
+    # Days from the first reading keep the sums small
+    origin = days[0] if len(days) else 0
+    x = np.where(present, (days - origin)[:, None], 0.0)
+    y = np.where(present, values, 0.0)
+    n = present.sum(axis=0)
+    denominator = n * (x * x).sum(axis=0) - x.sum(axis=0) ** 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (n * (x * y).sum(axis=0) - x.sum(axis=0) * y.sum(axis=0)) / denominator
+    return np.where(denominator > 0, slope, np.nan)
+
+
+def _clean(array):
+    # JSON has no NaN
+    return [None if np.isnan(value) else round(float(value), 2) for value in array]
+
+
+def trend(days, values, flags, window=DEFAULT_WINDOW):
+    """
+    Rolling means, slopes and out-of-range flags for every vital in one pass
+    over the matrix. ``flags`` is per reading (booleans) or per day (counts).
+    """
+    means = rolling_mean(values, window)
+    slope = slopes(days, values) * SLOPE_PERIOD_DAYS
+    series = {}
+    for column, field in enumerate(VITAL_FIELDS):
+        series[field] = {
+            'values': _clean(values[:, column]),
+            'rolling_mean': _clean(means[:, column]),
+            f'slope_per_{SLOPE_PERIOD_DAYS}_days': _clean(slope[column:column + 1])[0],
+        }
+        if field in NORMAL_RANGES:
+            series[field]['out_of_range'] = flags[:, column].tolist()
+    return series
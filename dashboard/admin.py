@@ -1,3 +1,31 @@
 from django.contrib import admin
 
+from .bulk import resume_bulk_job, stale_jobs
+from .models import BulkJob
+
 # Register your models here.
+
+@admin.register(BulkJob)
+class BulkJobAdmin(admin.ModelAdmin):
+    list_display = ['operation', 'model_label', 'status', 'progress_display', 'affected', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'operation']
+    list_select_related = ['created_by']
+    readonly_fields = ['operation', 'model_label', 'status', 'progress_display', 'total', 'processed', 'affected', 'error', 'created_by', 'created_at', 'started_at', 'updated_at', 'finished_at']
+    fields = readonly_fields
+    actions = ['resume_jobs']
+    
+    def progress_display(self, obj):
+        return f"{obj.progress}% ({obj.processed}/{obj.total})"
+    progress_display.short_description = 'Progress'
+    
+    def resume_jobs(self, request, queryset):
+        # Only jobs that stopped saving progress; live ones are left alone
+        resumed = sum(resume_bulk_job(job) for job in stale_jobs().filter(pk__in=queryset.values('pk')))
+        self.message_user(request, f"{resumed} stalled jobs resumed in the background.")
+    resume_jobs.short_description = 'Resume selected stalled jobs'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
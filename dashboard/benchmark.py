@@ -0,0 +1,94 @@
+import statistics
+import time
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard import urls as dashboard_urls
+from residents import urls as residents_urls
+from residents.models import Resident
+
+# URL modules whose pages are timed, plus every changelist of these apps
+BENCHMARK_URLCONFS = [dashboard_urls, residents_urls]
+BENCHMARK_ADMIN_APPS = ['residents', 'bhw_reports']
+BENCHMARK_USERNAME = 'benchmark'
+
+
+def sample_kwargs():
+    """Values for the URL parameters: the busiest precinct and the CSV export"""
+    precinct = (
+        Resident.objects.filter(is_active=True).exclude(precinct_number='')
+        .values_list('precinct_number', flat=True).order_by('precinct_number').first()
+    )
+    return {'precinct_number': precinct or '0001A', 'export_format': 'csv'}
+
+
+def benchmark_urls(kwargs=None):
+    """(name, url) of every page in BENCHMARK_URLCONFS and each admin changelist"""
+    kwargs = kwargs or sample_kwargs()
+    urls = []
+    for urlconf in BENCHMARK_URLCONFS:
+        for pattern in urlconf.urlpatterns:
+            name = f'{urlconf.app_name}:{pattern.name}'
+            needed = pattern.pattern.converters
+            urls.append((name, reverse(name, kwargs={key: kwargs[key] for key in needed})))
+    for model in admin.site._registry:
+        if model._meta.app_label in BENCHMARK_ADMIN_APPS:
+            name = f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+            urls.append((name, reverse(name)))
+    return urls
+
+
+def percentile(samples, percent):
+    return statistics.quantiles(samples, n=100, method='inclusive')[percent - 1] if len(samples) > 1 else samples[0]
+
+
+def time_url(client, url, repeat, warm_cache=False):
+    """
+    Request ``url`` ``repeat`` times and return its status, query count and
+    latency percentiles in milliseconds. The cache is cleared before every
+    request unless ``warm_cache`` is set, so the page does all its work.
+    """
+    timings = []
+    for _ in range(repeat):
+        if not warm_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                # Exports do their work while streaming
+                for _ in response.streaming_content:
+                    pass
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'url': url,
+        'status': response.status_code,
+        'queries': len(queries),
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'max_ms': round(max(timings), 2),
+    }
+
+
+def benchmark_client():
+    user, _ = User.objects.get_or_create(
+        username=BENCHMARK_USERNAME, defaults={'is_staff': True, 'is_superuser': True}
+    )
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def run_benchmark(repeat=10, warm_cache=False):
+    """Time every benchmark URL against the data currently in the database"""
+    client = benchmark_client()
+    return {
+        name: time_url(client, url, repeat, warm_cache)
+        for name, url in benchmark_urls()
+    }
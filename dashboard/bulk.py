@@ -0,0 +1,167 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Now
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from bhw_reports.models import SeniorCitizenReport
+from residents.households import refresh_household_aggregates
+from residents.models import Household, Resident
+from .cache import bump_generation
+from .counters import COUNTED_MODELS, rebuild_counters
+from .models import BulkJob
+
+logger = logging.getLogger(__name__)
+
+# Rows written per transaction; SQLite is only locked for one chunk at a time
+BULK_CHUNK_SIZE = 500
+
+# name -> {'apply': function(model, ids) returning the rows changed, 'touches': other models written}
+BULK_OPERATIONS = {}
+
+# A queued or running job that has not saved progress for this long is
+# presumed lost with its process and may be resumed
+STALE_AFTER = timedelta(minutes=10)
+
+# One worker, so jobs queue up instead of contending for the write lock
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bulk-jobs')
+
+
+def bulk_operation(name, touches=()):
+    """Register ``apply(model, ids)`` as the bulk operation ``name``"""
+    def decorator(apply):
+        BULK_OPERATIONS[name] = {'apply': apply, 'touches': list(touches)}
+        return apply
+    return decorator
+
+
+@bulk_operation('deactivate', touches=['residents.Household'])
+def deactivate(model, ids):
+    # update() skips auto_now; conditional GETs rely on updated_at moving
+    updated = model.objects.filter(pk__in=ids, is_active=True).update(is_active=False, updated_at=Now())
+    if model is Resident and updated:
+        # Inactive members no longer count towards their household
+        memberships = Household.members.through.objects.filter(resident_id__in=ids)
+        refresh_household_aggregates(Household.objects.filter(pk__in=memberships.values('household_id')))
+    return updated
+
+
+@bulk_operation('create_senior_reports', touches=['bhw_reports.SeniorCitizenReport'])
+def create_senior_reports(model, ids):
+    # Only residents flagged as senior citizens, not everyone aged 60 and over
+    residents = (
+        model.objects.filter(pk__in=ids, is_active=True, is_senior_citizen=True)
+        .filter(senior_citizen_report__isnull=True).values_list('pk', flat=True)
+    )
+    reports = SeniorCitizenReport.objects.bulk_create(
+        [SeniorCitizenReport(resident_id=resident_id) for resident_id in residents]
+    )
+    return len(reports)
+
+
+def start_bulk_job(operation, queryset, user=None):
+    """
+    Record a BulkJob for every row of ``queryset`` and hand it to the
+    background worker once the current transaction commits.
+    """
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    job = BulkJob.objects.create(
+        operation=operation,
+        model_label=queryset.model._meta.label,
+        total=len(ids),
+        object_ids=ids,
+        created_by=user if user and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: _executor.submit(_work, job.pk))
+    return job
+
+
+def _work(job_id):
+    # The worker thread opens its own connections; close them between jobs
+    close_old_connections()
+    try:
+        run_bulk_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def stale_jobs(now=None):
+    """Unfinished jobs whose process no longer saves progress, e.g. after a restart"""
+    now = now or timezone.now()
+    return BulkJob.objects.filter(status__in=['queued', 'running'], updated_at__lt=now - STALE_AFTER)
+
+
+def claim(job):
+    """Take over a stale job; False when another process got to it first"""
+    return bool(BulkJob.objects.filter(
+        pk=job.pk, status=job.status, updated_at=job.updated_at
+    ).update(status='queued', updated_at=timezone.now()))
+
+
+def resume_bulk_job(job, background=True):
+    """Resume a stale job after its last finished chunk, here or on the worker"""
+    if not claim(job):
+        return False
+    if background:
+        transaction.on_commit(lambda: _executor.submit(_work, job.pk))
+    else:
+        run_bulk_job(job.pk)
+    return True
+
+
+def run_bulk_job(job_id, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Apply the job's operation to its remaining ids one chunk per
+    transaction, saving progress with each chunk, then rebuild the derived
+    data the raw updates bypassed: dashboard counters and cached report
+    generations.
+    """
+    job = BulkJob.objects.get(pk=job_id)
+    try:
+        model = apps.get_model(job.model_label)
+        operation = BULK_OPERATIONS[job.operation]
+        BulkJob.objects.filter(pk=job_id).update(
+            status='running', started_at=Coalesce(F('started_at'), Now()), updated_at=timezone.now()
+        )
+
+        ids = job.object_ids
+        for start in range(job.processed, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            with transaction.atomic():
+                affected = operation['apply'](model, chunk)
+                # Progress commits with the chunk, so a resume never repeats one
+                BulkJob.objects.filter(pk=job_id).update(
+                    processed=start + len(chunk), affected=F('affected') + affected,
+                    updated_at=timezone.now(),
+                )
+
+        written = [job.model_label, *operation['touches']]
+        if set(written) & set(COUNTED_MODELS):
+            rebuild_counters()
+        bump_generation(*written)
+        BulkJob.objects.filter(pk=job_id).update(status='done', finished_at=timezone.now(), updated_at=timezone.now())
+    except Exception as exc:
+        logger.exception('Bulk job %s failed', job_id)
+        BulkJob.objects.filter(pk=job_id).update(
+            status='failed', error=str(exc), finished_at=timezone.now(), updated_at=timezone.now()
+        )
+
+
+def bulk_action(operation, description):
+    """Admin action running ``operation`` over the selected rows as a BulkJob"""
+    def action(modeladmin, request, queryset):
+        job = start_bulk_job(operation, queryset, request.user)
+        url = reverse('admin:dashboard_bulkjob_change', args=[job.pk])
+        modeladmin.message_user(request, format_html(
+            'Started "{}" for {} rows in the background. <a href="{}">Follow its progress</a>.',
+            description, job.total, url
+        ))
+    action.__name__ = f'bulk_{operation}'
+    action.short_description = description
+    return action
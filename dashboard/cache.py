@@ -0,0 +1,98 @@
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+# Models whose writes invalidate cached report data
+VERSIONED_MODELS = [
+    'residents.Resident',
+    'residents.Household',
+    'bhw_reports.SeniorCitizenReport',
+    'bhw_reports.SariSariStoreReport',
+    'bhw_reports.FourPsBeneficiaryReport',
+    'bhw_reports.PregnancyReport',
+    'bhw_reports.HealthReport',
+]
+
+# How long one request may hold the recompute lock before another takes over
+RECOMPUTE_LOCK_TIMEOUT = 30
+
+# How often a request with nothing to serve checks for the value being computed
+RECOMPUTE_POLL_INTERVAL = 0.05
+
+
+def _generation_key(label):
+    return f'generation:{label.lower()}'
+
+
+def _increment(label):
+    key = _generation_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted or never set: start from a fresh value no older entry can carry
+        cache.add(key, time.time_ns(), None)
+
+
+def bump_generation(*labels):
+    """Invalidate every cached value that depends on the given models"""
+    for label in labels:
+        _increment(label)
+        # Bump again once the transaction commits, so a value recomputed from
+        # pre-commit data in the meantime is not kept under the new generation
+        transaction.on_commit(lambda label=label: _increment(label))
+
+
+def get_generations(labels):
+    keys = [_generation_key(label) for label in labels]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return tuple(generations[key] for key in keys)
+
+
+def _wait_for_value(cache_key, lock_key):
+    # Until the lock holder stores the value, or gives up without one
+    deadline = time.monotonic() + RECOMPUTE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(RECOMPUTE_POLL_INTERVAL)
+        entry = cache.get(cache_key)
+        if entry is not None or cache.get(lock_key) is None:
+            return entry
+    return None
+
+
+def cached_value(key, labels, compute, timeout=DEFAULT_TIMEOUT):
+    """
+    Return ``compute()`` cached under ``key`` until one of the models in
+    ``labels`` is written to, or at most the cache's TIMEOUT.
+
+    Only one request at a time recomputes a value. While it does, concurrent
+    requests serve the previous value, or wait for the new one when there is
+    none yet.
+    """
+    cache_key = f'versioned:{key}'
+    lock_key = f'{cache_key}:lock'
+    generations = get_generations(labels)
+
+    entry = cache.get(cache_key)
+    if entry is not None and entry[0] == generations:
+        return entry[1]
+    locked = cache.add(lock_key, True, RECOMPUTE_LOCK_TIMEOUT)
+    if not locked:
+        # Someone else is already recomputing this value
+        if entry is None:
+            entry = _wait_for_value(cache_key, lock_key)
+        if entry is not None:
+            return entry[1]
+
+    try:
+        value = compute()
+        cache.set(cache_key, (generations, value), timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
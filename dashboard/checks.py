@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    # Generations bumped in one process must reach the others (dashboard/cache.py)
+    if settings.CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+        return [Warning(
+            "The default cache is local to each process, so cached reports can "
+            "lag writes made through other worker processes until they expire.",
+            hint="Use a shared backend such as FileBasedCache when running several workers.",
+            id='dashboard.W001',
+        )]
+    return []
@@ -0,0 +1,80 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from barangay_ims.query_budget import record_in_thread
+
+THREAD_NAME_PREFIX = 'report-queries'
+
+_executor = None
+_free_workers = None
+_lock = threading.Lock()
+
+
+def _pool():
+    # Built on first use, sized by settings.REPORT_QUERY_WORKERS
+    global _executor, _free_workers
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REPORT_QUERY_WORKERS, thread_name_prefix=THREAD_NAME_PREFIX
+            )
+            _free_workers = threading.BoundedSemaphore(settings.REPORT_QUERY_WORKERS)
+    return _executor, _free_workers
+
+
+def _evaluate(query):
+    # Connections are reused up to CONN_MAX_AGE, like between requests
+    close_old_connections()
+    try:
+        record_in_thread()
+        return query()
+    finally:
+        close_old_connections()
+        _free_workers.release()
+
+
+def in_transaction():
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+
+def runs_inline():
+    # Another connection could not see the transaction's uncommitted writes,
+    # and a pool thread waiting on the pool could wait for itself
+    return (
+        settings.REPORT_QUERY_WORKERS < 1
+        or in_transaction()
+        or threading.current_thread().name.startswith(THREAD_NAME_PREFIX)
+    )
+
+
+def evaluate_concurrently(queries):
+    """
+    Run the independent callables in the ``queries`` dict at the same time and
+    return their results under the same names, so a page waits for its
+    slowest query rather than the sum of them. Only worth it for queries that
+    each take a while.
+
+    The first callable runs in the calling thread; the others go to the
+    report query pool while it has a free worker and otherwise run in the
+    calling thread too, so a busy pool is never slower than running them in
+    turn. Pool callables run with a copy of the caller's context, keeping the
+    read database (barangay_ims.db_router) and query budget of the request.
+    """
+    if runs_inline():
+        return {name: query() for name, query in queries.items()}
+
+    executor, free_workers = _pool()
+    names = list(queries)
+    futures = {}
+    for name in names[1:]:
+        if not free_workers.acquire(blocking=False):
+            break
+        futures[name] = executor.submit(contextvars.copy_context().run, _evaluate, queries[name])
+
+    results = {name: queries[name]() for name in names if name not in futures}
+    results.update((name, future.result()) for name, future in futures.items())
+    return {name: results[name] for name in names}
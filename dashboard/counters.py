@@ -0,0 +1,194 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import DashboardCounter
+from .stats import age_cutoffs, format_distributions
+
+# Counters read back whole on every dashboard hit
+SUMMARY_CATEGORIES = ['resident', 'gender', 'civil_status', 'employment_status', 'flag', 'household', 'bhw']
+
+# Counters keyed by an ISO date; they are summed over a date range when read
+DATE_CATEGORIES = ['birth_date', 'health_report_date']
+
+RESIDENT_FLAGS = {
+    'is_pwd': 'pwd_count',
+    'is_senior_citizen': 'senior_citizens',
+    'is_4ps_beneficiary': 'fourps_beneficiaries',
+    'is_solo_parent': 'solo_parents',
+}
+
+GENDER_STATS = {
+    'M': 'male_residents',
+    'F': 'female_residents',
+}
+
+
+def _date_key(value):
+    # Unsaved instances may still hold the raw value (a string or an aware datetime)
+    return models.DateField().to_python(value).isoformat()
+
+
+def resident_keys(row):
+    if not row['is_active']:
+        return []
+    zone = row['zone']
+    keys = [
+        (zone, 'resident', 'total_residents'),
+        (zone, 'gender', row['gender']),
+        (zone, 'civil_status', row['civil_status']),
+        (zone, 'employment_status', row['employment_status']),
+        ('', 'birth_date', _date_key(row['date_of_birth'])),
+    ]
+    for field, key in RESIDENT_FLAGS.items():
+        if row[field]:
+            keys.append((zone, 'flag', key))
+    return keys
+
+
+def household_keys(row):
+    return [('', 'household', 'total_households')]
+
+
+def active_report_keys(key):
+    def keys(row):
+        return [('', 'bhw', key)] if row['is_active'] else []
+    return keys
+
+
+def pregnancy_keys(row):
+    if row['is_active'] and row['pregnancy_outcome'] == 'ongoing':
+        return [('', 'bhw', 'active_pregnancies')]
+    return []
+
+
+def health_report_keys(row):
+    return [('', 'health_report_date', _date_key(row['report_date']))]
+
+
+# model label -> (fields the counters depend on, function mapping a row to counter keys)
+COUNTED_MODELS = {
+    'residents.Resident': (
+        ['is_active', 'zone', 'gender', 'civil_status', 'employment_status', 'date_of_birth', *RESIDENT_FLAGS],
+        resident_keys,
+    ),
+    'residents.Household': ([], household_keys),
+    'bhw_reports.SeniorCitizenReport': (['is_active'], active_report_keys('senior_reports')),
+    'bhw_reports.SariSariStoreReport': (['is_active'], active_report_keys('active_businesses')),
+    'bhw_reports.FourPsBeneficiaryReport': (['is_active'], active_report_keys('active_fourps')),
+    'bhw_reports.PregnancyReport': (['is_active', 'pregnancy_outcome'], pregnancy_keys),
+    'bhw_reports.HealthReport': (['report_date'], health_report_keys),
+}
+
+
+def counter_keys(instance):
+    """Counter keys a saved instance contributes to"""
+    fields, keys = COUNTED_MODELS[instance._meta.label]
+    return keys({field: getattr(instance, field) for field in fields})
+
+
+def stored_counter_keys(model, pk):
+    """Counter keys the database row for ``pk`` currently contributes to"""
+    fields, keys = COUNTED_MODELS[model._meta.label]
+    row = model._default_manager.filter(pk=pk).values('pk', *fields).first()
+    return keys(row) if row else []
+
+
+def apply_delta(old_keys, new_keys):
+    """Move the counters from ``old_keys`` to ``new_keys`` with in-place updates"""
+    delta = Counter(new_keys)
+    delta.subtract(old_keys)
+
+    for (zone, category, key), change in delta.items():
+        if not change:
+            continue
+        counter = DashboardCounter.objects.filter(zone=zone, category=category, key=key)
+        updated = counter.update(value=F('value') + change, updated_at=timezone.now())
+        if not updated:
+            _, created = DashboardCounter.objects.get_or_create(
+                zone=zone, category=category, key=key,
+                defaults={'value': change}
+            )
+            if not created:
+                counter.update(value=F('value') + change, updated_at=timezone.now())
+
+
+def rebuild_counters(apps=django_apps):
+    """Recompute every counter from the source tables"""
+    totals = Counter()
+    for label, (fields, keys) in COUNTED_MODELS.items():
+        model = apps.get_model(label)
+        if not fields:
+            totals.update(dict.fromkeys(keys({}), model._default_manager.count()))
+            continue
+        rows = model._default_manager.values(*fields).annotate(row_count=Count('pk')).order_by()
+        for row in rows:
+            for counter_key in keys(row):
+                totals[counter_key] += row['row_count']
+
+    counter_model = apps.get_model('dashboard', 'DashboardCounter')
+    counters = [
+        counter_model(zone=zone, category=category, key=key, value=value)
+        for (zone, category, key), value in totals.items() if value
+    ]
+    with transaction.atomic():
+        counter_model.objects.all().delete()
+        counter_model.objects.bulk_create(counters, batch_size=500)
+    return len(counters)
+
+
+def counter_statistics(today=None):
+    """Dashboard statistics read from the rollup table instead of the source tables"""
+    today = today or timezone.now().date()
+    adult_cutoff, senior_cutoff = age_cutoffs(today)
+
+    stats = Counter()
+    zones = Counter()
+    civil_statuses = Counter()
+    employment_statuses = Counter()
+    rows = DashboardCounter.objects.filter(category__in=SUMMARY_CATEGORIES).values_list(
+        'zone', 'category', 'key', 'value'
+    )
+    for zone, category, key, value in rows:
+        if category == 'civil_status':
+            civil_statuses[key] += value
+        elif category == 'employment_status':
+            employment_statuses[key] += value
+        elif category == 'gender':
+            stats[GENDER_STATS.get(key)] += value
+        else:
+            # resident, flag, household and bhw counters are keyed by stat name
+            stats[key] += value
+            if category == 'resident':
+                zones[zone] += value
+
+    date_stats = DashboardCounter.objects.filter(category__in=DATE_CATEGORIES).aggregate(
+        children=Sum('value', filter=Q(category='birth_date', key__gt=adult_cutoff.isoformat())),
+        adults=Sum('value', filter=Q(
+            category='birth_date',
+            key__lte=adult_cutoff.isoformat(),
+            key__gt=senior_cutoff.isoformat()
+        )),
+        seniors=Sum('value', filter=Q(category='birth_date', key__lte=senior_cutoff.isoformat())),
+        recent_health_reports=Sum('value', filter=Q(
+            category='health_report_date',
+            key__gte=(today - timedelta(days=7)).isoformat()
+        )),
+    )
+
+    context = {
+        key: stats[key] for key in [
+            'total_residents', 'male_residents', 'female_residents',
+            *RESIDENT_FLAGS.values(), 'total_households', 'senior_reports',
+            'active_businesses', 'active_fourps', 'active_pregnancies',
+        ]
+    }
+    context.update({key: value or 0 for key, value in date_stats.items()})
+    context.update(format_distributions(
+        +zones, +civil_statuses, +employment_statuses, context['total_residents']
+    ))
+    return context
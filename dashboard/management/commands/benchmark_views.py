@@ -0,0 +1,82 @@
+import json
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from barangay_ims.db_router import READ_ALIAS
+from dashboard.benchmark import run_benchmark
+from dashboard.synthetic import seed_synthetic_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every dashboard and residents page and the admin changelists "
+        "against synthetic data at several scales, recording query counts "
+        "and p50/p95 latencies as JSON. Runs in a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000],
+                            help="Resident counts to benchmark; each gets a quarter as many "
+                                 "households and ten times as many health reports")
+        parser.add_argument('--repeat', type=int, default=10,
+                            help="Requests per page (default %(default)s)")
+        parser.add_argument('--warm-cache', action='store_true',
+                            help="Keep cached report data between requests")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='benchmark.json',
+                            help="Where to write the results (default %(default)s)")
+
+    def handle(self, *args, **options):
+        results = {
+            'started_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'warm_cache': options['warm_cache'],
+            'scales': [],
+        }
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # Report views read through the replica alias; point it at the test database too
+        replica = connections[READ_ALIAS]
+        replica_settings = replica.settings_dict.copy()
+        replica.close()
+        replica.creation.set_as_test_mirror(connection.settings_dict)
+        try:
+            for scale in options['scales']:
+                call_command('flush', interactive=False, verbosity=0)
+                cache.clear()
+                started = time.perf_counter()
+                created = seed_synthetic_data(
+                    residents=scale, households=scale // 4, health_reports=scale * 10, seed=options['seed']
+                )
+                seeded = time.perf_counter() - started
+                self.stdout.write(f"Seeded {scale} residents in {seeded:.2f}s")
+
+                pages = run_benchmark(options['repeat'], options['warm_cache'])
+                for name, page in pages.items():
+                    self.stdout.write(
+                        f"  {name:<55} {page['status']} {page['queries']:>4} queries "
+                        f"p50 {page['p50_ms']:>9.2f}ms p95 {page['p95_ms']:>9.2f}ms"
+                    )
+                results['scales'].append({
+                    'residents': scale,
+                    'rows': dict(created),
+                    'seed_seconds': round(seeded, 2),
+                    'pages': pages,
+                })
+        finally:
+            replica.close()
+            replica.settings_dict.update(replica_settings)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        with open(options['output'], 'w') as output:
+            json.dump(results, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
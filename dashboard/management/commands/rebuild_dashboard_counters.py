@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.cache import VERSIONED_MODELS, bump_generation
+from dashboard.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard rollup counters from scratch. Run this after "
+        "bulk changes that bypass model signals (queryset.update(), raw SQL)."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_counters()
+        bump_generation(*VERSIONED_MODELS)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {count} dashboard counters in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,36 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from barangay_ims.db_router import READ_ALIAS, is_same_database
+from dashboard.cache import VERSIONED_MODELS, bump_generation
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary database onto the report replica (BARANGAY_IMS_REPORTS_DB) "
+        "with SQLite's online backup, then invalidate the cached reports so they "
+        "are recomputed from the fresh copy. Run it from cron; reports lag the "
+        "primary by at most the interval."
+    )
+
+    def handle(self, *args, **options):
+        if is_same_database(READ_ALIAS):
+            raise CommandError("BARANGAY_IMS_REPORTS_DB is not set: reports already read from the primary")
+
+        started = time.perf_counter()
+        source = connections['default']
+        source.ensure_connection()
+        # Into the existing file, so open replica connections see the new pages
+        target = sqlite3.connect(connections[READ_ALIAS].settings_dict['NAME'], timeout=20)
+        try:
+            source.connection.backup(target)
+        finally:
+            target.close()
+
+        # Values cached from the old copy are keyed by the generations it lagged behind
+        bump_generation(*VERSIONED_MODELS)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Refreshed the {READ_ALIAS} replica in {elapsed:.2f}s"))
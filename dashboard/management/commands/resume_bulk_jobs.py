@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.bulk import STALE_AFTER, resume_bulk_job, stale_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Finish admin bulk jobs left queued or running by a process that "
+        f"stopped, i.e. with no progress saved for {STALE_AFTER}. Each job "
+        "resumes after its last finished chunk. Run after a deploy or restart."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        resumed = 0
+        for job in stale_jobs():
+            if resume_bulk_job(job, background=False):
+                job.refresh_from_db()
+                resumed += 1
+                self.stdout.write(f"{job}: {job.status}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Resumed {resumed} bulk jobs in {elapsed:.2f}s"))
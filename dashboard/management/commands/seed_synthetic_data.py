@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.synthetic import seed_synthetic_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Add synthetic residents, households and BHW reports with realistic "
+        "distributions, for reproducing performance problems locally. Never "
+        "run this against production data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--residents', type=int, default=100000,
+                            help="Residents to create (default %(default)s)")
+        parser.add_argument('--households', type=int, default=25000,
+                            help="Households to spread them across (default %(default)s)")
+        parser.add_argument('--health-reports', type=int, default=1000000,
+                            help="Health reports to create (default %(default)s)")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Random seed; the same seed gives the same data")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created = seed_synthetic_data(
+            residents=options['residents'], households=options['households'],
+            health_reports=options['health_reports'], seed=options['seed'],
+        )
+        elapsed = time.perf_counter() - started
+        for name, count in created.items():
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {sum(created.values())} rows in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:27
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+RESIDENT_FLAGS = {
+    'is_pwd': 'pwd_count',
+    'is_senior_citizen': 'senior_citizens',
+    'is_4ps_beneficiary': 'fourps_beneficiaries',
+    'is_solo_parent': 'solo_parents',
+}
+
+
+def resident_keys(row):
+    if not row['is_active']:
+        return []
+    zone = row['zone']
+    keys = [
+        (zone, 'resident', 'total_residents'),
+        (zone, 'gender', row['gender']),
+        (zone, 'civil_status', row['civil_status']),
+        (zone, 'employment_status', row['employment_status']),
+        ('', 'birth_date', row['date_of_birth'].isoformat()),
+    ]
+    keys.extend((zone, 'flag', key) for field, key in RESIDENT_FLAGS.items() if row[field])
+    return keys
+
+
+def active_report_keys(key):
+    return lambda row: [('', 'bhw', key)] if row['is_active'] else []
+
+
+# A frozen copy of dashboard.counters.COUNTED_MODELS as of this migration
+COUNTED_MODELS = {
+    ('residents', 'Resident'): (
+        ['is_active', 'zone', 'gender', 'civil_status', 'employment_status', 'date_of_birth', *RESIDENT_FLAGS],
+        resident_keys,
+    ),
+    ('bhw_reports', 'SeniorCitizenReport'): (['is_active'], active_report_keys('senior_reports')),
+    ('bhw_reports', 'SariSariStoreReport'): (['is_active'], active_report_keys('active_businesses')),
+    ('bhw_reports', 'FourPsBeneficiaryReport'): (['is_active'], active_report_keys('active_fourps')),
+    ('bhw_reports', 'PregnancyReport'): (
+        ['is_active', 'pregnancy_outcome'],
+        lambda row: [('', 'bhw', 'active_pregnancies')] if row['is_active'] and row['pregnancy_outcome'] == 'ongoing' else [],
+    ),
+    ('bhw_reports', 'HealthReport'): (['report_date'], lambda row: [('', 'health_report_date', row['report_date'].isoformat())]),
+}
+
+
+def populate_counters(apps, schema_editor):
+    # One GROUP BY per source table, against the historical models
+    totals = Counter()
+    totals[('', 'household', 'total_households')] = apps.get_model('residents', 'Household').objects.count()
+    for (app_label, model_name), (fields, keys) in COUNTED_MODELS.items():
+        rows = apps.get_model(app_label, model_name).objects.values(*fields).annotate(row_count=Count('pk')).order_by()
+        for row in rows:
+            for key in keys(row):
+                totals[key] += row['row_count']
+
+    DashboardCounter = apps.get_model('dashboard', 'DashboardCounter')
+    DashboardCounter.objects.bulk_create([
+        DashboardCounter(zone=zone, category=category, key=key, value=value)
+        for (zone, category, key), value in totals.items() if value
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('residents', '0002_resident_precinct_number'),
+        ('bhw_reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zone', models.CharField(blank=True, max_length=50)),
+                ('category', models.CharField(max_length=30)),
+                ('key', models.CharField(max_length=50)),
+                ('value', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Counter',
+                'verbose_name_plural': 'Dashboard Counters',
+                'ordering': ['category', 'zone', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('category', 'key', 'zone'), name='unique_dashboard_counter')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_bulk_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkjob',
+            name='object_ids',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='bulkjob',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
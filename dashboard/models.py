@@ -1,3 +1,65 @@
+from django.conf import settings
 from django.db import models
 
 # Create your models here.
+
+class DashboardCounter(models.Model):
+    """Rollup of dashboard totals, kept in step by dashboard.signals"""
+    zone = models.CharField(max_length=50, blank=True)
+    category = models.CharField(max_length=30)
+    key = models.CharField(max_length=50)
+    value = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['category', 'zone', 'key']
+        verbose_name = 'Dashboard Counter'
+        verbose_name_plural = 'Dashboard Counters'
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'key', 'zone'], name='unique_dashboard_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.category}:{self.key} (Zone {self.zone or '-'}) = {self.value}"
+
+
+class BulkJob(models.Model):
+    """One chunked admin bulk action, run by dashboard.bulk on a background worker"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    operation = models.CharField(max_length=50)
+    model_label = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    affected = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    # Selected primary keys; the first `processed` of them are done, so a
+    # job interrupted by a restart resumes from there
+    object_ids = models.JSONField(default=list)
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Moves with every chunk; a running job that stops moving has died
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Bulk Job'
+        verbose_name_plural = 'Bulk Jobs'
+
+    def __str__(self):
+        return f"{self.operation} {self.model_label} ({self.processed}/{self.total})"
+
+    @property
+    def progress(self):
+        """Percentage of the selected rows processed so far"""
+        return round(100 * self.processed / self.total) if self.total else 100
@@ -0,0 +1,42 @@
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+
+from .cache import VERSIONED_MODELS, bump_generation
+from .counters import COUNTED_MODELS, apply_delta, counter_keys, stored_counter_keys
+
+
+def remember_counter_keys(sender, instance, **kwargs):
+    # Capture what the row counted for before the save overwrites it
+    instance._dashboard_counter_keys = []
+    if instance.pk is not None:
+        instance._dashboard_counter_keys = stored_counter_keys(sender, instance.pk)
+
+
+def update_counters_on_save(sender, instance, **kwargs):
+    new_keys = counter_keys(instance)
+    apply_delta(getattr(instance, '_dashboard_counter_keys', []), new_keys)
+    instance._dashboard_counter_keys = new_keys
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    apply_delta(counter_keys(instance), [])
+
+
+def invalidate_cached_reports(sender, instance, **kwargs):
+    bump_generation(instance._meta.label)
+
+
+def invalidate_cached_households(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_generation('residents.Household')
+
+
+def connect_signals():
+    for label in COUNTED_MODELS:
+        pre_save.connect(remember_counter_keys, sender=label, dispatch_uid=f'dashboard_counters_pre_save_{label}')
+        post_save.connect(update_counters_on_save, sender=label, dispatch_uid=f'dashboard_counters_post_save_{label}')
+        post_delete.connect(update_counters_on_delete, sender=label, dispatch_uid=f'dashboard_counters_post_delete_{label}')
+
+    for label in VERSIONED_MODELS:
+        post_save.connect(invalidate_cached_reports, sender=label, dispatch_uid=f'dashboard_cache_post_save_{label}')
+        post_delete.connect(invalidate_cached_reports, sender=label, dispatch_uid=f'dashboard_cache_post_delete_{label}')
+    m2m_changed.connect(invalidate_cached_households, sender='residents.Household_members', dispatch_uid='dashboard_cache_household_members')
@@ -0,0 +1,112 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from residents.models import AGE_BANDS, Resident, Household, years_before
+from bhw_reports.models import (
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport, HealthReport
+)
+
+
+def age_cutoffs(today):
+    """Birth dates separating children, adults and seniors"""
+    adult_cutoff = years_before(today, AGE_BANDS['adults'][0])
+    senior_cutoff = years_before(today, AGE_BANDS['seniors'][0])
+    return adult_cutoff, senior_cutoff
+
+
+def resident_statistics(today=None):
+    """All active-resident counters in one conditional aggregation query"""
+    today = today or timezone.now().date()
+    adult_cutoff, senior_cutoff = age_cutoffs(today)
+
+    return Resident.objects.filter(is_active=True).aggregate(
+        total_residents=Count('id'),
+        male_residents=Count('id', filter=Q(gender='M')),
+        female_residents=Count('id', filter=Q(gender='F')),
+        children=Count('id', filter=Q(date_of_birth__gt=adult_cutoff)),
+        adults=Count('id', filter=Q(date_of_birth__lte=adult_cutoff, date_of_birth__gt=senior_cutoff)),
+        seniors=Count('id', filter=Q(date_of_birth__lte=senior_cutoff)),
+        pwd_count=Count('id', filter=Q(is_pwd=True)),
+        senior_citizens=Count('id', filter=Q(is_senior_citizen=True)),
+        fourps_beneficiaries=Count('id', filter=Q(is_4ps_beneficiary=True)),
+        solo_parents=Count('id', filter=Q(is_solo_parent=True)),
+    )
+
+
+def resident_distributions(total_residents):
+    """Zone, civil status and employment breakdowns from a single GROUP BY"""
+    rows = Resident.objects.filter(is_active=True).values(
+        'zone', 'civil_status', 'employment_status'
+    ).annotate(count=Count('id')).order_by()
+
+    zones = defaultdict(int)
+    civil_statuses = defaultdict(int)
+    employment_statuses = defaultdict(int)
+    for row in rows:
+        zones[row['zone']] += row['count']
+        civil_statuses[row['civil_status']] += row['count']
+        employment_statuses[row['employment_status']] += row['count']
+
+    return format_distributions(zones, civil_statuses, employment_statuses, total_residents)
+
+
+def format_distributions(zones, civil_statuses, employment_statuses, total_residents):
+    """Shape per-key counts the way the dashboard template expects them"""
+    zone_distribution = []
+    for zone, count in sorted(zones.items()):
+        percentage = (count * 100 / total_residents) if total_residents > 0 else 0
+        zone_distribution.append({
+            'zone': zone,
+            'count': count,
+            'percentage': round(percentage, 1)
+        })
+
+    return {
+        'zone_distribution': zone_distribution,
+        'civil_status_distribution': [
+            {'civil_status': key, 'count': count}
+            for key, count in sorted(civil_statuses.items())
+        ],
+        'employment_distribution': [
+            {'employment_status': key, 'count': count}
+            for key, count in sorted(employment_statuses.items())
+        ],
+    }
+
+
+def bhw_statistics(today=None):
+    """One filtered count per BHW report model"""
+    today = today or timezone.now().date()
+
+    return {
+        'senior_reports': SeniorCitizenReport.objects.filter(is_active=True).count(),
+        'active_businesses': SariSariStoreReport.objects.filter(is_active=True).count(),
+        'active_fourps': FourPsBeneficiaryReport.objects.filter(is_active=True).count(),
+        'active_pregnancies': PregnancyReport.objects.filter(
+            pregnancy_outcome='ongoing',
+            is_active=True
+        ).count(),
+        'recent_health_reports': HealthReport.objects.filter(
+            report_date__gte=today - timedelta(days=7)
+        ).count(),
+    }
+
+
+def dashboard_statistics(today=None):
+    """
+    Everything the dashboard page shows, counted straight from the tables in
+    a fixed number of queries. The page reads counters.counter_statistics
+    instead; this stays as the correctness reference the tests compare those
+    counters against.
+    """
+    today = today or timezone.now().date()
+
+    stats = resident_statistics(today)
+    stats['total_households'] = Household.objects.count()
+    stats.update(bhw_statistics(today))
+    stats.update(resident_distributions(stats['total_residents']))
+    return stats
@@ -0,0 +1,263 @@
+import random
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from residents.households import refresh_household_aggregates
+from residents.models import Household, Resident
+from residents.pagination import refresh_statistics
+from residents.search import rebuild_search_index
+from bhw_reports.models import (
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport, HealthReport
+)
+from .cache import VERSIONED_MODELS, bump_generation
+from .counters import rebuild_counters
+
+SEED_BATCH_SIZE = 5000
+
+FIRST_NAMES = {
+    'M': ['Jose', 'Juan', 'Mark', 'John Paul', 'Angelo', 'Rommel', 'Ricardo', 'Eduardo', 'Carlo',
+          'Miguel', 'Paolo', 'Renato', 'Ramon', 'Joshua', 'Christian', 'Danilo', 'Arnel', 'Jerome'],
+    'F': ['Maria', 'Ana', 'Rosario', 'Kristine', 'Jocelyn', 'Marites', 'Angelica', 'Liza', 'Grace',
+          'Mary Joy', 'Teresita', 'Cristina', 'Jasmine', 'Nenita', 'Lourdes', 'Camille', 'Aileen', 'Princess'],
+}
+LAST_NAMES = [
+    'Dela Cruz', 'Santos', 'Reyes', 'Garcia', 'Mendoza', 'Bautista', 'Villanueva', 'Ramos', 'Aquino',
+    'Castillo', 'Rivera', 'Torres', 'Flores', 'Gonzales', 'Navarro', 'Mercado', 'Domingo', 'Soriano',
+    'Pascual', 'Salazar', 'Del Rosario', 'Manalo', 'Dizon', 'Lopez', 'Fernandez', 'Aguilar', 'Tolentino',
+]
+STREETS = ['Rizal St.', 'Mabini St.', 'Bonifacio St.', 'Luna St.', 'Burgos St.', 'Del Pilar St.', 'Quezon Ave.']
+# Zones are uneven in size, like real puroks
+ZONE_WEIGHTS = {'1': 18, '2': 16, '3': 15, '4': 14, '5': 13, '6': 12, '7': 12}
+REPORT_TYPE_WEIGHTS = {
+    'routine_checkup': 55, 'immunization': 12, 'illness': 15, 'injury': 5, 'follow_up': 10, 'referral': 3,
+}
+
+
+class Generator:
+    """Residents, households and reports with realistic shapes, reproducible from ``seed``"""
+
+    def __init__(self, seed=0, today=None):
+        self.rng = random.Random(seed)
+        self.today = today or timezone.now().date()
+
+    def pick(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def decimal(self, mean, spread, low, places=1):
+        return Decimal(f'{max(low, self.rng.gauss(mean, spread)):.{places}f}')
+
+    def birth_date(self, min_age, max_age):
+        days = self.rng.randint(min_age * 365, max_age * 365 + 364)
+        return self.today - timedelta(days=days)
+
+    def household_ages(self, size):
+        """A head, usually a spouse, then children and the odd grandparent"""
+        head = min(int(self.rng.triangular(20, 85, 38)), 85)
+        ages = [head]
+        if size > 1 and self.rng.random() < 0.8:
+            ages.append(max(18, head + self.rng.randint(-6, 4)))
+        while len(ages) < size:
+            if head >= 45 and self.rng.random() < 0.15:
+                ages.append(min(100, head + self.rng.randint(20, 30)))
+            else:
+                ages.append(self.rng.randint(0, max(0, min(head - 18, 30))))
+        return ages
+
+    def resident(self, age, gender, last_name, zone, house_number, street):
+        adult = age >= 18
+        employed = adult and age < 65 and self.rng.random() < 0.6
+        fields = {
+            'first_name': self.rng.choice(FIRST_NAMES[gender]),
+            'middle_name': self.rng.choice(LAST_NAMES),
+            'last_name': last_name,
+            'date_of_birth': self.birth_date(age, age),
+            'place_of_birth': 'Quezon City',
+            'gender': gender,
+            'civil_status': self.rng.choice(['married', 'married', 'single', 'widowed']) if adult else 'single',
+            'house_number': house_number,
+            'street': street,
+            'zone': zone,
+            'city_municipality': 'Quezon City',
+            'province': 'Metro Manila',
+            'zip_code': '1100',
+            'educational_attainment': self.rng.choice(['elementary', 'high_school', 'high_school', 'college', 'vocational']),
+            'employment_status': 'employed' if employed else ('student' if 5 <= age < 22 else 'unemployed'),
+            'monthly_income': self.decimal(14000, 6000, 3000, 2) if employed else None,
+            'contact_number': f'09{self.rng.randint(100000000, 999999999)}' if adult else '',
+            'emergency_contact_name': f'{self.rng.choice(FIRST_NAMES["F"])} {last_name}',
+            'emergency_contact_number': f'09{self.rng.randint(100000000, 999999999)}',
+            'emergency_contact_relationship': 'Relative',
+            'is_pwd': self.rng.random() < 0.02,
+            # A few seniors are not flagged yet, which the coverage gap report picks up
+            'is_senior_citizen': age >= 60 and self.rng.random() < 0.95,
+            'is_active': self.rng.random() < 0.97,
+        }
+        if adult and self.rng.random() < 0.8:
+            fields['voters_id'] = f'V{self.rng.randint(10 ** 9, 10 ** 10 - 1)}'
+            fields['precinct_number'] = f'{int(zone) * 10 + self.rng.randint(0, 9):04d}A'
+        return Resident(**fields)
+
+    def household_sizes(self, residents, households):
+        """Split ``residents`` across ``households``, at least one each, averaging residents / households"""
+        households = max(1, min(households, residents))
+        extra = Counter(self.rng.choices(range(households), k=residents - households))
+        return [1 + extra[i] for i in range(households)]
+
+    def vitals(self, age):
+        child = age < 18
+        return {
+            'temperature': self.decimal(36.8, 0.5 if self.rng.random() > 0.05 else 1.2, 35),
+            'blood_pressure_systolic': int(max(80, self.rng.gauss(100 if child else 112 + age * 0.4, 14))),
+            'blood_pressure_diastolic': int(max(50, self.rng.gauss(65 if child else 72 + age * 0.15, 9))),
+            'heart_rate': int(max(45, self.rng.gauss(95 if child else 76, 11))),
+            'weight': self.decimal(3 + age * 2.5 if child else 60, 8, 3, 2),
+            'height': self.decimal(50 + age * 6 if child else 160, 7, 45, 2),
+        }
+
+
+def bulk_insert(model, objects, batch_size=SEED_BATCH_SIZE):
+    """bulk_create an iterable in slices so at most one batch is held in memory"""
+    created = 0
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            created += len(model.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        created += len(model.objects.bulk_create(batch))
+    return created
+
+
+def seed_synthetic_data(residents=100000, households=25000, health_reports=1000000, seed=0, today=None):
+    """
+    Generate residents in households, the BHW reports that go with them and
+    ``health_reports`` health reports, all with bulk_create, then rebuild the
+    derived data that model signals would otherwise maintain. Returns the
+    number of rows created per model.
+    """
+    generator = Generator(seed, today)
+    rng, today = generator.rng, generator.today
+    created = Counter()
+    offset = Household.objects.count()
+
+    with transaction.atomic():
+        # Residents, built household by household so members share a name and address
+        families = []
+        people = []
+        for index, size in enumerate(generator.household_sizes(residents, households)):
+            last_name = rng.choice(LAST_NAMES)
+            zone = generator.pick(ZONE_WEIGHTS)
+            house_number, street = str(rng.randint(1, 400)), rng.choice(STREETS)
+            members = []
+            for position, age in enumerate(generator.household_ages(size)):
+                gender = ('M' if rng.random() < 0.7 else 'F') if position == 0 else ('F' if position == 1 else rng.choice('MF'))
+                members.append(generator.resident(age, gender, last_name, zone, house_number, street))
+            families.append((offset + index, len(people), len(members)))
+            people.extend(members)
+        for start in range(0, len(people), SEED_BATCH_SIZE):
+            Resident.objects.bulk_create(people[start:start + SEED_BATCH_SIZE])
+        created['residents'] = len(people)
+
+        # Households and their memberships
+        household_rows = Household.objects.bulk_create([
+            Household(
+                household_head=people[first], household_number=f'SYN-{number:07d}',
+                house_ownership=rng.choice(['owned', 'owned', 'rented', 'shared', 'caretaker']),
+            )
+            for number, first, size in families
+        ], batch_size=SEED_BATCH_SIZE)
+        Membership = Household.members.through
+        created['households'] = len(household_rows)
+        created['memberships'] = bulk_insert(Membership, (
+            Membership(household_id=household.pk, resident_id=people[first + i].pk)
+            for household, (_, first, size) in zip(household_rows, families)
+            for i in range(size)
+        ))
+
+        ages = [(today - person.date_of_birth).days // 365 for person in people]
+
+        created['senior_reports'] = bulk_insert(SeniorCitizenReport, (
+            SeniorCitizenReport(
+                resident=person,
+                pension_source=rng.choice(['sss', 'gsis', 'private', 'none', 'other']),
+                mobility_status=rng.choice(['independent', 'independent', 'independent', 'assisted', 'wheelchair', 'bedridden']),
+                last_checkup_date=today - timedelta(days=rng.randint(0, 500)) if rng.random() < 0.9 else None,
+            )
+            for person, age in zip(people, ages)
+            if age >= 60 and rng.random() < 0.85
+        ))
+        created['businesses'] = bulk_insert(SariSariStoreReport, (
+            SariSariStoreReport(
+                owner=people[first], business_name=f'{people[first].last_name} Store {number}',
+                business_address=f'{people[first].house_number} {people[first].street}',
+                business_type=rng.choice(['sari_sari', 'sari_sari', 'sari_sari', 'carenderia', 'both']),
+                number_of_employees=rng.randint(0, 3),
+                has_proper_sanitation=rng.random() < 0.8, has_fire_safety_measures=rng.random() < 0.6,
+                is_active=rng.random() < 0.9,
+            )
+            for number, first, size in families
+            if rng.random() < 0.06
+        ))
+        created['fourps'] = bulk_insert(FourPsBeneficiaryReport, (
+            FourPsBeneficiaryReport(
+                beneficiary=people[first], household_id=f'4PS-{number:07d}',
+                set_of_year=rng.randint(2008, today.year), number_of_children=size - 1,
+                monthly_grant_amount=Decimal(750 + 300 * min(size - 1, 3)),
+                education_compliance=rng.random() < 0.85, health_compliance=rng.random() < 0.8,
+                family_development_sessions=rng.random() < 0.75, is_active=rng.random() < 0.9,
+            )
+            for number, first, size in families
+            if size >= 3 and rng.random() < 0.2
+        ))
+
+        def pregnancies():
+            for person, age in zip(people, ages):
+                if person.gender != 'F' or not 16 <= age <= 44 or rng.random() >= 0.05:
+                    continue
+                lmp = today - timedelta(days=rng.randint(0, 420))
+                ongoing = (today - lmp).days < 280
+                yield PregnancyReport(
+                    pregnant_woman=person, pregnancy_number=rng.randint(1, 5),
+                    last_menstrual_period=lmp, expected_due_date=lmp + timedelta(days=280),
+                    high_risk_pregnancy=age < 18 or age > 35 or rng.random() < 0.1,
+                    number_of_prenatal_visits=rng.randint(0, 8),
+                    next_prenatal_visit=today + timedelta(days=rng.randint(-10, 30)) if ongoing else None,
+                    pregnancy_outcome='ongoing' if ongoing else rng.choice(['live_birth'] * 8 + ['miscarriage', 'stillbirth']),
+                    delivery_date=None if ongoing else lmp + timedelta(days=rng.randint(250, 290)),
+                )
+        created['pregnancies'] = bulk_insert(PregnancyReport, pregnancies())
+
+        def reports():
+            # Young children and seniors are seen far more often than adults
+            weights = [4 if age < 5 or age >= 60 else 1 for age in ages]
+            report_types = list(REPORT_TYPE_WEIGHTS)
+            type_weights = list(REPORT_TYPE_WEIGHTS.values())
+            for start in range(0, health_reports, SEED_BATCH_SIZE):
+                count = min(SEED_BATCH_SIZE, health_reports - start)
+                for index in rng.choices(range(len(people)), weights=weights, k=count):
+                    report_date = today - timedelta(days=int(rng.expovariate(1 / 300)) % 1500)
+                    follow_up = rng.random() < 0.1
+                    yield HealthReport(
+                        resident=people[index],
+                        report_type=rng.choices(report_types, weights=type_weights)[0],
+                        healthcare_provider=rng.choice(['BHW', 'RHU', 'Barangay Health Center']),
+                        report_date=report_date,
+                        follow_up_needed=follow_up,
+                        follow_up_date=report_date + timedelta(days=rng.randint(7, 30)) if follow_up else None,
+                        **generator.vitals(ages[index]),
+                    )
+        created['health_reports'] = bulk_insert(HealthReport, reports())
+
+    # bulk_create skipped the signals that maintain these
+    refresh_household_aggregates(Household.objects.filter(household_number__startswith='SYN-'))
+    rebuild_counters()
+    rebuild_search_index()
+    refresh_statistics()
+    bump_generation(*VERSIONED_MODELS)
+    return created
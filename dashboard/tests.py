@@ -1,3 +1,813 @@
-from django.test import TestCase
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.checks import run_checks
+from django.core.management import call_command
+from django.db import connection, connections, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from barangay_ims.db_router import READ_ALIAS, reading_from, reads_from_replica
+from barangay_ims.query_budget import QueryBudgetExceeded, query_budget, sql_shape
+from residents.models import Resident, Household
+from residents.pagination import estimated_count
+from bhw_reports.models import (
+    FourPsBeneficiaryReport, HealthReport, PregnancyReport,
+    SariSariStoreReport, SeniorCitizenReport
+)
+from .benchmark import benchmark_urls, run_benchmark
+from .bulk import run_bulk_job, start_bulk_job
+from .cache import bump_generation, cached_value, get_generations
+from . import concurrency
+from .concurrency import evaluate_concurrently
+from .counters import counter_statistics, rebuild_counters
+from .models import BulkJob, DashboardCounter
+from .stats import dashboard_statistics
+from .synthetic import seed_synthetic_data
+from .views import businesses_report
+
+
+def make_resident(**kwargs):
+    fields = {
+        'first_name': 'Juan',
+        'last_name': 'Dela Cruz',
+        'date_of_birth': date(1990, 1, 1),
+        'place_of_birth': 'Manila',
+        'gender': 'M',
+        'civil_status': 'single',
+        'house_number': '1',
+        'street': 'Rizal St.',
+        'zone': '1',
+        'city_municipality': 'Quezon City',
+        'province': 'Metro Manila',
+        'zip_code': '1100',
+        'educational_attainment': 'college',
+        'employment_status': 'employed',
+        'emergency_contact_name': 'Maria Dela Cruz',
+        'emergency_contact_number': '09170000000',
+        'emergency_contact_relationship': 'Mother',
+    }
+    fields.update(kwargs)
+    return Resident.objects.create(**fields)
+
+
+def seed(count, start=0):
+    today = timezone.now().date()
+    for i in range(start, start + count):
+        resident = make_resident(
+            first_name=f'Resident {i}',
+            gender='MF'[i % 2],
+            zone=str(i % 4 + 1),
+            civil_status=['single', 'married', 'widowed'][i % 3],
+            date_of_birth=today - timedelta(days=365 * (i * 7 % 80) + 1),
+            is_senior_citizen=i % 5 == 0,
+            is_pwd=i % 7 == 0,
+        )
+        if i % 5 == 0:
+            SeniorCitizenReport.objects.create(resident=resident)
+        if i % 6 == 1:
+            PregnancyReport.objects.create(
+                pregnant_woman=resident,
+                pregnancy_number=1,
+                last_menstrual_period=today - timedelta(weeks=10),
+                expected_due_date=today + timedelta(weeks=30),
+            )
+        HealthReport.objects.create(
+            resident=resident,
+            report_type='routine_checkup',
+            healthcare_provider='BHW',
+            report_date=today - timedelta(days=i % 14),
+        )
+        if i % 3 == 0:
+            Household.objects.create(household_head=resident, household_number=f'HH-{i}')
+
+
+class DashboardViewQueryCountTests(TestCase):
+    # One read of the zone/category counters, one sum over the date counters
+    # and the conditional GET probe
+    DASHBOARD_QUERIES = 3
+
+    def setUp(self):
+        cache.clear()
+
+    def test_empty_database(self):
+        with self.assertNumQueries(self.DASHBOARD_QUERIES):
+            response = self.client.get(reverse('dashboard:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_residents'], 0)
+        self.assertEqual(response.context['zone_distribution'], [])
+
+    def test_query_count_does_not_grow_with_data(self):
+        seed(40)
+        with self.assertNumQueries(self.DASHBOARD_QUERIES):
+            response = self.client.get(reverse('dashboard:dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+        seed(40, start=40)
+        with self.assertNumQueries(self.DASHBOARD_QUERIES):
+            self.client.get(reverse('dashboard:dashboard'))
+
+        # Served from the cache until something is written again
+        with self.assertNumQueries(0):
+            self.client.get(reverse('dashboard:dashboard'))
+
+    def test_counters_match_individual_queries(self):
+        seed(30)
+        self.client.get(reverse('dashboard:dashboard'))
+        resident = Resident.objects.get(first_name='Resident 3')
+        resident.is_active = False
+        resident.save()
+        context = self.client.get(reverse('dashboard:dashboard')).context
+
+        active = Resident.objects.filter(is_active=True)
+        self.assertEqual(context['total_residents'], active.count())
+        self.assertEqual(context['male_residents'], active.filter(gender='M').count())
+        self.assertEqual(context['pwd_count'], active.filter(is_pwd=True).count())
+        self.assertEqual(
+            context['children'] + context['adults'] + context['seniors'],
+            active.count()
+        )
+        self.assertEqual(context['total_households'], Household.objects.count())
+        self.assertEqual(context['senior_reports'], SeniorCitizenReport.objects.count())
+        self.assertEqual(
+            sum(zone['count'] for zone in context['zone_distribution']),
+            active.count()
+        )
+        self.assertEqual(
+            {row['civil_status']: row['count'] for row in context['civil_status_distribution']},
+            {'single': 9, 'married': 10, 'widowed': 10}
+        )
+
+
+class DashboardCounterTests(TestCase):
+    def assertCountersInSync(self):
+        self.assertEqual(counter_statistics(), dashboard_statistics())
+
+    def test_counters_follow_saves_and_deletes(self):
+        seed(24)
+        self.assertCountersInSync()
+
+        resident = Resident.objects.get(first_name='Resident 5')
+        resident.zone = '9'
+        resident.civil_status = 'married'
+        resident.is_pwd = True
+        resident.save()
+        self.assertCountersInSync()
+
+        resident.is_active = False
+        resident.save()
+        self.assertCountersInSync()
+
+        resident.is_active = True
+        resident.save()
+        self.assertCountersInSync()
+
+        pregnancy = PregnancyReport.objects.first()
+        pregnancy.pregnancy_outcome = 'live_birth'
+        pregnancy.save()
+        self.assertCountersInSync()
+
+        # Cascades to the resident's household and BHW reports
+        Resident.objects.get(first_name='Resident 0').delete()
+        self.assertCountersInSync()
+
+    def test_rebuild_command_recovers_from_bulk_updates(self):
+        seed(12)
+        Resident.objects.filter(zone='1').update(zone='2')
+        DashboardCounter.objects.filter(category='bhw').delete()
+        self.assertNotEqual(counter_statistics(), dashboard_statistics())
+
+        call_command('rebuild_dashboard_counters', stdout=StringIO())
+        self.assertCountersInSync()
+
+
+class VersionedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_value_is_reused_until_a_model_is_written(self):
+        labels = ['residents.Resident']
+        self.assertEqual(cached_value('test', labels, self.compute), 1)
+        self.assertEqual(cached_value('test', labels, self.compute), 1)
+
+        bump_generation('bhw_reports.HealthReport')
+        self.assertEqual(cached_value('test', labels, self.compute), 1)
+
+        make_resident()
+        self.assertEqual(cached_value('test', labels, self.compute), 2)
+
+    def test_stale_value_is_served_while_another_request_recomputes(self):
+        labels = ['residents.Resident']
+        cached_value('test', labels, self.compute)
+        bump_generation('residents.Resident')
+
+        # Simulate a concurrent request holding the recompute lock
+        cache.add('versioned:test:lock', True)
+        self.assertEqual(cached_value('test', labels, self.compute), 1)
+
+        cache.delete('versioned:test:lock')
+        self.assertEqual(cached_value('test', labels, self.compute), 2)
+
+    def test_cold_key_waits_for_the_request_computing_it(self):
+        labels = ['residents.Resident']
+        generations = get_generations(labels)
+        # A concurrent request holds the lock and stores its value a moment later
+        cache.add('versioned:test:lock', True)
+
+        def finish():
+            cache.set('versioned:test', (generations, 'computed'))
+            cache.delete('versioned:test:lock')
+
+        timer = threading.Timer(0.2, finish)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.assertEqual(cached_value('test', labels, self.compute), 'computed')
+        self.assertEqual(self.calls, 0)
+
+    def test_values_expire_with_the_cache_timeout(self):
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            cached_value('test', ['residents.Resident'], self.compute)
+        self.assertEqual(cache_set.call_args.args[2], DEFAULT_TIMEOUT)
+
+    def test_report_pages_refresh_after_writes(self):
+        for name in ['senior_citizens_report', 'businesses_report', 'fourps_report', 'pregnancy_report']:
+            self.assertEqual(self.client.get(reverse(f'dashboard:{name}')).status_code, 200)
+
+        response = self.client.get(reverse('dashboard:senior_citizens_report'))
+        self.assertEqual(response.context['total_seniors'], 0)
+
+        make_resident(is_senior_citizen=True)
+        response = self.client.get(reverse('dashboard:senior_citizens_report'))
+        self.assertEqual(response.context['total_seniors'], 1)
+
+
+class SeniorCoverageGapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.flagged = make_resident(first_name='Flagged', is_senior_citizen=True, zone='1')
+        cls.unflagged = make_resident(first_name='Unflagged', date_of_birth=date(1950, 1, 1), zone='2')
+        cls.covered = make_resident(first_name='Covered', is_senior_citizen=True, zone='1')
+        cls.lapsed = make_resident(first_name='Lapsed', is_senior_citizen=True, zone='2')
+        cls.young = make_resident(first_name='Young')
+        SeniorCitizenReport.objects.create(resident=cls.covered)
+        SeniorCitizenReport.objects.create(resident=cls.lapsed, is_active=False)
+        # A report for someone no longer counted as a senior used to hide a missing one
+        SeniorCitizenReport.objects.create(resident=cls.young)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_lists_exactly_the_seniors_without_an_active_report(self):
+        url = reverse('dashboard:senior_coverage_gap')
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual([senior.first_name for senior in response.context['seniors']], ['Flagged', 'Lapsed', 'Unflagged'])
+
+        response = self.client.get(url, {'zone': '2'})
+        self.assertEqual([senior.first_name for senior in response.context['seniors']], ['Lapsed', 'Unflagged'])
+
+    def test_report_counts_agree_with_the_list(self):
+        context = self.client.get(reverse('dashboard:senior_citizens_report')).context
+        self.assertEqual(context['total_seniors'], 4)
+        self.assertEqual(context['seniors_with_reports'], 1)
+        self.assertEqual(context['seniors_needing_assessment'], 3)
+
+
+FILE_CACHE_DIR = tempfile.mkdtemp(prefix='barangay-ims-cache-')
+
+
+FILE_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': FILE_CACHE_DIR,
+    }
+}
+
+
+@override_settings(CACHES=FILE_CACHES)
+class FileBasedVersionedCacheTests(VersionedCacheTests):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(FILE_CACHE_DIR, ignore_errors=True)
+
+
+class SharedCacheCheckTests(TestCase):
+    def test_deploy_check_warns_about_a_per_process_cache(self):
+        ids = [message.id for message in run_checks(include_deployment_checks=True)]
+        self.assertIn('dashboard.W001', ids)
+
+        with override_settings(CACHES=FILE_CACHES):
+            ids = [message.id for message in run_checks(include_deployment_checks=True)]
+        self.assertNotIn('dashboard.W001', ids)
+
+
+def bulk_seed(count):
+    """Seed ``count`` residents (and their reports) without going through signals"""
+    today = timezone.now().date()
+    template = make_resident()
+    fields = {
+        field.attname: getattr(template, field.attname)
+        for field in Resident._meta.concrete_fields if not field.primary_key
+    }
+    template.delete()
+
+    residents = Resident.objects.bulk_create([
+        Resident(**{
+            **fields,
+            'first_name': f'Resident {i}',
+            'last_name': f'Family {i % 300}',
+            'gender': 'MF'[i % 2],
+            'zone': str(i % 7 + 1),
+            'date_of_birth': today - timedelta(days=i * 11 % 30000),
+            'is_senior_citizen': i % 9 == 0,
+            'is_active': i % 20 != 0,
+            'voters_id': f'V-{i}' if i % 3 else '',
+            'precinct_number': f'{i % 40:04d}A' if i % 3 else '',
+        })
+        for i in range(count)
+    ], batch_size=500)
+
+    SeniorCitizenReport.objects.bulk_create([
+        SeniorCitizenReport(resident=resident, is_active=i % 4 != 0)
+        for i, resident in enumerate(residents[::9])
+    ])
+    SariSariStoreReport.objects.bulk_create([
+        SariSariStoreReport(
+            owner=resident, business_name=f'Store {i}', business_address='Rizal St.',
+            business_type=['sari_sari', 'carenderia', 'both'][i % 3], is_active=i % 5 != 0,
+        )
+        for i, resident in enumerate(residents[::11])
+    ])
+    FourPsBeneficiaryReport.objects.bulk_create([
+        FourPsBeneficiaryReport(
+            beneficiary=resident, household_id=f'4PS-{i}', set_of_year=2020,
+            monthly_grant_amount=1000, is_active=i % 6 != 0,
+        )
+        for i, resident in enumerate(residents[::13])
+    ])
+    PregnancyReport.objects.bulk_create([
+        PregnancyReport(
+            pregnant_woman=resident, pregnancy_number=1,
+            last_menstrual_period=today - timedelta(days=i % 280),
+            expected_due_date=today + timedelta(days=280 - i % 280),
+            pregnancy_outcome='ongoing' if i % 3 else 'live_birth',
+        )
+        for i, resident in enumerate(residents[1::14])
+    ])
+    HealthReport.objects.bulk_create([
+        HealthReport(
+            resident=resident, report_type='routine_checkup', healthcare_provider='BHW',
+            report_date=today - timedelta(days=i % 400),
+        )
+        for i, resident in enumerate(residents * 2)
+    ], batch_size=500)
+    rebuild_counters()
+
+
+class QueryPlanTests(TestCase):
+    """
+    Run EXPLAIN QUERY PLAN on every query a page issues and fail when one of
+    the large tables is read with a full table scan.
+    """
+    LARGE_TABLES = {
+        Resident._meta.db_table,
+        Household._meta.db_table,
+        SeniorCitizenReport._meta.db_table,
+        SariSariStoreReport._meta.db_table,
+        FourPsBeneficiaryReport._meta.db_table,
+        PregnancyReport._meta.db_table,
+        HealthReport._meta.db_table,
+        DashboardCounter._meta.db_table,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        bulk_seed(2000)
+
+    def setUp(self):
+        cache.clear()
+
+    def full_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+        # "SCAN <table>" without an index is a full table scan; "SEARCH" and
+        # "SCAN <table> USING [COVERING] INDEX" are not reported
+        return [
+            detail for detail in plan
+            if detail.startswith('SCAN ')
+            and detail.split()[1] in self.LARGE_TABLES
+            and 'INDEX' not in detail
+        ]
+
+    def assertNoFullScans(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+
+        for query in queries:
+            if not query['sql'].lstrip().upper().startswith('SELECT'):
+                continue
+            with self.subTest(url=url, params=params, sql=query['sql']):
+                self.assertEqual(self.full_scans(query['sql']), [])
+
+    def test_dashboard_pages(self):
+        for name in ['dashboard', 'senior_citizens_report', 'businesses_report', 'fourps_report', 'pregnancy_report']:
+            self.assertNoFullScans(reverse(f'dashboard:{name}'))
+
+    def test_senior_coverage_gap(self):
+        url = reverse('dashboard:senior_coverage_gap')
+        self.assertNoFullScans(url)
+        self.assertNoFullScans(url, {'zone': '3'})
+
+    def test_residents_list(self):
+        url = reverse('dashboard:residents_list')
+        self.assertNoFullScans(url)
+        self.assertNoFullScans(url, {'zone': '3'})
+        self.assertNoFullScans(url, {'zone': '3', 'gender': 'F'})
+        self.assertNoFullScans(url, {'gender': 'F'})
+        self.assertNoFullScans(url, {'search': 'resident 12'})
+
+        after = self.client.get(url, {'zone': '3'}).context['page'].next_cursor
+        self.assertNoFullScans(url, {'zone': '3', 'after': after})
+
+    def test_voters_reports(self):
+        for name in ['voters_report', 'voters_by_precinct', 'voters_precinct_dashboard']:
+            self.assertNoFullScans(reverse(f'residents:{name}'))
+        self.assertNoFullScans(reverse('residents:voters_precinct', args=['0001A']))
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        seed(6)
+
+    def test_unchanged_pages_are_not_rebuilt(self):
+        for name in ['dashboard:dashboard', 'dashboard:senior_citizens_report', 'dashboard:residents_list', 'residents:voters_report']:
+            url = reverse(name)
+            response = self.client.get(url)
+            with self.subTest(url=url), self.assertNumQueries(0):
+                not_modified = self.client.get(url, headers={'if-none-match': response['ETag']})
+            self.assertEqual(not_modified.status_code, 304)
+
+            not_modified = self.client.get(url, headers={'if-modified-since': response['Last-Modified']})
+            self.assertEqual(not_modified.status_code, 304)
+
+    def test_writes_deletes_and_query_strings_change_the_etag(self):
+        url = reverse('dashboard:residents_list')
+        etag = self.client.get(url)['ETag']
+        self.assertNotEqual(self.client.get(url, {'zone': '1'})['ETag'], etag)
+
+        resident = Resident.objects.get(first_name='Resident 2')
+        resident.zone = '9'
+        resident.save()
+        response = self.client.get(url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        resident.delete()
+        response = self.client.get(url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_api_checks_permissions_before_answering_304(self):
+        user = User.objects.create_user('partner', password='password')
+        self.client.force_login(user)
+        response = self.client.get('/api/health-reports/')
+        self.assertEqual(self.client.get('/api/health-reports/', headers={'if-none-match': response['ETag']}).status_code, 304)
+
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/health-reports/', headers={'if-none-match': response['ETag']}).status_code, 403)
+
+
+class SyntheticDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.created = seed_synthetic_data(residents=400, households=100, health_reports=2000, seed=7)
+
+    def test_seeded_counts_and_derived_data(self):
+        self.assertEqual(Resident.objects.count(), 400)
+        self.assertEqual(Household.objects.count(), 100)
+        self.assertEqual(HealthReport.objects.count(), 2000)
+        self.assertEqual(self.created['memberships'], 400)
+        # Signals were bypassed, so the aggregates and counters were rebuilt afterwards
+        self.assertEqual(
+            sum(Household.objects.values_list('member_count', flat=True)),
+            Resident.objects.filter(is_active=True).count()
+        )
+        self.assertEqual(counter_statistics(), dashboard_statistics())
+        self.assertEqual(estimated_count(Resident), 400)
+
+    def test_benchmark_covers_every_page(self):
+        names = [name for name, url in benchmark_urls()]
+        self.assertIn('dashboard:residents_list', names)
+        self.assertIn('residents:voters_precinct', names)
+        self.assertIn('admin:bhw_reports_healthreport_changelist', names)
+
+        results = run_benchmark(repeat=2)
+        self.assertEqual(set(results), set(names))
+        for name, page in results.items():
+            with self.subTest(name=name):
+                self.assertEqual(page['status'], 200)
+                self.assertLessEqual(page['p50_ms'], page['p95_ms'])
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.residents = [make_resident(first_name=f'Budget {i}') for i in range(5)]
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(DEBUG=True)
+    def test_summary_goes_out_as_header_and_log_line(self):
+        with self.assertLogs('barangay_ims.query_budget', 'INFO') as logs:
+            response = self.client.get(reverse('dashboard:residents_list'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="4 queries", dup;desc="0 repeats"$')
+        self.assertIn('view=dashboard:residents_list method=GET status=200 queries=4', logs.output[0])
+
+    def test_header_only_under_debug(self):
+        response = self.client.get(reverse('dashboard:residents_list'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(QUERY_BUDGET={'VIEWS': {'dashboard:residents_list': {'queries': 2}}})
+    def test_off_unless_enabled(self):
+        with self.assertNoLogs('barangay_ims.query_budget'):
+            response = self.client.get(reverse('dashboard:residents_list'))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(QUERY_BUDGET={'ENABLED': True, 'VIEWS': {'dashboard:residents_list': {'queries': 2}}, 'RAISE': True})
+    def test_over_budget_fails_in_tests(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'queries 4 > 2'):
+            self.client.get(reverse('dashboard:residents_list'))
+
+    @override_settings(QUERY_BUDGET={'ENABLED': True, 'VIEWS': {'dashboard:residents_list': {'queries': 2}}, 'RAISE': False})
+    def test_over_budget_warns_in_production(self):
+        with self.assertLogs('barangay_ims.query_budget', 'WARNING'):
+            response = self.client.get(reverse('dashboard:residents_list'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_decorator_catches_n_plus_one(self):
+        @query_budget(duplicates=3)
+        def view(request):
+            names = [Resident.objects.get(pk=resident.pk).first_name for resident in self.residents]
+            return HttpResponse(', '.join(names))
+
+        request = RequestFactory().get('/')
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'duplicates 5 > 3; repeated SQL: SELECT'):
+            view(request)
+
+    async def test_decorator_wraps_async_views(self):
+        @query_budget(queries=2)
+        async def view(request):
+            counts = await sync_to_async(lambda: [Resident.objects.count() for _ in range(3)])()
+            return HttpResponse(str(counts))
+
+        self.assertTrue(iscoroutinefunction(view))
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'queries 3 > 2'):
+            await view(RequestFactory().get('/'))
+
+        response = await query_budget(queries=10)(businesses_report)(RequestFactory().get('/'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_sql_shape_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND zone = '3' LIMIT 21"),
+            'SELECT * FROM t WHERE id IN (...) AND zone = ? LIMIT ?'
+        )
+
+
+class BulkJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        seed(10)
+        cls.household = Household.objects.create(household_head=Resident.objects.first(), household_number='HH-BULK')
+        cls.household.members.set(Resident.objects.all()[:4])
+
+    def start(self, operation, queryset):
+        # The worker is handed the job on commit, which never comes inside a test
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = start_bulk_job(operation, queryset, self.admin)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(job.object_ids, list(queryset.order_by('pk').values_list('pk', flat=True)))
+        return job
+
+    def test_deactivate_runs_in_chunks_and_rebuilds_derived_data(self):
+        cache.clear()
+        today = timezone.now().date()
+        self.assertEqual(counter_statistics(today)['total_residents'], 10)
+        job = self.start('deactivate', Resident.objects.filter(zone__in=['1', '2']))
+
+        with CaptureQueriesContext(connection) as queries:
+            run_bulk_job(job.pk, chunk_size=2)
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "residents_resident"')]
+        self.assertEqual(len(updates), 3)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.affected, job.progress), ('done', 6, 6, 100))
+        self.assertEqual(Resident.objects.filter(is_active=True).count(), 4)
+        self.assertEqual(counter_statistics(today)['total_residents'], 4)
+        self.household.refresh_from_db()
+        self.assertEqual(self.household.member_count, Resident.objects.filter(households=self.household, is_active=True).count())
+
+    def test_create_senior_reports_only_for_flagged_seniors_without_one(self):
+        seniors = Resident.objects.filter(is_senior_citizen=True)
+        SeniorCitizenReport.objects.filter(resident=seniors.last()).delete()
+        unflagged = make_resident(first_name='Lolo', date_of_birth=date(1940, 1, 1))
+        job = self.start('create_senior_reports', Resident.objects.all())
+        run_bulk_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.total, job.affected), ('done', 11, 1))
+        self.assertFalse(seniors.filter(senior_citizen_report__isnull=True).exists())
+        self.assertFalse(SeniorCitizenReport.objects.filter(resident=unflagged).exists())
+
+    def test_failure_is_recorded_on_the_job(self):
+        job = BulkJob.objects.create(operation='unknown', model_label='residents.Resident', total=1, object_ids=[1])
+        with self.assertLogs('dashboard.bulk', 'ERROR'):
+            run_bulk_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+
+    def test_stalled_job_resumes_after_its_last_chunk(self):
+        job = self.start('deactivate', Resident.objects.all())
+        # The process died after the first chunk of four
+        BulkJob.objects.filter(pk=job.pk).update(
+            status='running', processed=4, affected=4, updated_at=timezone.now() - timedelta(hours=1)
+        )
+        fresh = self.start('deactivate', Resident.objects.all())
+
+        out = StringIO()
+        call_command('resume_bulk_jobs', stdout=out)
+        self.assertIn('Resumed 1 bulk jobs', out.getvalue())
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.affected), ('done', 10, 10))
+        # Work before the cursor is not repeated
+        self.assertEqual(list(Resident.objects.filter(is_active=True).values_list('pk', flat=True)), job.object_ids[:4])
+        # A job still making progress is left to its own process
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, 'queued')
+
+    def test_admin_action_queues_a_job(self):
+        self.client.force_login(self.admin)
+        ids = list(Resident.objects.values_list('pk', flat=True)[:3])
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('admin:residents_resident_changelist'), {
+                'action': 'bulk_deactivate', '_selected_action': ids,
+            }, follow=True)
+        self.assertContains(response, 'for 3 rows in the background')
+        self.assertEqual(len(callbacks), 1)
+        job = BulkJob.objects.get()
+        self.assertEqual((job.status, job.total, job.created_by), ('queued', 3, self.admin))
+        self.assertEqual(Resident.objects.filter(is_active=True).count(), 10)
+
+
+class DatabaseRoutingTests(TestCase):
+    def replica(self):
+        # Under test the read alias mirrors the primary, which the router reads as "no replica"
+        return mock.patch.dict(connections[READ_ALIAS].settings_dict, {'NAME': 'replica.sqlite3'})
+
+    def test_report_views_read_from_the_replica(self):
+        @reads_from_replica
+        def view(request):
+            return HttpResponse(Resident.objects.all().db)
+
+        self.assertEqual(view(RequestFactory().get('/')).content, b'default')
+        with self.replica():
+            self.assertEqual(view(RequestFactory().get('/')).content, b'reports')
+            self.assertEqual(Resident.objects.all().db, 'default')
+
+    def test_writes_always_go_to_the_primary(self):
+        with self.replica(), reading_from():
+            self.assertEqual(router.db_for_write(Resident), 'default')
+            self.assertEqual(make_resident()._state.db, 'default')
+        self.assertFalse(router.allow_migrate(READ_ALIAS, 'residents'))
+
+    def test_sqlite_connections_are_tuned(self):
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for pragma in ['busy_timeout', 'synchronous', 'cache_size']:
+                cursor.execute(f'PRAGMA {pragma}')
+                pragmas[pragma] = cursor.fetchone()[0]
+        self.assertEqual(pragmas, {'busy_timeout': 20000, 'synchronous': 1, 'cache_size': -32000})
+
+
+class ReplicaRefreshTests(TransactionTestCase):
+    # The online backup waits for the primary's open transaction, so commit for real
+
+    def test_replica_refresh_copies_the_primary_and_invalidates_reports(self):
+        make_resident()
+        cached_value('replica_test', ['residents.Resident'], lambda: 'stale')
+        path = os.path.join(tempfile.mkdtemp(), 'replica.sqlite3')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+
+        with mock.patch.dict(connections[READ_ALIAS].settings_dict, {'NAME': path}):
+            call_command('refresh_reports_replica', stdout=StringIO())
+        replica = sqlite3.connect(path)
+        self.addCleanup(replica.close)
+        self.assertEqual(replica.execute('SELECT COUNT(*) FROM residents_resident').fetchone()[0], 1)
+        self.assertEqual(cached_value('replica_test', ['residents.Resident'], lambda: 'fresh'), 'fresh')
+
+
+class ConcurrentReportTests(TransactionTestCase):
+    # The report query pool only sees committed rows, hence TransactionTestCase
+
+    def setUp(self):
+        cache.clear()
+
+    def test_queries_run_side_by_side_on_the_pool(self):
+        # Neither query can finish unless the other one is running too
+        barrier = threading.Barrier(2, timeout=5)
+
+        def query():
+            barrier.wait()
+            return threading.current_thread().name
+
+        results = evaluate_concurrently({'first': query, 'second': query})
+        self.assertEqual(list(results), ['first', 'second'])
+        self.assertEqual(results['first'], threading.current_thread().name)
+        self.assertTrue(results['second'].startswith('report-queries'))
+
+    def test_busy_pool_runs_queries_in_the_caller(self):
+        # Waiting behind other requests' queries would be slower than running them here
+        _, free_workers = concurrency._pool()
+        for _ in range(settings.REPORT_QUERY_WORKERS):
+            free_workers.acquire()
+        try:
+            results = evaluate_concurrently({
+                'first': lambda: threading.current_thread().name,
+                'second': lambda: threading.current_thread().name,
+            })
+        finally:
+            for _ in range(settings.REPORT_QUERY_WORKERS):
+                free_workers.release()
+        self.assertEqual(set(results.values()), {threading.current_thread().name})
+
+    def test_pool_threads_run_nested_queries_inline(self):
+        def nested():
+            return evaluate_concurrently({
+                'first': lambda: threading.current_thread().name,
+                'second': lambda: threading.current_thread().name,
+            })
+
+        results = evaluate_concurrently({'caller': lambda: None, 'nested': nested})
+        thread_names = set(results['nested'].values())
+        self.assertEqual(len(thread_names), 1)
+        self.assertTrue(thread_names.pop().startswith('report-queries'))
+
+    @override_settings(REPORT_QUERY_WORKERS=0)
+    def test_no_workers_runs_inline(self):
+        results = evaluate_concurrently({'thread': lambda: threading.current_thread().name})
+        self.assertEqual(results, {'thread': threading.current_thread().name})
+
+    def test_queries_inside_a_transaction_run_inline(self):
+        with transaction.atomic():
+            make_resident()
+            results = evaluate_concurrently({
+                'thread': lambda: threading.current_thread().name,
+                'residents': Resident.objects.count,
+            })
+        self.assertEqual(results, {'thread': threading.current_thread().name, 'residents': 1})
+
+    async def test_async_report_views(self):
+        await sync_to_async(seed)(12)
+        for name in ['dashboard', 'senior_citizens_report', 'businesses_report', 'fourps_report', 'pregnancy_report']:
+            with self.subTest(name=name):
+                response = await self.async_client.get(reverse(f'dashboard:{name}'))
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.has_header('ETag'))
+
+        response = await self.async_client.get(reverse('dashboard:pregnancy_report'))
+        self.assertEqual(response.context['total_pregnancies'], 2)
+        self.assertEqual(len(response.context['active_pregnancies']), 2)
+
+    @override_settings(DEBUG=True)
+    async def test_pool_queries_count_towards_the_query_budget(self):
+        await sync_to_async(seed)(12)
+        response = await self.async_client.get(reverse('dashboard:senior_citizens_report'))
+        # The conditional GET probe, then four queries on the pool
+        self.assertIn('desc="5 queries"', response['Server-Timing'])
 
-# Create your tests here.
@@ -1,244 +1,248 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
-from django.db.models import Count, Q
+from django.db.models import Count, Exists, OuterRef, Q
 from django.utils import timezone
-from datetime import datetime, timedelta
-from residents.models import Resident, Household
+from barangay_ims.db_router import reads_from_replica
+from residents.models import AGE_BANDS, Resident
+from residents.pagination import paginate
+from residents.search import search_residents
 from bhw_reports.models import (
-    SeniorCitizenReport, SariSariStoreReport, 
-    FourPsBeneficiaryReport, PregnancyReport, HealthReport
+    SeniorCitizenReport, SariSariStoreReport,
+    FourPsBeneficiaryReport, PregnancyReport
 )
+from .cache import VERSIONED_MODELS, cached_value
+from .concurrency import evaluate_concurrently
+from .conditional import conditional_on
+from .counters import counter_statistics
 
 # Create your views here.
 
-def dashboard_view(request):
+RESIDENT_ORDERING = ['last_name', 'first_name', 'id']
+
+# Models each report is built from
+SENIOR_REPORT_MODELS = ['residents.Resident', 'bhw_reports.SeniorCitizenReport']
+BUSINESS_REPORT_MODELS = ['residents.Resident', 'bhw_reports.SariSariStoreReport']
+FOURPS_REPORT_MODELS = ['residents.Resident', 'bhw_reports.FourPsBeneficiaryReport']
+PREGNANCY_REPORT_MODELS = ['residents.Resident', 'bhw_reports.PregnancyReport']
+
+# The report views are async: the ORM, cache and templates run off the event
+# loop, and the senior citizens counts on the report query pool
+# (dashboard.concurrency)
+
+@reads_from_replica
+@conditional_on(*VERSIONED_MODELS)
+async def dashboard_view(request):
     """Main dashboard with summary statistics"""
-    
-    # Basic resident statistics
-    total_residents = Resident.objects.filter(is_active=True).count()
-    total_households = Household.objects.count()
-    
-    # Demographics
-    male_residents = Resident.objects.filter(gender='M', is_active=True).count()
-    female_residents = Resident.objects.filter(gender='F', is_active=True).count()
-    
-    # Age groups
     today = timezone.now().date()
-    children = Resident.objects.filter(
-        date_of_birth__gt=today - timedelta(days=18*365), 
-        is_active=True
-    ).count()
-    
-    adults = Resident.objects.filter(
-        date_of_birth__lte=today - timedelta(days=18*365),
-        date_of_birth__gt=today - timedelta(days=60*365),
-        is_active=True
-    ).count()
-    
-    seniors = Resident.objects.filter(
-        date_of_birth__lte=today - timedelta(days=60*365),
-        is_active=True
-    ).count()
     
-    # Special categories
-    pwd_count = Resident.objects.filter(is_pwd=True, is_active=True).count()
-    senior_citizens = Resident.objects.filter(is_senior_citizen=True, is_active=True).count()
-    fourps_beneficiaries = Resident.objects.filter(is_4ps_beneficiary=True, is_active=True).count()
-    solo_parents = Resident.objects.filter(is_solo_parent=True, is_active=True).count()
+    # Totals are read from the rollup table kept current by dashboard.signals
+    context = await sync_to_async(cached_value)(
+        f'dashboard:{today}', VERSIONED_MODELS,
+        lambda: counter_statistics(today)
+    )
     
-    # BHW Reports statistics
-    senior_reports = SeniorCitizenReport.objects.filter(is_active=True).count()
-    active_businesses = SariSariStoreReport.objects.filter(is_active=True).count()
-    active_fourps = FourPsBeneficiaryReport.objects.filter(is_active=True).count()
-    active_pregnancies = PregnancyReport.objects.filter(
-        pregnancy_outcome='ongoing', 
-        is_active=True
-    ).count()
+    return await sync_to_async(render)(request, 'dashboard/dashboard.html', context)
+
+
+def seniors_without_report(today, zone=None):
+    """Active seniors with no active SeniorCitizenReport, as one anti-join"""
+    seniors = Resident.objects.filter(is_active=True).seniors(today).filter(
+        ~Exists(SeniorCitizenReport.objects.filter(resident=OuterRef('pk'), is_active=True))
+    )
+    if zone:
+        seniors = seniors.filter(zone=zone)
+    return seniors
+
+
+def senior_citizens_context(today):
+    seniors = Resident.objects.filter(is_active=True).seniors(today)
+    senior_citizens = seniors.select_related('senior_citizen_report')
+    senior_reports = SeniorCitizenReport.objects.filter(is_active=True).select_related('resident')
     
-    # Recent health reports
-    recent_health_reports = HealthReport.objects.filter(
-        report_date__gte=today - timedelta(days=7)
-    ).count()
+    # Seniors needing health assessment are counted exactly, not by difference.
+    # Building the listings holds the GIL, so they stay in this thread while
+    # the two slow counts run in SQLite next to them
+    results = evaluate_concurrently({
+        'listings': lambda: (list(senior_citizens), list(senior_reports)),
+        'total_seniors': seniors.count,
+        'seniors_needing_assessment': seniors_without_report(today).count,
+    })
+    
+    return {
+        'senior_citizens': results['listings'][0],
+        'senior_reports': results['listings'][1],
+        'total_seniors': results['total_seniors'],
+        'seniors_with_reports': results['total_seniors'] - results['seniors_needing_assessment'],
+        'seniors_needing_assessment': results['seniors_needing_assessment'],
+    }
+
+
+@reads_from_replica
+@conditional_on(*SENIOR_REPORT_MODELS)
+async def senior_citizens_report(request):
+    """Senior Citizens Report View"""
+    today = timezone.now().date()
+    context = await sync_to_async(cached_value)(
+        f'senior_citizens_report:{today}',
+        SENIOR_REPORT_MODELS,
+        lambda: senior_citizens_context(today)
+    )
     
-    # Zone distribution with percentage calculation
-    zone_distribution_raw = Resident.objects.filter(is_active=True).values('zone').annotate(
-        count=Count('id')
-    ).order_by('zone')
+    return await sync_to_async(render)(request, 'dashboard/senior_citizens_report.html', context)
+
+
+@reads_from_replica
+@conditional_on(*SENIOR_REPORT_MODELS)
+def senior_coverage_gap(request):
+    """Seniors who still have no health record, for the BHWs to visit"""
+    today = timezone.now().date()
     
-    # Add percentage to each zone
-    zone_distribution = []
-    for zone in zone_distribution_raw:
-        percentage = (zone['count'] * 100 / total_residents) if total_residents > 0 else 0
-        zone_distribution.append({
-            'zone': zone['zone'],
-            'count': zone['count'],
-            'percentage': round(percentage, 1)
-        })
+    # Filter by zone
+    zone_filter = request.GET.get('zone')
+    seniors = seniors_without_report(today, zone_filter).with_age(today)
     
-    # Civil status distribution
-    civil_status_distribution = Resident.objects.filter(is_active=True).values('civil_status').annotate(
-        count=Count('id')
-    ).order_by('civil_status')
+    # Get unique zones for filter dropdown
+    zones = Resident.objects.filter(is_active=True).values_list('zone', flat=True).distinct().order_by('zone')
     
-    # Employment status distribution
-    employment_distribution = Resident.objects.filter(is_active=True).values('employment_status').annotate(
-        count=Count('id')
-    ).order_by('employment_status')
+    page = paginate(request, seniors, RESIDENT_ORDERING)
     
     context = {
-        'total_residents': total_residents,
-        'total_households': total_households,
-        'male_residents': male_residents,
-        'female_residents': female_residents,
-        'children': children,
-        'adults': adults,
-        'seniors': seniors,
-        'pwd_count': pwd_count,
-        'senior_citizens': senior_citizens,
-        'fourps_beneficiaries': fourps_beneficiaries,
-        'solo_parents': solo_parents,
-        'senior_reports': senior_reports,
-        'active_businesses': active_businesses,
-        'active_fourps': active_fourps,
-        'active_pregnancies': active_pregnancies,
-        'recent_health_reports': recent_health_reports,
-        'zone_distribution': zone_distribution,
-        'civil_status_distribution': civil_status_distribution,
-        'employment_distribution': employment_distribution,
+        'seniors': page.object_list,
+        'page': page,
+        'zones': zones,
+        'zone_filter': zone_filter,
     }
     
-    return render(request, 'dashboard/dashboard.html', context)
+    return render(request, 'dashboard/senior_coverage_gap.html', context)
 
 
-def senior_citizens_report(request):
-    """Senior Citizens Report View"""
-    senior_citizens = Resident.objects.filter(is_senior_citizen=True, is_active=True)
-    senior_reports = SeniorCitizenReport.objects.filter(is_active=True).select_related('resident')
-    
-    # Calculate seniors needing health assessment
-    seniors_with_reports = senior_reports.count()
-    total_seniors = senior_citizens.count()
-    seniors_needing_assessment = total_seniors - seniors_with_reports
-    
-    context = {
-        'senior_citizens': senior_citizens,
-        'senior_reports': senior_reports,
-        'total_seniors': total_seniors,
-        'seniors_with_reports': seniors_with_reports,
-        'seniors_needing_assessment': max(0, seniors_needing_assessment),  # Ensure non-negative
+def businesses_context():
+    businesses = SariSariStoreReport.objects.filter(is_active=True)
+    
+    # Business type breakdown and compliance in one aggregate
+    counts = businesses.aggregate(
+        total_businesses=Count('id'),
+        sari_sari_count=Count('id', filter=Q(business_type='sari_sari')),
+        carenderia_count=Count('id', filter=Q(business_type='carenderia')),
+        both_count=Count('id', filter=Q(business_type='both')),
+        sanitation_compliant=Count('id', filter=Q(has_proper_sanitation=True)),
+        fire_safety_compliant=Count('id', filter=Q(has_fire_safety_measures=True)),
+    )
+    
+    return {
+        'businesses': list(businesses.select_related('owner')),
+        **counts,
     }
-    
-    return render(request, 'dashboard/senior_citizens_report.html', context)
 
 
-def businesses_report(request):
+@reads_from_replica
+@conditional_on(*BUSINESS_REPORT_MODELS)
+async def businesses_report(request):
     """Sari-Sari Stores and Carenderias Report View"""
-    businesses = SariSariStoreReport.objects.filter(is_active=True).select_related('owner')
-    
-    # Business type breakdown
-    sari_sari_count = businesses.filter(business_type='sari_sari').count()
-    carenderia_count = businesses.filter(business_type='carenderia').count()
-    both_count = businesses.filter(business_type='both').count()
+    context = await sync_to_async(cached_value)(
+        'businesses_report',
+        BUSINESS_REPORT_MODELS,
+        businesses_context
+    )
     
-    # Compliance statistics
-    sanitation_compliant = businesses.filter(has_proper_sanitation=True).count()
-    fire_safety_compliant = businesses.filter(has_fire_safety_measures=True).count()
-    
-    context = {
-        'businesses': businesses,
-        'total_businesses': businesses.count(),
-        'sari_sari_count': sari_sari_count,
-        'carenderia_count': carenderia_count,
-        'both_count': both_count,
-        'sanitation_compliant': sanitation_compliant,
-        'fire_safety_compliant': fire_safety_compliant,
+    return await sync_to_async(render)(request, 'dashboard/businesses_report.html', context)
+
+
+def fourps_context():
+    fourps_beneficiaries = FourPsBeneficiaryReport.objects.filter(is_active=True)
+    
+    # Compliance statistics in one aggregate
+    counts = fourps_beneficiaries.aggregate(
+        total_beneficiaries=Count('id'),
+        education_compliant=Count('id', filter=Q(education_compliance=True)),
+        health_compliant=Count('id', filter=Q(health_compliance=True)),
+        fds_compliant=Count('id', filter=Q(family_development_sessions=True)),
+    )
+    
+    return {
+        'fourps_beneficiaries': list(fourps_beneficiaries.select_related('beneficiary')),
+        **counts,
     }
-    
-    return render(request, 'dashboard/businesses_report.html', context)
 
 
-def fourps_report(request):
+@reads_from_replica
+@conditional_on(*FOURPS_REPORT_MODELS)
+async def fourps_report(request):
     """4Ps Beneficiaries Report View"""
-    fourps_beneficiaries = FourPsBeneficiaryReport.objects.filter(is_active=True).select_related('beneficiary')
-    
-    # Compliance statistics
-    education_compliant = fourps_beneficiaries.filter(education_compliance=True).count()
-    health_compliant = fourps_beneficiaries.filter(health_compliance=True).count()
-    fds_compliant = fourps_beneficiaries.filter(family_development_sessions=True).count()
-    
-    context = {
-        'fourps_beneficiaries': fourps_beneficiaries,
-        'total_beneficiaries': fourps_beneficiaries.count(),
-        'education_compliant': education_compliant,
-        'health_compliant': health_compliant,
-        'fds_compliant': fds_compliant,
-    }
+    context = await sync_to_async(cached_value)(
+        'fourps_report',
+        FOURPS_REPORT_MODELS,
+        fourps_context
+    )
     
-    return render(request, 'dashboard/fourps_report.html', context)
+    return await sync_to_async(render)(request, 'dashboard/fourps_report.html', context)
 
 
-def pregnancy_report(request):
-    """Pregnancy Report View"""
+def pregnancy_context(today, trimester=None):
     active_pregnancies = PregnancyReport.objects.filter(
         pregnancy_outcome='ongoing', 
         is_active=True
-    ).select_related('pregnant_woman')
-    
-    # Risk assessment
-    high_risk_pregnancies = active_pregnancies.filter(high_risk_pregnancy=True).count()
-    
-    # Trimester distribution
-    first_trimester = []
-    second_trimester = []
-    third_trimester = []
-    
-    # Calculate due dates and trimester info
+    )
+    
+    # Every count in one aggregate; trimesters are LMP ranges as of today
+    trimesters = active_pregnancies.trimester_conditions(today)
+    
+    # The listing is evaluated once, earliest due date first
+    pregnancies = active_pregnancies.with_progress(today).select_related('pregnant_woman')
+    if trimester:
+        pregnancies = pregnancies.in_trimester(trimester, today)
+    
+    counts = active_pregnancies.aggregate(
+        total_pregnancies=Count('id'),
+        high_risk_pregnancies=Count('id', filter=Q(high_risk_pregnancy=True)),
+        first_trimester_count=Count('id', filter=trimesters[1]),
+        second_trimester_count=Count('id', filter=trimesters[2]),
+        third_trimester_count=Count('id', filter=trimesters[3]),
+    )
+    pregnancies = list(pregnancies.order_by('expected_due_date', 'id'))
+    # Counted from the same (possibly trimester-filtered) listing it summarizes
+    upcoming_deliveries = [pregnancy for pregnancy in pregnancies if pregnancy.due_soon]
+    
+    return {
+        **counts,
+        'upcoming_count': len(upcoming_deliveries),
+        'active_pregnancies': pregnancies,
+        'upcoming_deliveries': upcoming_deliveries,
+        'trimester_filter': trimester,
+    }
+
+
+@reads_from_replica
+@conditional_on(*PREGNANCY_REPORT_MODELS)
+async def pregnancy_report(request):
+    """Pregnancy Report View"""
     today = timezone.now().date()
-    next_month = today + timedelta(days=30)
     
-    for pregnancy in active_pregnancies:
-        # Add due_soon flag to each pregnancy object
-        pregnancy.due_soon = pregnancy.expected_due_date <= next_month
-        
-        # Calculate trimester
-        if pregnancy.age_of_gestation_weeks:
-            if pregnancy.age_of_gestation_weeks <= 12:
-                first_trimester.append(pregnancy)
-            elif pregnancy.age_of_gestation_weeks <= 28:
-                second_trimester.append(pregnancy)
-            else:
-                third_trimester.append(pregnancy)
+    # Filter by trimester
+    trimester = request.GET.get('trimester')
+    trimester = int(trimester) if trimester in ('1', '2', '3') else None
     
-    # Due dates in next 30 days
-    upcoming_deliveries = active_pregnancies.filter(
-        expected_due_date__lte=next_month
-    ).order_by('expected_due_date')
-    
-    context = {
-        'active_pregnancies': active_pregnancies,
-        'total_pregnancies': active_pregnancies.count(),
-        'high_risk_pregnancies': high_risk_pregnancies,
-        'first_trimester_count': len(first_trimester),
-        'second_trimester_count': len(second_trimester),
-        'third_trimester_count': len(third_trimester),
-        'upcoming_deliveries': upcoming_deliveries,
-    }
+    context = await sync_to_async(cached_value)(
+        f'pregnancy_report:{today}:{trimester}',
+        PREGNANCY_REPORT_MODELS,
+        lambda: pregnancy_context(today, trimester)
+    )
     
-    return render(request, 'dashboard/pregnancy_report.html', context)
+    return await sync_to_async(render)(request, 'dashboard/pregnancy_report.html', context)
 
 
+@reads_from_replica
+@conditional_on('residents.Resident')
 def residents_list(request):
     """Residents listing view with search and filter"""
-    residents = Resident.objects.filter(is_active=True).order_by('last_name', 'first_name')
+    residents = Resident.objects.filter(is_active=True).with_age()
     
-    # Search functionality
+    # Search functionality, best matches first
     search_query = request.GET.get('search')
+    ordering = RESIDENT_ORDERING
     if search_query:
-        residents = residents.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(middle_name__icontains=search_query) |
-            Q(contact_number__icontains=search_query)
-        )
+        residents = search_residents(residents, search_query, ranked=True)
+        ordering = ['search_rank', 'id']
     
     # Filter by zone
     zone_filter = request.GET.get('zone')
@@ -250,15 +254,26 @@ def residents_list(request):
     if gender_filter:
         residents = residents.filter(gender=gender_filter)
     
+    # Filter by age group, as a birth-date range
+    age_band_filter = request.GET.get('age_band')
+    if age_band_filter in AGE_BANDS:
+        residents = residents.age_band(age_band_filter)
+    
     # Get unique zones for filter dropdown
     zones = Resident.objects.filter(is_active=True).values_list('zone', flat=True).distinct().order_by('zone')
     
+    page = paginate(request, residents, ordering)
+    
     context = {
-        'residents': residents,
+        'residents': page.object_list,
+        'page': page,
+        'total_residents': residents.count(),
         'zones': zones,
         'search_query': search_query,
         'zone_filter': zone_filter,
         'gender_filter': gender_filter,
+        'age_bands': list(AGE_BANDS),
+        'age_band_filter': age_band_filter,
     }
     
     return render(request, 'dashboard/residents_list.html', context)
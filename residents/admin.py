@@ -1,14 +1,62 @@
 from django.contrib import admin
-from .models import Resident, Household
+from import_export.admin import ImportExportModelAdmin
+from dashboard.bulk import bulk_action
+from dashboard.cache import cached_value
+from .models import AGE_BANDS, DuplicateCandidate, DuplicateScan, Resident, Household
+from .pagination import EstimatedCountPaginator, NoCountPaginator
+from .resources import ResidentResource
+from .search import search_residents
 
 # Register your models here.
 
+class AgeBandFilter(admin.SimpleListFilter):
+    title = 'age group'
+    parameter_name = 'age_band'
+    
+    def lookups(self, request, model_admin):
+        return [(band, band.title()) for band in AGE_BANDS]
+    
+    def queryset(self, request, queryset):
+        if self.value() in AGE_BANDS:
+            return queryset.age_band(self.value())
+        return queryset
+
+
+class ZoneFilter(admin.SimpleListFilter):
+    title = 'zone'
+    parameter_name = 'zone'
+    
+    def lookups(self, request, model_admin):
+        # Inactive residents' zones too, cached until a resident changes
+        zones = cached_value('admin:resident_zones', ['residents.Resident'], lambda: list(
+            Resident.objects.order_by('zone').values_list('zone', flat=True).distinct()
+        ))
+        return [(zone, zone) for zone in zones]
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(zone=self.value())
+        return queryset
+
+
 @admin.register(Resident)
-class ResidentAdmin(admin.ModelAdmin):
+class ResidentAdmin(ImportExportModelAdmin):
+    resource_classes = [ResidentResource]
     list_display = ['voters_id', 'precinct_number', 'philhealth_number', 'sss_gsis_number', 'tin_number', 'last_name', 'first_name', 'middle_name', 'age', 'gender', 'zone', 'is_senior_citizen', 'is_4ps_beneficiary', 'is_active']
-    list_filter = ['gender', 'civil_status', 'is_senior_citizen', 'is_4ps_beneficiary', 'is_pwd', 'zone', 'is_active']
+    list_filter = [AgeBandFilter, 'gender', 'civil_status', 'is_senior_citizen', 'is_4ps_beneficiary', 'is_pwd', ZoneFilter, 'is_active']
     search_fields = ['first_name', 'last_name', 'middle_name', 'contact_number']
     list_editable = ['is_active']
+    # One exact COUNT for filtered lists, an estimate for the whole table, and none for "Show all"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    # Only columns an index can sort
+    sortable_by = ['last_name', 'age']
+    # Chunked background jobs, so thousands of selected rows don't tie up the request
+    actions = [
+        bulk_action('deactivate', 'Deactivate selected residents (moved out)'),
+        bulk_action('create_senior_reports', 'Create senior citizen reports for selected flagged seniors'),
+    ]
     
     fieldsets = (
         ('Personal Information', {
@@ -41,15 +89,63 @@ class ResidentAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_age()
+    
     def age(self, obj):
-        return obj.age
+        return obj.current_age
     age.short_description = 'Age'
+    # Youngest first is latest birth date first, which the birth date index serves
+    age.admin_order_field = '-date_of_birth'
+    
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        # Autocomplete lookups fetch one row extra instead of counting every match
+        if request.resolver_match and request.resolver_match.url_name == 'autocomplete':
+            return NoCountPaginator(queryset, per_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Served from the full-text index instead of four LIKE '%term%' scans
+        if not search_term.strip():
+            return queryset, False
+        return search_residents(queryset, search_term), False
 
 
 @admin.register(Household)
 class HouseholdAdmin(admin.ModelAdmin):
-    list_display = ['household_number', 'household_head', 'house_ownership', 'total_monthly_income', 'created_at']
+    list_display = ['household_number', 'household_head', 'house_ownership', 'member_count', 'total_monthly_income', 'computed_monthly_income', 'per_capita_income', 'created_at']
     list_filter = ['house_ownership']
+    list_select_related = ['household_head']
+    readonly_fields = ['member_count', 'computed_monthly_income', 'per_capita_income']
     search_fields = ['household_number', 'household_head__first_name', 'household_head__last_name']
     
-    filter_horizontal = ['members']
+    # Residents are looked up as you type instead of rendered into the page
+    autocomplete_fields = ['household_head', 'members']
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    list_display = ['resident', 'duplicate', 'score', 'blocking_key', 'status', 'updated_at']
+    list_filter = ['status']
+    list_select_related = ['resident', 'duplicate']
+    raw_id_fields = ['resident', 'duplicate']
+    readonly_fields = ['score', 'blocking_key', 'created_at', 'updated_at']
+    actions = ['mark_confirmed', 'mark_dismissed']
+    
+    def mark_confirmed(self, request, queryset):
+        updated = queryset.update(status='confirmed')
+        self.message_user(request, f"{updated} pairs marked as duplicates.")
+    mark_confirmed.short_description = 'Mark selected pairs as duplicates'
+    
+    def mark_dismissed(self, request, queryset):
+        updated = queryset.update(status='dismissed')
+        self.message_user(request, f"{updated} pairs marked as different people.")
+    mark_dismissed.short_description = 'Mark selected pairs as not duplicates'
+
+
+@admin.register(DuplicateScan)
+class DuplicateScanAdmin(admin.ModelAdmin):
+    list_display = ['started_at', 'finished_at', 'full_scan', 'residents_checked', 'candidates_found']
+    
+    def has_add_permission(self, request):
+        return False
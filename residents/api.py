@@ -0,0 +1,27 @@
+from django.db.models import Prefetch
+from rest_framework import viewsets
+
+from barangay_ims.api import ConditionalGetMixin
+
+from .filters import HouseholdFilter, ResidentFilter
+from .models import Household, Resident
+from .serializers import HouseholdSerializer, ResidentSerializer
+
+
+class ResidentViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Resident.objects.all()
+    serializer_class = ResidentSerializer
+    filterset_class = ResidentFilter
+
+    def get_queryset(self):
+        # Ages are computed for today, so the annotation is built per request
+        return super().get_queryset().with_age()
+
+
+class HouseholdViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_models = ['residents.Resident']
+    queryset = Household.objects.select_related('household_head').prefetch_related(
+        Prefetch('members', queryset=Resident.objects.only('id'))
+    )
+    serializer_class = HouseholdSerializer
+    filterset_class = HouseholdFilter
@@ -0,0 +1,108 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import DuplicateCandidate, DuplicateScan, Resident
+from .similarity import normalize_name, score_blocks, soundex
+
+DEFAULT_THRESHOLD = 0.8
+# Blocks handed to each worker process at a time
+BLOCKS_PER_TASK = 500
+
+
+def blocking_keys(last_name, date_of_birth, zone):
+    """
+    Keys of the blocks a resident is compared within. Sharing a birth date
+    and a phonetic surname catches name misspellings; sharing the phonetic
+    surname, zone and birth year catches mistyped birth dates.
+    """
+    surname = soundex(last_name)
+    return [
+        f'dob:{date_of_birth.isoformat()}:{surname}',
+        f'zone:{zone.strip().lower()}:{surname}:{date_of_birth.year}',
+    ]
+
+
+def build_blocks(since=None):
+    """
+    Group active residents into blocks, keeping only blocks that contain a
+    resident updated after ``since`` (every block with two or more members
+    when ``since`` is None).
+    """
+    blocks = defaultdict(list)
+    changed_count = 0
+    rows = Resident.objects.filter(is_active=True).values_list(
+        'id', 'first_name', 'last_name', 'date_of_birth', 'zone', 'updated_at'
+    ).order_by()
+    for pk, first, last, dob, zone, updated_at in rows.iterator(chunk_size=5000):
+        changed = since is None or updated_at > since
+        changed_count += changed
+        # Middle names and suffixes are too often left out to compare on
+        name = normalize_name(f'{first} {last}')
+        for key in blocking_keys(last, dob, zone):
+            blocks[key].append((pk, name, dob.isoformat(), zone, changed))
+    return [
+        (key, block) for key, block in blocks.items()
+        if len(block) > 1 and any(row[4] for row in block)
+    ], changed_count
+
+
+def score_all(blocks, threshold, workers):
+    """Score blocks across a process pool and keep the best score per pair"""
+    tasks = [blocks[i:i + BLOCKS_PER_TASK] for i in range(0, len(blocks), BLOCKS_PER_TASK)]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(score_blocks, tasks, [threshold] * len(tasks))
+            scored = [pair for result in results for pair in result]
+    else:
+        scored = [pair for task in tasks for pair in score_blocks(task, threshold)]
+
+    best = {}
+    for a, b, score, key in scored:
+        if (a, b) not in best or score > best[(a, b)][0]:
+            best[(a, b)] = (score, key)
+    return best
+
+
+def find_duplicates(full=False, threshold=DEFAULT_THRESHOLD, workers=None):
+    """
+    Record likely duplicate residents as DuplicateCandidate rows.
+
+    Unless ``full`` is set only residents updated since the last finished
+    scan are compared (against everyone in their blocks). Reviewed pairs
+    keep their status; pending pairs involving a changed resident that no
+    longer match are removed.
+    """
+    workers = workers or os.cpu_count() or 1
+    last_scan = DuplicateScan.objects.filter(finished_at__isnull=False).first()
+    since = None if full or last_scan is None else last_scan.started_at
+    scan = DuplicateScan.objects.create(started_at=timezone.now(), full_scan=since is None)
+
+    blocks, changed_count = build_blocks(since)
+    pairs = score_all(blocks, threshold, workers)
+
+    with transaction.atomic():
+        stale = DuplicateCandidate.objects.filter(status='pending')
+        if since is not None:
+            changed = Resident.objects.filter(updated_at__gt=since).values('id')
+            stale = stale.filter(Q(resident__in=changed) | Q(duplicate__in=changed))
+        stale.delete()
+        DuplicateCandidate.objects.bulk_create(
+            [
+                DuplicateCandidate(resident_id=a, duplicate_id=b, score=score, blocking_key=key)
+                for (a, b), (score, key) in pairs.items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['resident', 'duplicate'],
+            update_fields=['score', 'blocking_key', 'updated_at'],
+        )
+        scan.finished_at = timezone.now()
+        scan.residents_checked = changed_count
+        scan.candidates_found = len(pairs)
+        scan.save()
+    return scan
@@ -0,0 +1,28 @@
+import django_filters
+
+from .models import AGE_BANDS, Household, Resident
+
+
+class ResidentFilter(django_filters.FilterSet):
+    born_after = django_filters.DateFilter(field_name='date_of_birth', lookup_expr='gte')
+    born_before = django_filters.DateFilter(field_name='date_of_birth', lookup_expr='lte')
+    age_band = django_filters.ChoiceFilter(
+        choices=[(band, band.title()) for band in AGE_BANDS], method='filter_age_band'
+    )
+
+    class Meta:
+        model = Resident
+        # Each filter is served by one of Resident's indexes
+        fields = ['zone', 'gender', 'precinct_number', 'last_name', 'is_active', 'is_senior_citizen']
+
+    def filter_age_band(self, queryset, name, value):
+        return queryset.age_band(value)
+
+
+class HouseholdFilter(django_filters.FilterSet):
+    per_capita_income_below = django_filters.NumberFilter(field_name='per_capita_income', lookup_expr='lt')
+    per_capita_income_above = django_filters.NumberFilter(field_name='per_capita_income', lookup_expr='gte')
+
+    class Meta:
+        model = Household
+        fields = ['household_number', 'household_head']
@@ -0,0 +1,39 @@
+from django.db.models import Count, DecimalField, FloatField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Now, NullIf, Round
+
+ZERO = Value(0, output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def member_aggregate(household_model, aggregate, output_field):
+    """Correlated subquery aggregating the active members of the outer household"""
+    Membership = household_model.members.through
+    return Subquery(
+        Membership.objects.filter(household_id=OuterRef('pk'), resident__is_active=True)
+        .order_by()
+        .values('household_id')
+        .annotate(total=aggregate)
+        .values('total'),
+        output_field=output_field,
+    )
+
+
+def refresh_household_aggregates(households):
+    """
+    Recompute member_count, computed_monthly_income and per_capita_income for
+    every household in the queryset with a single UPDATE. Only active
+    members count; a member without a monthly income contributes zero.
+    """
+    members = Coalesce(
+        member_aggregate(households.model, Count('resident_id'), IntegerField()), 0
+    )
+    income = Coalesce(
+        member_aggregate(households.model, Sum('resident__monthly_income'), DecimalField()), ZERO
+    )
+    return households.order_by().update(
+        member_count=members,
+        computed_monthly_income=income,
+        # Float division: SQLite keeps whole-peso sums as integers
+        per_capita_income=Coalesce(Round(Cast(income, FloatField()) / NullIf(members, 0), 2), ZERO),
+        # update() skips auto_now; conditional GETs rely on updated_at moving
+        updated_at=Now(),
+    )
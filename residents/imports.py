@@ -0,0 +1,189 @@
+import csv
+import time
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .households import refresh_household_aggregates
+from .models import Household, Resident
+from .resources import ResidentResource
+
+IMPORT_BATCH_SIZE = 1000
+
+# Optional census columns that place a resident in a household
+HOUSEHOLD_COLUMN = 'household_number'
+HOUSEHOLD_HEAD_COLUMN = 'household_head'
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+
+def read_rows(path):
+    """Yield each data row of a CSV or XLSX file as a dict keyed by column name"""
+    if str(path).lower().endswith('.xlsx'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(column).strip() if column is not None else '' for column in next(rows, [])]
+        for values in rows:
+            yield {
+                column: '' if value is None else value
+                for column, value in zip(header, values)
+            }
+        workbook.close()
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            yield from csv.DictReader(handle)
+
+
+def identity_key(first_name, middle_name, last_name, date_of_birth):
+    """Residents with the same names and birth date are treated as one person"""
+    return (
+        first_name.strip().lower(), middle_name.strip().lower(),
+        last_name.strip().lower(), date_of_birth,
+    )
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.households_created = 0
+        self.household_links = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_minute(self):
+        return self.rows / self.elapsed * 60 if self.elapsed else 0
+
+
+class ResidentImporter:
+    """
+    Import residents from census rows in batches.
+
+    Each batch is parsed with ResidentResource's widgets, validated with
+    full_clean(), checked for duplicates with one birth-date query and
+    written with a single bulk_create() inside its own transaction. Bulk
+    inserts bypass model signals, so callers must rebuild the derived data
+    (dashboard counters, search index) afterwards.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.resource = ResidentResource()
+        self.fields = [
+            field for field in self.resource.get_import_fields()
+            if field.attribute and not field.readonly
+        ]
+        self.seen = set()
+        # household number -> [(resident id, is head)], linked once all rows are in
+        self.memberships = {}
+
+    def run(self, rows):
+        result = ImportResult()
+        started = time.perf_counter()
+        rows = enumerate(rows, start=2)  # row 1 is the header
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch, result)
+        if not self.dry_run:
+            self.link_households(result)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def build_resident(self, row):
+        resident = Resident()
+        for field in self.fields:
+            if field.column_name in row:
+                try:
+                    value = field.clean(row)
+                except ValueError as error:
+                    raise ValueError(f'{field.column_name}: {error}')
+                setattr(resident, field.attribute, value)
+        resident.full_clean(validate_unique=False, validate_constraints=False)
+        return resident
+
+    def import_batch(self, batch, result):
+        candidates = []
+        for line, row in batch:
+            result.rows += 1
+            try:
+                resident = self.build_resident(row)
+            except ValidationError as error:
+                result.errors.append((line, '; '.join(
+                    f'{field}: {" ".join(messages)}' for field, messages in error.message_dict.items()
+                )))
+                continue
+            except (ValueError, TypeError) as error:
+                result.errors.append((line, str(error)))
+                continue
+            key = identity_key(resident.first_name, resident.middle_name, resident.last_name, resident.date_of_birth)
+            if key in self.seen:
+                result.duplicates += 1
+                continue
+            self.seen.add(key)
+            candidates.append((key, resident, row))
+
+        # One indexed query per batch finds residents that are already registered
+        existing = {
+            identity_key(*values) for values in Resident.objects.filter(
+                date_of_birth__in={key[3] for key, _, _ in candidates}
+            ).values_list('first_name', 'middle_name', 'last_name', 'date_of_birth')
+        }
+        new = [(resident, row) for key, resident, row in candidates if key not in existing]
+        result.duplicates += len(candidates) - len(new)
+
+        if self.dry_run or not new:
+            result.created += len(new)
+            return
+        with transaction.atomic():
+            Resident.objects.bulk_create([resident for resident, _ in new], batch_size=self.batch_size)
+        result.created += len(new)
+
+        for resident, row in new:
+            number = str(row.get(HOUSEHOLD_COLUMN) or '').strip()
+            if number:
+                is_head = str(row.get(HOUSEHOLD_HEAD_COLUMN) or '').strip().lower() in TRUE_VALUES
+                self.memberships.setdefault(number, []).append((resident.pk, is_head))
+
+    def link_households(self, result):
+        """Create missing households and all membership rows in bulk"""
+        if not self.memberships:
+            return
+        with transaction.atomic():
+            numbers = list(self.memberships)
+            households = {}
+            for i in range(0, len(numbers), self.batch_size):
+                households.update(
+                    Household.objects.filter(household_number__in=numbers[i:i + self.batch_size])
+                    .values_list('household_number', 'id')
+                )
+            new_households = []
+            for number, members in self.memberships.items():
+                if number not in households:
+                    heads = [pk for pk, is_head in members if is_head]
+                    new_households.append(Household(
+                        household_number=number,
+                        household_head_id=heads[0] if heads else members[0][0],
+                    ))
+            Household.objects.bulk_create(new_households, batch_size=self.batch_size)
+            households.update((household.household_number, household.pk) for household in new_households)
+            result.households_created = len(new_households)
+
+            Membership = Household.members.through
+            links = [
+                Membership(household_id=households[number], resident_id=pk)
+                for number, members in self.memberships.items()
+                for pk, _ in members
+            ]
+            Membership.objects.bulk_create(links, batch_size=self.batch_size, ignore_conflicts=True)
+            result.household_links = len(links)
+
+            household_ids = list(households.values())
+            for i in range(0, len(household_ids), self.batch_size):
+                refresh_household_aggregates(Household.objects.filter(pk__in=household_ids[i:i + self.batch_size]))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from residents.duplicates import DEFAULT_THRESHOLD, find_duplicates
+
+
+class Command(BaseCommand):
+    help = (
+        "Find residents that are probably registered twice and record them "
+        "as duplicate candidates for review in the admin. Only residents "
+        "changed since the last run are checked unless --full is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Compare every resident instead of only those changed since the last run"
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=DEFAULT_THRESHOLD,
+            help="Minimum similarity score, 0 to 1 (default %(default)s)"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Worker processes for scoring (default: one per CPU)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        scan = find_duplicates(
+            full=options['full'], threshold=options['threshold'], workers=options['workers']
+        )
+        elapsed = time.perf_counter() - started
+        mode = 'full' if scan.full_scan else 'incremental'
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {scan.residents_checked} residents ({mode}), "
+            f"found {scan.candidates_found} candidate pairs in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from residents.search import rebuild_search_index, search_index_available
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text name/contact search index for residents. Run "
+        "this after bulk imports or updates that bypass model signals."
+    )
+
+    def handle(self, *args, **options):
+        if not search_index_available():
+            self.stdout.write(self.style.WARNING(
+                "The search index is only used on SQLite; nothing to rebuild."
+            ))
+            return
+        started = time.perf_counter()
+        count = rebuild_search_index()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} residents in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.cache import bump_generation
+from residents.households import refresh_household_aggregates
+from residents.models import Household
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute member counts and incomes for every household in one "
+        "UPDATE. Run this after bulk changes that bypass model signals."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = refresh_household_aggregates(Household.objects.all())
+        bump_generation('residents.Household')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed aggregates for {count} households in {elapsed:.2f}s"
+        ))
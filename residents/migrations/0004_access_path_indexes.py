@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0003_resident_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_name', 'first_name'], name='resident_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['zone', 'gender'], name='resident_active_zone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(condition=models.Q(('is_active', True), ('precinct_number__gt', ''), ('voters_id__gt', '')), fields=['precinct_number', 'last_name', 'first_name'], name='resident_voter_precinct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_senior_citizen', True)), fields=['last_name', 'first_name'], name='resident_active_senior_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(fields=['date_of_birth'], name='resident_birth_date_idx'),
+        ),
+    ]
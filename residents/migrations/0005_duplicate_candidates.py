@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0004_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('full_scan', models.BooleanField(default=False)),
+                ('residents_checked', models.PositiveIntegerField(default=0)),
+                ('candidates_found', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Duplicate Scan',
+                'verbose_name_plural': 'Duplicate Scans',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('blocking_key', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('confirmed', 'Confirmed Duplicate'), ('dismissed', 'Not a Duplicate')], default='pending', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='residents.resident')),
+                ('resident', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_candidates', to='residents.resident')),
+            ],
+            options={
+                'verbose_name': 'Duplicate Candidate',
+                'verbose_name_plural': 'Duplicate Candidates',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['status', '-score'], name='duplicate_status_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('resident', 'duplicate'), name='unique_duplicate_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:48
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, FloatField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+
+def populate_household_aggregates(apps, schema_editor):
+    # A frozen copy of residents.households.refresh_household_aggregates,
+    # written against the historical models
+    Household = apps.get_model('residents', 'Household')
+    Membership = Household.members.through
+    zero = Value(0, output_field=DecimalField(max_digits=12, decimal_places=2))
+
+    def member_aggregate(aggregate, output_field):
+        return Subquery(
+            Membership.objects.filter(household_id=OuterRef('pk'), resident__is_active=True)
+            .order_by().values('household_id').annotate(total=aggregate).values('total'),
+            output_field=output_field,
+        )
+
+    members = Coalesce(member_aggregate(Count('resident_id'), IntegerField()), 0)
+    income = Coalesce(member_aggregate(Sum('resident__monthly_income'), DecimalField()), zero)
+    Household.objects.update(
+        member_count=members,
+        computed_monthly_income=income,
+        per_capita_income=Coalesce(Round(Cast(income, FloatField()) / NullIf(members, 0), 2), zero),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0005_duplicate_candidates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='household',
+            name='computed_monthly_income',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='household',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='household',
+            name='per_capita_income',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AddIndex(
+            model_name='household',
+            index=models.Index(fields=['per_capita_income'], name='household_per_capita_idx'),
+        ),
+        migrations.RunPython(populate_household_aggregates, migrations.RunPython.noop),
+    ]
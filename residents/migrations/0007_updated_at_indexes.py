@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0006_household_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='household',
+            index=models.Index(fields=['updated_at'], name='household_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(fields=['updated_at'], name='resident_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residents', '0007_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resident',
+            index=models.Index(fields=['last_name', 'first_name', '-id'], name='resident_admin_name_idx'),
+        ),
+    ]
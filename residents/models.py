@@ -1,9 +1,66 @@
+from datetime import date
+
 from django.db import models
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import ExtractYear
 from django.core.validators import RegexValidator
 from django.utils import timezone
 
 # Create your models here.
 
+# Age bands used by the dashboard, listing and admin filters: (min age, max age)
+AGE_BANDS = {
+    'children': (None, 17),
+    'adults': (18, 59),
+    'seniors': (60, None),
+}
+
+
+def years_before(today, years):
+    """The latest birth date of someone who is at least ``years`` old on ``today``"""
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        # Feb 29 in a non-leap year: only those born by Feb 28 have had a birthday
+        return date(today.year - years, 2, 28)
+
+
+class ResidentQuerySet(models.QuerySet):
+    def with_age(self, today=None):
+        """Annotate ``current_age`` in whole years, computed by the database"""
+        today = today or timezone.now().date()
+        birthday_pending = Q(date_of_birth__month__gt=today.month) | Q(
+            date_of_birth__month=today.month, date_of_birth__day__gt=today.day
+        )
+        return self.annotate(current_age=(
+            Value(today.year) - ExtractYear('date_of_birth') - Case(
+                When(birthday_pending, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        ))
+
+    def age_between(self, min_age=None, max_age=None, today=None):
+        """Residents aged ``min_age`` to ``max_age`` inclusive, as birth-date ranges"""
+        today = today or timezone.now().date()
+        condition = Q()
+        if min_age is not None:
+            condition &= Q(date_of_birth__lte=years_before(today, min_age))
+        if max_age is not None:
+            condition &= Q(date_of_birth__gt=years_before(today, max_age + 1))
+        return self.filter(condition)
+
+    def age_band(self, band, today=None):
+        min_age, max_age = AGE_BANDS[band]
+        return self.age_between(min_age, max_age, today)
+
+    def seniors(self, today=None):
+        """Residents flagged as senior citizens or old enough to be one"""
+        today = today or timezone.now().date()
+        senior_cutoff = years_before(today, AGE_BANDS['seniors'][0])
+        return self.filter(Q(is_senior_citizen=True) | Q(date_of_birth__lte=senior_cutoff))
+
+
 class Resident(models.Model):
     CIVIL_STATUS_CHOICES = [
         ('single', 'Single'),
@@ -106,10 +163,45 @@ class Resident(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ResidentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['last_name', 'first_name']
         verbose_name = 'Resident'
         verbose_name_plural = 'Residents'
+        # Django writes is_active=True as a bare "is_active" term, which SQLite
+        # can only match against a partial index with the same condition
+        indexes = [
+            # Residents listing: active residents in name order, optionally by zone/gender
+            models.Index(
+                fields=['last_name', 'first_name'],
+                condition=models.Q(is_active=True),
+                name='resident_active_name_idx',
+            ),
+            models.Index(
+                fields=['zone', 'gender'],
+                condition=models.Q(is_active=True),
+                name='resident_active_zone_idx',
+            ),
+            # Voters reports, grouped and ordered by precinct
+            models.Index(
+                fields=['precinct_number', 'last_name', 'first_name'],
+                condition=models.Q(is_active=True, voters_id__gt='', precinct_number__gt=''),
+                name='resident_voter_precinct_idx',
+            ),
+            # Senior citizens report
+            models.Index(
+                fields=['last_name', 'first_name'],
+                condition=models.Q(is_active=True, is_senior_citizen=True),
+                name='resident_active_senior_idx',
+            ),
+            # Admin changelist order, which adds -pk and includes inactive residents
+            models.Index(fields=['last_name', 'first_name', '-id'], name='resident_admin_name_idx'),
+            # Age groups are birth-date ranges
+            models.Index(fields=['date_of_birth'], name='resident_birth_date_idx'),
+            # MAX(updated_at) probes for conditional GETs (dashboard.conditional)
+            models.Index(fields=['updated_at'], name='resident_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.last_name}, {self.first_name} {self.middle_name}"
@@ -136,6 +228,11 @@ class Household(models.Model):
     household_number = models.CharField(max_length=20, unique=True)
     members = models.ManyToManyField(Resident, related_name='households', blank=True)
     total_monthly_income = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
+    
+    # Maintained from the active members by residents.signals; never edited by hand
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    computed_monthly_income = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    per_capita_income = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
     house_ownership = models.CharField(max_length=50, choices=[
         ('owned', 'Owned'),
         ('rented', 'Rented'),
@@ -150,6 +247,60 @@ class Household(models.Model):
         ordering = ['household_number']
         verbose_name = 'Household'
         verbose_name_plural = 'Households'
+        indexes = [
+            models.Index(fields=['per_capita_income'], name='household_per_capita_idx'),
+            models.Index(fields=['updated_at'], name='household_updated_idx'),
+        ]
     
     def __str__(self):
         return f"Household {self.household_number} - {self.household_head.full_name}"
+
+
+class DuplicateCandidate(models.Model):
+    """A pair of residents that may be the same person, awaiting review"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending Review'),
+        ('confirmed', 'Confirmed Duplicate'),
+        ('dismissed', 'Not a Duplicate'),
+    ]
+    
+    # The lower resident id is always stored first
+    resident = models.ForeignKey(Resident, on_delete=models.CASCADE, related_name='duplicate_candidates')
+    duplicate = models.ForeignKey(Resident, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    blocking_key = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-score']
+        verbose_name = 'Duplicate Candidate'
+        verbose_name_plural = 'Duplicate Candidates'
+        constraints = [
+            models.UniqueConstraint(fields=['resident', 'duplicate'], name='unique_duplicate_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score'], name='duplicate_status_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.resident} / {self.duplicate} ({self.score:.2f})"
+
+
+class DuplicateScan(models.Model):
+    """One run of find_duplicate_residents; the last finished run is the incremental watermark"""
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    full_scan = models.BooleanField(default=False)
+    residents_checked = models.PositiveIntegerField(default=0)
+    candidates_found = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-started_at']
+        verbose_name = 'Duplicate Scan'
+        verbose_name_plural = 'Duplicate Scans'
+    
+    def __str__(self):
+        return f"Duplicate scan {self.started_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,228 @@
+import base64
+import binascii
+import json
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, with cursors to its neighbours"""
+
+    def __init__(self, object_list, paginator, start, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.start = start
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def start_index(self):
+        return self.start + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self.start + len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            return self.paginator.encode_cursor(self.object_list[-1], self.end_index() - 1)
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[0], self.start)
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) pagination over a unique, ascending ``ordering``.
+
+    Pages are fetched with ``WHERE (ordering) > (cursor values)`` instead of
+    OFFSET, so a deep page costs the same as the first one. The ordering must
+    end in a unique column (usually ``id``) to break ties.
+    """
+
+    def __init__(self, queryset, ordering, per_page=DEFAULT_PAGE_SIZE):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+
+    def _values(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field in self.ordering]
+        return [getattr(row, field) for field in self.ordering]
+
+    def encode_cursor(self, row, position):
+        payload = json.dumps([self._values(row), position], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values, position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise Http404("Invalid page cursor")
+        if not isinstance(values, list) or len(values) != len(self.ordering) or not isinstance(position, int):
+            raise Http404("Invalid page cursor")
+        return values, position
+
+    def _seek(self, values, lookup):
+        # (a, b, c) > (x, y, z) expanded as a > x OR (a = x AND b > y) OR ...
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:index], values[:index]))
+            condition |= Q(**equal, **{f'{field}__{lookup}': values[index]})
+        return condition
+
+    def page(self, after=None, before=None):
+        if before:
+            values, position = self.decode_cursor(before)
+            rows = list(
+                self.queryset
+                .filter(self._seek(values, 'lt'))
+                .order_by(*[f'-{field}' for field in self.ordering])[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            start = max(position - len(rows), 0)
+            return KeysetPage(rows, self, start, has_next=True, has_previous=has_previous)
+
+        queryset = self.queryset
+        start = 0
+        if after:
+            values, position = self.decode_cursor(after)
+            queryset = queryset.filter(self._seek(values, 'gt'))
+            start = position + 1
+        rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], self, start, has_next=has_next, has_previous=bool(after))
+
+
+def paginate(request, queryset, ordering):
+    """Keyset-paginate ``queryset`` using the after/before/page_size GET parameters"""
+    try:
+        per_page = int(request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        per_page = DEFAULT_PAGE_SIZE
+    paginator = KeysetPaginator(queryset, ordering, per_page)
+    return paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+
+
+def estimated_count(model, using='default'):
+    """
+    Row count of ``model``'s table from the planner statistics, or None when
+    there are none: pg_class.reltuples on PostgreSQL, or sqlite_stat1 on
+    SQLite once ANALYZE (or PRAGMA optimize) has run.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Each index row starts with its entry count; partial indexes count fewer
+            cursor.execute('SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = %s', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] and row[0] > 0 else None
+
+
+def refresh_statistics(using='default'):
+    """
+    Re-run ANALYZE so the planner statistics, and estimated_count with them,
+    match the tables again. Call it after writing many rows at once.
+    """
+    connection = connections[using]
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using the table's estimated row count when the queryset is
+    unfiltered. The statistics lag behind rows written since the last
+    ANALYZE, so an estimate of one page or less, or a page number past the
+    estimate, is counted exactly instead.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.per_page:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.estimated:
+                raise
+        self.estimated = False
+        self.__dict__['count'] = super().count
+        self.__dict__.pop('num_pages', None)
+        return super().validate_number(number)
+
+
+class NoCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class NoCountPaginator(Paginator):
+    """
+    Paginator that never counts: each page fetches one row past its end to
+    find out whether another page follows. For autocomplete lookups, where
+    only "more results" matters.
+    """
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise InvalidPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return NoCountPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
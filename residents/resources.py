@@ -0,0 +1,41 @@
+from import_export import resources
+from import_export.results import RowResult
+
+from dashboard.cache import bump_generation
+from dashboard.counters import rebuild_counters
+from .households import refresh_household_aggregates
+from .models import Household, Resident
+from .pagination import refresh_statistics
+from .search import rebuild_search_index
+
+# Resident columns a census file may not set; they are managed by the system
+SYSTEM_FIELDS = ('id', 'date_registered', 'created_at', 'updated_at')
+
+
+class ResidentResource(resources.ModelResource):
+    """Column mapping for resident imports and exports"""
+
+    class Meta:
+        model = Resident
+        exclude = SYSTEM_FIELDS
+        # A resident is identified by full name and date of birth
+        import_id_fields = ('first_name', 'middle_name', 'last_name', 'date_of_birth')
+        skip_unchanged = True
+        use_bulk = True
+        batch_size = 1000
+
+    def after_import(self, dataset, result, **kwargs):
+        # Bulk writes skip the save signals that maintain the derived data
+        super().after_import(dataset, result, **kwargs)
+        if kwargs.get('dry_run') or result.has_errors() or result.has_validation_errors():
+            return
+        written = sum(result.totals[kind] for kind in (
+            RowResult.IMPORT_TYPE_NEW, RowResult.IMPORT_TYPE_UPDATE, RowResult.IMPORT_TYPE_DELETE
+        ))
+        if not written:
+            return
+        rebuild_counters()
+        rebuild_search_index()
+        refresh_household_aggregates(Household.objects.all())
+        refresh_statistics()
+        bump_generation('residents.Resident', 'residents.Household')
@@ -0,0 +1,89 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Resident
+
+# FTS5 table keyed by Resident.id (rowid); created by migration 0003 on SQLite
+FTS_TABLE = 'residents_resident_fts'
+INDEXED_FIELDS = ['first_name', 'last_name', 'middle_name', 'contact_number']
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def search_index_available(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(text))
+
+
+def search_residents(queryset, text, ranked=False):
+    """
+    Filter a Resident queryset to rows matching ``text`` on name or contact
+    number. With ``ranked=True`` rows are annotated with ``search_rank``
+    (bm25, lower is better) and ordered by it.
+    """
+    match = build_match_query(text)
+    if not match:
+        return queryset.none()
+
+    if not search_index_available(queryset.db):
+        condition = Q()
+        for token in TOKEN_RE.findall(text):
+            condition &= Q(*[Q(**{f'{field}__icontains': token}) for field in INDEXED_FIELDS], _connector=Q.OR)
+        queryset = queryset.filter(condition)
+        if ranked:
+            queryset = queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).order_by('search_rank', 'id')
+        return queryset
+
+    if ranked:
+        # Join the index once and order by its rank (bm25) rather than
+        # running a second MATCH for every row
+        table = Resident._meta.db_table
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'"{FTS_TABLE}".rowid = "{table}"."id"', f'"{FTS_TABLE}" MATCH %s'],
+            params=[match],
+        ).annotate(
+            search_rank=RawSQL(f'"{FTS_TABLE}".rank', [], output_field=FloatField())
+        ).order_by('search_rank', 'id')
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]
+    ))
+
+
+def index_resident(resident, using='default'):
+    if not search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [resident.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(INDEXED_FIELDS)}) VALUES (%s, %s, %s, %s, %s)',
+            [resident.pk, *[getattr(resident, field) for field in INDEXED_FIELDS]]
+        )
+
+
+def unindex_resident(resident_id, using='default'):
+    if not search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [resident_id])
+
+
+def rebuild_search_index(using='default'):
+    """Repopulate the whole index from the resident table; returns the row count"""
+    if not search_index_available(using):
+        return 0
+    table = Resident._meta.db_table
+    columns = ', '.join(INDEXED_FIELDS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM {table}')
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from barangay_ims.api import SparseFieldsetMixin
+from .models import Household, Resident
+
+
+class ResidentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    full_name = serializers.CharField(read_only=True)
+    age = serializers.IntegerField(source='current_age', read_only=True)
+
+    class Meta:
+        model = Resident
+        fields = [
+            'id', 'first_name', 'middle_name', 'last_name', 'suffix', 'full_name',
+            'date_of_birth', 'age', 'gender', 'civil_status', 'citizenship',
+            'contact_number', 'email',
+            'house_number', 'street', 'zone', 'barangay', 'city_municipality', 'province', 'zip_code',
+            'educational_attainment', 'employment_status', 'occupation', 'monthly_income',
+            'voters_id', 'precinct_number',
+            'is_pwd', 'pwd_type', 'is_senior_citizen', 'is_solo_parent', 'is_indigenous', 'is_4ps_beneficiary',
+            'is_active', 'date_registered', 'updated_at',
+        ]
+
+
+class HouseholdSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    household_head_name = serializers.CharField(source='household_head.full_name', read_only=True)
+    members = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = Household
+        fields = [
+            'id', 'household_number', 'household_head', 'household_head_name', 'members',
+            'house_ownership', 'total_monthly_income',
+            'member_count', 'computed_monthly_income', 'per_capita_income', 'updated_at',
+        ]
@@ -0,0 +1,61 @@
+from django.db.models.signals import pre_delete, post_save, post_delete, m2m_changed
+
+from .households import refresh_household_aggregates
+from .models import Household
+from .search import index_resident, unindex_resident
+
+# Resident fields the household aggregates are computed from
+HOUSEHOLD_AGGREGATE_FIELDS = {'monthly_income', 'is_active'}
+
+
+def update_search_index(sender, instance, using, **kwargs):
+    index_resident(instance, using)
+
+
+def remove_from_search_index(sender, instance, using, **kwargs):
+    unindex_resident(instance.pk, using)
+
+
+def refresh_households_on_membership_change(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if not reverse:
+        # household.members.add()/remove()/clear()
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            refresh_household_aggregates(Household.objects.using(using).filter(pk=instance.pk))
+        return
+
+    # resident.households.add()/remove()/clear()
+    if action == 'pre_clear':
+        instance._cleared_household_ids = list(instance.households.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        refresh_household_aggregates(Household.objects.using(using).filter(pk__in=pk_set))
+    elif action == 'post_clear':
+        household_ids = getattr(instance, '_cleared_household_ids', [])
+        refresh_household_aggregates(Household.objects.using(using).filter(pk__in=household_ids))
+
+
+def refresh_households_on_resident_save(sender, instance, created, update_fields, using, **kwargs):
+    # A new resident belongs to no household yet
+    if created or (update_fields and not HOUSEHOLD_AGGREGATE_FIELDS & set(update_fields)):
+        return
+    refresh_household_aggregates(Household.objects.using(using).filter(members=instance))
+
+
+def remember_resident_households(sender, instance, using, **kwargs):
+    # Membership rows are cascade-deleted without an m2m_changed signal
+    instance._household_ids = list(instance.households.using(using).values_list('pk', flat=True))
+
+
+def refresh_households_on_resident_delete(sender, instance, using, **kwargs):
+    household_ids = getattr(instance, '_household_ids', [])
+    if household_ids:
+        refresh_household_aggregates(Household.objects.using(using).filter(pk__in=household_ids))
+
+
+def connect_signals():
+    post_save.connect(update_search_index, sender='residents.Resident', dispatch_uid='residents_search_post_save')
+    post_delete.connect(remove_from_search_index, sender='residents.Resident', dispatch_uid='residents_search_post_delete')
+
+    m2m_changed.connect(refresh_households_on_membership_change, sender='residents.Household_members', dispatch_uid='residents_household_members')
+    post_save.connect(refresh_households_on_resident_save, sender='residents.Resident', dispatch_uid='residents_household_post_save')
+    pre_delete.connect(remember_resident_households, sender='residents.Resident', dispatch_uid='residents_household_pre_delete')
+    post_delete.connect(refresh_households_on_resident_delete, sender='residents.Resident', dispatch_uid='residents_household_post_delete')
@@ -0,0 +1,87 @@
+import unicodedata
+import zlib
+
+import numpy as np
+
+# Trigrams are hashed into this many buckets so every name vector has the same width
+TRIGRAM_BUCKETS = 1024
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+
+def normalize_name(value):
+    """Lower-case ASCII letters and single spaces only"""
+    value = unicodedata.normalize('NFKD', value or '').encode('ascii', 'ignore').decode()
+    return ' '.join(''.join(c if c.isalpha() else ' ' for c in value.lower()).split())
+
+
+def soundex(value):
+    """American Soundex code of a name, e.g. 'Robert' and 'Rupert' -> 'r163'"""
+    letters = normalize_name(value).replace(' ', '')
+    if not letters:
+        return ''
+    code = letters[0]
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+        # h and w do not separate letters with the same code; vowels do
+        if letter not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def trigram_matrix(names):
+    """Rows of L2-normalised hashed character-trigram counts, one per name"""
+    matrix = np.zeros((len(names), TRIGRAM_BUCKETS), dtype=np.float32)
+    for row, name in enumerate(names):
+        padded = f'  {name} '
+        for i in range(len(padded) - 2):
+            matrix[row, zlib.crc32(padded[i:i + 3].encode()) % TRIGRAM_BUCKETS] += 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def score_block(block, threshold):
+    """
+    Score every pair in a block at once and return those at or above
+    ``threshold`` as (id, id, score) with the lower id first.
+
+    ``block`` is a list of (id, normalised full name, birth date, zone,
+    changed) tuples. Pairs where neither resident changed since the last
+    run are skipped.
+    """
+    ids = np.array([row[0] for row in block])
+    vectors = trigram_matrix([row[1] for row in block])
+    births = np.array([row[2] for row in block])
+    zones = np.array([row[3] for row in block])
+    changed = np.array([row[4] for row in block])
+
+    # Name similarity, marked down when the birth date or zone disagree
+    scores = (
+        vectors @ vectors.T
+        - 0.1 * (births[:, None] != births[None, :])
+        - 0.05 * (zones[:, None] != zones[None, :])
+    )
+    candidates = np.triu(scores >= threshold, k=1) & (changed[:, None] | changed[None, :])
+    return [
+        (int(min(ids[i], ids[j])), int(max(ids[i], ids[j])), round(float(scores[i, j]), 4))
+        for i, j in zip(*np.nonzero(candidates))
+    ]
+
+
+def score_blocks(blocks, threshold):
+    """Worker entry point: score a list of (blocking key, block) pairs"""
+    return [
+        (a, b, score, key)
+        for key, block in blocks
+        for a, b, score in score_block(block, threshold)
+    ]
@@ -1,3 +1,652 @@
-from django.test import TestCase
+import csv
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from barangay_ims import db_router
+from barangay_ims.db_router import ReadReplicaRouter
+from dashboard.counters import counter_statistics
+from dashboard.tests import make_resident
+from .duplicates import build_blocks, find_duplicates, score_all
+from .models import AGE_BANDS, DuplicateCandidate, Household, Resident, years_before
+from .admin import ResidentAdmin
+from .pagination import KeysetPaginator, estimated_count, paginate
+from .resources import ResidentResource
+from .search import search_residents
+from .similarity import soundex
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Repeated names make the id tie-breaker matter
+        for i in range(23):
+            make_resident(
+                last_name=['Santos', 'Reyes', 'Cruz'][i % 3],
+                first_name=['Ana', 'Ben'][i % 2],
+                zone=str(i % 2 + 1),
+            )
+        cls.ordering = ['last_name', 'first_name', 'id']
+        cls.expected = list(Resident.objects.order_by(*cls.ordering).values_list('id', flat=True))
+
+    def test_walks_forward_and_back_over_every_row(self):
+        paginator = KeysetPaginator(Resident.objects.all(), self.ordering, per_page=5)
+
+        seen = []
+        pages = [paginator.page()]
+        while True:
+            seen.extend(resident.id for resident in pages[-1])
+            if not pages[-1].has_next():
+                break
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        self.assertEqual(seen, self.expected)
+        self.assertEqual([page.start_index() for page in pages], [1, 6, 11, 16, 21])
+
+        back = paginator.page(before=pages[-1].previous_cursor)
+        self.assertEqual([resident.id for resident in back], self.expected[15:20])
+        self.assertEqual(back.start_index(), 16)
+
+    def test_page_size_is_capped(self):
+        request = RequestFactory().get('/', {'page_size': '100000'})
+        page = paginate(request, Resident.objects.all(), self.ordering)
+        self.assertEqual(page.paginator.per_page, 200)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(reverse('residents:voters_report'), {'after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_filters_survive_paging(self):
+        url = reverse('dashboard:residents_list')
+        response = self.client.get(url, {'zone': '1', 'page_size': 5})
+        self.assertEqual(response.context['total_residents'], 12)
+        next_cursor = response.context['page'].next_cursor
+        self.assertContains(response, f'?zone=1&amp;page_size=5&amp;after={next_cursor}')
+
+        response = self.client.get(url, {'zone': '1', 'page_size': 5, 'after': next_cursor})
+        self.assertTrue(all(resident.zone == '1' for resident in response.context['residents']))
+
+
+class ResidentSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.maria = make_resident(first_name='Maria', middle_name='Lopez', last_name='Santos', contact_number='09171234567')
+        cls.mario = make_resident(first_name='Mario', last_name='Reyes', contact_number='09281112222')
+        cls.jose = make_resident(first_name='Jose', last_name='Marquez')
+
+    def search(self, text, **kwargs):
+        return list(search_residents(Resident.objects.all(), text, **kwargs))
+
+    def test_prefix_matching_on_names_and_contact_number(self):
+        self.assertEqual(set(self.search('mari')), {self.maria, self.mario})
+        self.assertEqual(self.search('santos mar'), [self.maria])
+        self.assertEqual(self.search('0917'), [self.maria])
+        self.assertEqual(self.search('!!'), [])
+
+    def test_ranked_results(self):
+        results = self.search('mar', ranked=True)
+        self.assertEqual(set(results), {self.maria, self.mario, self.jose})
+        ranks = [resident.search_rank for resident in results]
+        self.assertEqual(ranks, sorted(ranks))
+        # The index is joined and matched once, not once per row
+        query = str(search_residents(Resident.objects.all(), 'mar', ranked=True).query)
+        self.assertEqual(query.count('MATCH'), 1)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.jose.last_name = 'Villanueva'
+        self.jose.save()
+        self.assertEqual(self.search('marquez'), [])
+        self.assertEqual(self.search('villa'), [self.jose])
+
+        self.jose.delete()
+        self.assertEqual(self.search('villa'), [])
+
+    def test_rebuild_command_indexes_bulk_updates(self):
+        Resident.objects.filter(pk=self.mario.pk).update(last_name='Aquino')
+        self.assertEqual(self.search('aquino'), [])
+
+        call_command('rebuild_resident_search_index', stdout=StringIO())
+        self.assertEqual(self.search('aquino'), [self.mario])
+
+    def test_listing_and_admin_use_the_index(self):
+        response = self.client.get(reverse('dashboard:residents_list'), {'search': 'sant'})
+        self.assertEqual(list(response.context['residents']), [self.maria])
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:residents_resident_changelist'), {'q': '0928'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.mario])
+
+    def test_ranked_search_pages_with_cursors(self):
+        url = reverse('dashboard:residents_list')
+        first = self.client.get(url, {'search': 'mar', 'page_size': 2}).context
+        second = self.client.get(url, {'search': 'mar', 'page_size': 2, 'after': first['page'].next_cursor}).context
+        self.assertEqual(
+            set(first['residents']) | set(second['residents']),
+            {self.maria, self.mario, self.jose}
+        )
+        self.assertFalse(second['page'].has_next())
+
+
+class ResidentAgeTests(TestCase):
+    today = date(2028, 2, 29)
+
+    @classmethod
+    def setUpTestData(cls):
+        birth_dates = [
+            date(2010, 2, 28), date(2010, 3, 1), date(2010, 2, 27),
+            date(2008, 2, 29), date(1968, 2, 29), date(1968, 3, 1),
+            date(1968, 2, 28), date(1990, 12, 31), date(2028, 1, 1),
+        ]
+        for dob in birth_dates:
+            make_resident(date_of_birth=dob)
+
+    def expected_age(self, dob, today):
+        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+    def test_annotation_matches_calendar_age(self):
+        for today in [self.today, date(2027, 2, 28), date(2027, 3, 1), date(2026, 12, 31)]:
+            for resident in Resident.objects.with_age(today):
+                with self.subTest(today=today, dob=resident.date_of_birth):
+                    self.assertEqual(resident.current_age, self.expected_age(resident.date_of_birth, today))
+
+    def test_bands_split_on_exact_birthdays(self):
+        for today in [self.today, date(2027, 2, 28), date(2027, 3, 1)]:
+            ages = {r.pk: r.current_age for r in Resident.objects.with_age(today)}
+            for band, (min_age, max_age) in AGE_BANDS.items():
+                expected = {
+                    pk for pk, age in ages.items()
+                    if (min_age is None or age >= min_age) and (max_age is None or age <= max_age)
+                }
+                with self.subTest(today=today, band=band):
+                    self.assertEqual(set(Resident.objects.age_band(band, today).values_list('pk', flat=True)), expected)
+
+    def test_years_before_leap_day(self):
+        self.assertEqual(years_before(date(2028, 2, 29), 18), date(2010, 2, 28))
+        self.assertEqual(years_before(date(2028, 2, 29), 20), date(2008, 2, 29))
+        self.assertEqual(years_before(date(2027, 3, 1), 60), date(1967, 3, 1))
+
+    def test_listing_and_admin_filter_and_sort_by_age(self):
+        seniors = Resident.objects.age_band('seniors').count()
+        response = self.client.get(reverse('dashboard:residents_list'), {'age_band': 'seniors'})
+        self.assertEqual(response.context['total_residents'], seniors)
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        url = reverse('admin:residents_resident_changelist')
+        response = self.client.get(url, {'age_band': 'seniors'})
+        self.assertEqual(response.context['cl'].result_count, seniors)
+
+        # 'age' is the ninth list_display column
+        response = self.client.get(url, {'o': '9'})
+        ages = [resident.current_age for resident in response.context['cl'].result_list]
+        self.assertEqual(ages, sorted(ages))
+
+
+class ResidentAdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        for i in range(12):
+            make_resident(first_name=f'Admin {i}', zone=str(i % 3 + 1), is_active=i != 0)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:residents_resident_changelist')
+
+    def resident_counts(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith('SELECT COUNT(*)') and 'residents_resident' in q['sql']]
+
+    @mock.patch.object(ResidentAdmin, 'list_per_page', 5)
+    def test_unfiltered_list_uses_the_planner_estimate(self):
+        # Without statistics the exact count is used, once
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].result_count, 12)
+        self.assertEqual(len(self.resident_counts(queries)), 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].result_count, 12)
+        self.assertEqual(self.resident_counts(queries), [])
+
+    @mock.patch.object(ResidentAdmin, 'list_per_page', 5)
+    def test_stale_estimate_is_recounted_past_its_last_page(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for i in range(10):
+            make_resident(first_name=f'Added {i}')
+
+        # 12 estimated rows make 3 pages, but there are 5 now
+        response = self.client.get(self.url, {'p': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+
+    def test_one_page_estimate_is_counted_exactly(self):
+        # A stale estimate under list_per_page would show the whole table unpaginated
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for i in range(50):
+            make_resident(first_name=f'Added {i}')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].result_count, 62)
+        self.assertEqual(len(response.context['cl'].result_list), 50)
+
+    def test_filtered_list_counts_exactly_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'zone': '1'})
+        self.assertEqual(response.context['cl'].result_count, 4)
+        self.assertEqual(len(self.resident_counts(queries)), 1)
+
+    def test_zones_of_inactive_residents_can_be_filtered(self):
+        make_resident(zone='9', is_active=False)
+        response = self.client.get(self.url, {'zone': '9'})
+        zone_filter = next(spec for spec in response.context['cl'].filter_specs if spec.title == 'zone')
+        self.assertIn('9', [value for value, label in zone_filter.lookup_choices])
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_zone_choices_are_cached(self):
+        response = self.client.get(self.url)
+        zone_filter = next(spec for spec in response.context['cl'].filter_specs if spec.title == 'zone')
+        self.assertEqual([value for value, label in zone_filter.lookup_choices], ['1', '2', '3'])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse([q for q in queries if 'dashboard_dashboardcounter' in q['sql'] or 'DISTINCT' in q['sql']])
+
+
+class ResidentAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        for i in range(25):
+            make_resident(first_name=f'Lorna {i}', last_name='Villanueva', gender='F' if i % 5 else 'M')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def lookup(self, app_label, model_name, field_name, term, page=1):
+        return self.client.get(reverse('admin:autocomplete'), {
+            'app_label': app_label, 'model_name': model_name, 'field_name': field_name,
+            'term': term, 'page': page,
+        })
+
+    def test_lookup_is_one_query_without_a_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.lookup('residents', 'household', 'members', 'villanueva')
+        data = response.json()
+        self.assertEqual(len(data['results']), 20)
+        self.assertTrue(data['pagination']['more'])
+        resident_queries = [q['sql'] for q in queries if 'residents_resident' in q['sql']]
+        self.assertEqual(len(resident_queries), 1)
+        self.assertNotIn('COUNT(', resident_queries[0])
+
+        data = self.lookup('residents', 'household', 'members', 'villanueva', page=2).json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertFalse(data['pagination']['more'])
+
+    def test_pregnancy_picker_offers_only_women(self):
+        data = self.lookup('bhw_reports', 'pregnancyreport', 'pregnant_woman', 'villanueva').json()
+        self.assertEqual(len(data['results']), 20)
+        ids = [int(result['id']) for result in data['results']]
+        self.assertFalse(Resident.objects.filter(id__in=ids).exclude(gender='F').exists())
+
+    def test_household_form_does_not_render_every_resident(self):
+        response = self.client.get(reverse('admin:residents_household_add'))
+        self.assertNotContains(response, 'Lorna 1')
+
+
+class VoterExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            make_resident(
+                first_name=f'Voter{i}', last_name='Dela Cruz',
+                voters_id=f'V{i}', precinct_number=['0001A', '0002B'][i % 2],
+            )
+        make_resident(first_name='Unregistered')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_csv_streams_only_voter_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('residents:voters_export', args=['csv']))
+            self.assertTrue(response.streaming)
+            body = b''.join(response.streaming_content).decode()
+        # The conditional GET probe, then the export itself
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('"allergies"', queries[1]['sql'])
+
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual(rows[0][:3], ['Precinct No.', 'Voter ID', 'Last Name'])
+        self.assertEqual([row[1] for row in rows[1:]], ['V0', 'V2', 'V4', 'V1', 'V3'])
+        self.assertEqual(rows[1][6], 'Male')
+
+    def test_xlsx_for_one_precinct(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse('residents:voters_export', args=['xlsx']), {'precinct': '0002B'})
+        self.assertIn('voters-precinct-0002B.xlsx', response['Content-Disposition'])
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.values)
+        self.assertEqual([row[1] for row in rows[1:]], ['V1', 'V3'])
+
+    def test_cells_and_filename_are_escaped(self):
+        from openpyxl import load_workbook
+
+        make_resident(first_name='=HYPERLINK("http://example.com")', voters_id='V9', precinct_number='9"; x=.exe')
+        url = reverse('residents:voters_export', args=['csv'])
+        response = self.client.get(url, {'precinct': '9"; x=.exe'})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="voters-precinct-9\\"; x=.exe.csv"')
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[1][3], '\'=HYPERLINK("http://example.com")')
+
+        response = self.client.get(reverse('residents:voters_export', args=['xlsx']), {'precinct': '9"; x=.exe'})
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)
+        self.assertEqual(list(workbook.active.values)[1][3], '\'=HYPERLINK("http://example.com")')
+
+    def test_streamed_rows_keep_the_replica_routing(self):
+        # Record which read database each ORM read asked the router for
+        read_aliases = []
+        db_for_read = ReadReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            read_aliases.append(db_router._read_alias.get())
+            return db_for_read(router, model, **hints)
+
+        with mock.patch.object(ReadReplicaRouter, 'db_for_read', spy):
+            response = self.client.get(reverse('residents:voters_export', args=['csv']))
+            read_aliases.clear()
+            b''.join(response.streaming_content)
+        self.assertNotIn(None, read_aliases)
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('residents:voters_export', args=['pdf']))
+        self.assertEqual(response.status_code, 404)
+
+
+class VotersByPrecinctTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(7):
+            make_resident(
+                first_name=f'Voter{i}', last_name='Reyes',
+                voters_id=f'V{i}', precinct_number=['0001A', '0002B', '0003C'][i % 3],
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_headers_come_from_one_aggregate(self):
+        # The conditional GET probe and the precinct GROUP BY
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('residents:voters_by_precinct'))
+        self.assertEqual(
+            [(p['number'], p['total']) for p in response.context['precincts']],
+            [('0001A', 3), ('0002B', 2), ('0003C', 2)]
+        )
+        self.assertEqual(response.context['total_voters'], 7)
+        self.assertContains(response, reverse('residents:voters_precinct', args=['0002B']))
+
+    def test_single_precinct_page(self):
+        url = reverse('residents:voters_precinct', args=['0001A'])
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.context['total'], 3)
+        self.assertEqual([v.voters_id for v in response.context['voters']], ['V0', 'V3'])
+        # Only the rendered columns are loaded
+        self.assertEqual(response.context['voters'][0].get_deferred_fields() & {'allergies', 'email'}, {'allergies', 'email'})
+
+        response = self.client.get(url, {'page_size': 2, 'after': response.context['page'].next_cursor})
+        self.assertEqual([v.voters_id for v in response.context['voters']], ['V6'])
+
+        response = self.client.get(reverse('residents:voters_precinct', args=['9999Z']))
+        self.assertEqual(response.status_code, 404)
+
+
+class BulkImportTests(TestCase):
+    columns = [
+        'first_name', 'middle_name', 'last_name', 'date_of_birth', 'place_of_birth', 'gender',
+        'civil_status', 'house_number', 'street', 'zone', 'city_municipality', 'province', 'zip_code',
+        'educational_attainment', 'employment_status', 'emergency_contact_name',
+        'emergency_contact_number', 'emergency_contact_relationship', 'is_pwd',
+        'household_number', 'household_head',
+    ]
+
+    def write_census(self, rows):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False)
+        self.addCleanup(os.remove, handle.name)
+        with handle:
+            writer = csv.writer(handle)
+            writer.writerow(self.columns)
+            for first_name, dob, household, head, *rest in rows:
+                writer.writerow([
+                    first_name, '', 'Bautista', dob, 'Manila', rest[0] if rest else 'F', 'single', '7',
+                    'Mabini St.', '2', 'Quezon City', 'Metro Manila', '1100', 'college', 'employed',
+                    'Contact', '09170000000', 'Sister', '0', household, head,
+                ])
+        return handle.name
+
+    def test_import_dedupes_links_households_and_rebuilds_derived_data(self):
+        make_resident(first_name='Existing', last_name='Bautista', date_of_birth=date(1980, 5, 1))
+        path = self.write_census([
+            ('Ana', '1990-01-02', 'H-1', 'yes'),
+            ('Ben', '1992-03-04', 'H-1', ''),
+            ('Ana', '1990-01-02', 'H-1', ''),       # repeated in the file
+            ('existing', '1980-05-01', '', ''),     # already registered
+            ('Cara', 'not a date', '', ''),
+            ('Dino', '2001-07-08', '', '', 'X'),    # invalid gender
+            ('Eva', '1950-09-10', 'H-2', ''),
+        ])
+
+        out, err = StringIO(), StringIO()
+        call_command('bulk_import_residents', path, '--batch-size', '2', stdout=out, stderr=err)
+
+        self.assertIn('3 residents, 2 duplicates skipped, 2 errors from 7 rows', out.getvalue())
+        self.assertIn('Row 6: date_of_birth:', err.getvalue())
+        self.assertIn('Row 7: gender:', err.getvalue())
+        self.assertEqual(Resident.objects.filter(last_name='Bautista').count(), 4)
+
+        household = Household.objects.get(household_number='H-1')
+        self.assertEqual(household.household_head.first_name, 'Ana')
+        self.assertEqual(sorted(household.members.values_list('first_name', flat=True)), ['Ana', 'Ben'])
+        self.assertEqual(household.member_count, 2)
+        self.assertEqual(Household.objects.get(household_number='H-2').household_head.first_name, 'Eva')
+
+        self.assertEqual(counter_statistics()['total_residents'], 4)
+        self.assertEqual([r.first_name for r in search_residents(Resident.objects.all(), 'eva')], ['Eva'])
+        self.assertEqual(estimated_count(Resident), 4)
+
+    def test_resource_import_rebuilds_derived_data(self):
+        # The admin's import goes through ResidentResource with bulk writes
+        existing = make_resident(first_name='Existing', last_name='Bautista', date_of_birth=date(1980, 5, 1))
+        household = Household.objects.create(household_head=existing, household_number='H-9')
+        household.members.add(existing)
+        cache.clear()
+        counter_statistics()
+
+        dataset = ResidentResource().export(Resident.objects.all())
+        dataset.append([
+            'Fe' if header == 'first_name' else '1991-02-03' if header == 'date_of_birth' else value
+            for header, value in zip(dataset.headers, dataset[0])
+        ])
+        monthly_income = dataset.headers.index('monthly_income')
+        dataset[0] = tuple('15000' if i == monthly_income else value for i, value in enumerate(dataset[0]))
+
+        result = ResidentResource().import_data(dataset, dry_run=False)
+        self.assertFalse(result.has_errors() or result.has_validation_errors())
+        self.assertEqual(counter_statistics()['total_residents'], 2)
+        self.assertEqual([r.first_name for r in search_residents(Resident.objects.all(), 'fe')], ['Fe'])
+        household.refresh_from_db()
+        self.assertEqual(household.computed_monthly_income, Decimal('15000'))
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write_census([('Ana', '1990-01-02', 'H-1', 'yes')])
+        out = StringIO()
+        call_command('bulk_import_residents', path, '--dry-run', stdout=out)
+        self.assertIn('Dry run, nothing written: 1 residents', out.getvalue())
+        self.assertFalse(Resident.objects.exists())
+        self.assertFalse(Household.objects.exists())
+
+
+class DuplicateDetectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.maria = make_resident(first_name='Maria', last_name='Santos', date_of_birth=date(1990, 4, 5), zone='2')
+        cls.marya = make_resident(first_name='Maria', middle_name='Lopez', last_name='Santoz', date_of_birth=date(1990, 4, 5), zone='2')
+        # Same person with a mistyped birth date
+        cls.pedro = make_resident(first_name='Pedro', last_name='Garcia', date_of_birth=date(1975, 6, 12), zone='3')
+        cls.pedro_typo = make_resident(first_name='Pedro', last_name='Garcia', date_of_birth=date(1975, 6, 21), zone='3')
+        # Shares a block with Maria but is someone else
+        cls.mark = make_resident(first_name='Mark', last_name='Santos', date_of_birth=date(1990, 4, 5), zone='2')
+        make_resident(first_name='Jose', last_name='Rizal', date_of_birth=date(1990, 4, 5), zone='2')
+
+    def pairs(self):
+        return set(DuplicateCandidate.objects.values_list('resident', 'duplicate'))
+
+    def test_soundex(self):
+        self.assertEqual(soundex('Robert'), soundex('Rupert'))
+        self.assertEqual(soundex('Ashcraft'), 'a261')
+        self.assertEqual(soundex('Dela Cruz'), soundex('Delacruz'))
+
+    def test_full_scan_finds_misspellings_and_birth_date_typos(self):
+        out = StringIO()
+        call_command('find_duplicate_residents', '--workers', '1', stdout=out)
+        self.assertIn('(full), found 2 candidate pairs', out.getvalue())
+        self.assertEqual(self.pairs(), {(self.maria.pk, self.marya.pk), (self.pedro.pk, self.pedro_typo.pk)})
+
+    def test_incremental_runs_only_check_changed_residents(self):
+        find_duplicates(workers=1)
+        DuplicateCandidate.objects.filter(resident=self.pedro).update(status='dismissed')
+
+        scan = find_duplicates(workers=1)
+        self.assertFalse(scan.full_scan)
+        self.assertEqual(scan.residents_checked, 0)
+
+        self.mark.first_name = 'Maria'
+        self.mark.save()
+        scan = find_duplicates(workers=1)
+        self.assertEqual(scan.residents_checked, 1)
+        self.assertIn((self.maria.pk, self.mark.pk), self.pairs())
+        self.assertEqual(
+            DuplicateCandidate.objects.get(resident=self.pedro).status, 'dismissed'
+        )
+
+        # A pending pair disappears once the residents no longer match
+        self.marya.first_name = 'Lourdes'
+        self.marya.save()
+        find_duplicates(workers=1)
+        self.assertNotIn((self.maria.pk, self.marya.pk), self.pairs())
+
+    def test_process_pool_gives_the_same_pairs(self):
+        blocks, _ = build_blocks()
+        with mock.patch('residents.duplicates.BLOCKS_PER_TASK', 1):
+            self.assertEqual(score_all(blocks, 0.8, workers=2), score_all(blocks, 0.8, workers=1))
+
+
+class HouseholdAggregateTests(TestCase):
+    def setUp(self):
+        self.head = make_resident(first_name='Head', monthly_income=Decimal('20000'))
+        self.spouse = make_resident(first_name='Spouse', monthly_income=Decimal('10000'))
+        self.child = make_resident(first_name='Child')
+        self.household = Household.objects.create(household_head=self.head, household_number='H-100')
+
+    def assertAggregates(self, members, income, per_capita):
+        self.household.refresh_from_db()
+        self.assertEqual(
+            (self.household.member_count, self.household.computed_monthly_income, self.household.per_capita_income),
+            (members, Decimal(income), Decimal(per_capita))
+        )
+
+    def test_membership_changes_from_either_side(self):
+        self.assertAggregates(0, '0', '0')
+        self.household.members.add(self.head, self.spouse, self.child)
+        self.assertAggregates(3, '30000', '10000')
+
+        self.spouse.households.remove(self.household)
+        self.assertAggregates(2, '20000', '10000')
+
+        self.child.households.add(self.household)
+        self.spouse.households.add(self.household)
+        self.child.households.clear()
+        self.assertAggregates(2, '30000', '15000')
+
+        self.household.members.clear()
+        self.assertAggregates(0, '0', '0')
+
+    def test_resident_saves_and_deletes(self):
+        self.household.members.add(self.head, self.spouse, self.child)
+
+        self.child.monthly_income = Decimal('5000.50')
+        self.child.save()
+        self.assertAggregates(3, '35000.50', '11666.83')
+
+        self.spouse.is_active = False
+        self.spouse.save(update_fields=['is_active'])
+        self.assertAggregates(2, '25000.50', '12500.25')
+
+        self.child.delete()
+        self.assertAggregates(1, '20000', '20000')
+
+    def test_recompute_command(self):
+        self.household.members.add(self.head, self.spouse)
+        Resident.objects.filter(pk=self.spouse.pk).update(monthly_income=Decimal('40000'))
+        self.assertAggregates(2, '30000', '15000')
+
+        call_command('recompute_household_aggregates', stdout=StringIO())
+        self.assertAggregates(2, '60000', '30000')
+
+
+class ResidentApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('partner', password='password')
+        for i in range(6):
+            resident = make_resident(first_name=f'Api{i}', zone=str(i % 2 + 1), gender='MF'[i % 2])
+            household = Household.objects.create(household_head=resident, household_number=f'API-{i}')
+            household.members.add(resident)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_requires_authentication(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/residents/').status_code, 403)
+
+    def test_cursor_pages_and_sparse_fields(self):
+        response = self.client.get('/api/residents/', {'page_size': 4, 'fields': 'id,full_name,age'})
+        data = response.json()
+        self.assertEqual(len(data['results']), 4)
+        self.assertEqual(set(data['results'][0]), {'id', 'full_name', 'age'})
+
+        data = self.client.get(data['next']).json()
+        self.assertEqual([row['full_name'] for row in data['results']], ['Api4 Dela Cruz', 'Api5 Dela Cruz'])
+        self.assertIsNone(data['next'])
+
+    def test_filters(self):
+        data = self.client.get('/api/residents/', {'zone': '2', 'gender': 'F', 'age_band': 'adults'}).json()
+        self.assertEqual(len(data['results']), 3)
+
+        data = self.client.get('/api/households/', {'per_capita_income_below': '1'}).json()
+        self.assertEqual(len(data['results']), 6)
+        self.assertEqual(data['results'][0]['member_count'], 1)
+
+    def test_page_query_count_does_not_grow_with_page_size(self):
+        for url, queries in [('/api/residents/', 3), ('/api/households/', 4)]:
+            for page_size in [2, 6]:
+                with self.subTest(url=url, page_size=page_size), self.assertNumQueries(queries):
+                    self.client.get(url, {'page_size': page_size})
@@ -8,6 +8,8 @@ urlpatterns = [
     path('reports/', views.reports_home, name='reports_home'),
     path('voters-report/', views.voters_report, name='voters_report'),
     path('voters-by-precinct/', views.voters_by_precinct_report, name='voters_by_precinct'),
+    path('voters-by-precinct/<str:precinct_number>/', views.voters_precinct_report, name='voters_precinct'),
+    path('voters-export/<str:export_format>/', views.voters_export, name='voters_export'),
     path('dashboard/voters-by-precinct/', views.voters_precinct_dashboard, name='voters_precinct_dashboard'),
 
     
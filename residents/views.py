@@ -2,27 +2,51 @@
 # Create your views here.
 from django.shortcuts import render
 from .models import Resident
-from collections import defaultdict
 from django.db.models import Count
+from django.http import Http404
+from barangay_ims.db_router import reads_from_replica
+from dashboard.conditional import conditional_on
+from .exports import EXPORT_FORMATS, voter_rows
+from .pagination import paginate
 
+VOTER_ORDERING = ['precinct_number', 'last_name', 'first_name', 'id']
+PRECINCT_VOTER_ORDERING = ['last_name', 'first_name', 'id']
 
-def reports_home(request):
-    return render(request, 'residents/reports_home.html')
+# Columns the voter lists render (name, gender, age, address, IDs)
+VOTER_LIST_FIELDS = [
+    'first_name', 'middle_name', 'last_name', 'suffix', 'gender', 'date_of_birth',
+    'house_number', 'street', 'zone', 'barangay', 'city_municipality', 'province', 'zip_code',
+    'voters_id', 'precinct_number',
+]
 
 
-def voters_precinct_dashboard(request):
-    data = (
-        Resident.objects
-        .filter(
-            voters_id__gt='',
-            precinct_number__gt='',
-            is_active=True
-        )
+def registered_voters():
+    return Resident.objects.filter(
+        voters_id__gt='',
+        precinct_number__gt='',
+        is_active=True
+    )
+
+
+def precinct_totals():
+    """Voter count per precinct from a single GROUP BY"""
+    return (
+        registered_voters()
         .values('precinct_number')
         .annotate(total=Count('id'))
         .order_by('precinct_number')
     )
 
+
+def reports_home(request):
+    return render(request, 'residents/reports_home.html')
+
+
+@reads_from_replica
+@conditional_on('residents.Resident')
+def voters_precinct_dashboard(request):
+    data = precinct_totals()
+
     labels = [item['precinct_number'] for item in data]
     totals = [item['total'] for item in data]
 
@@ -32,37 +56,64 @@ def voters_precinct_dashboard(request):
         'data': data
     })
 
+@reads_from_replica
+@conditional_on('residents.Resident')
 def voters_report(request):
-    voters = Resident.objects.exclude(voters_id='').exclude(voters_id__isnull=True)
+    voters = registered_voters().only(*VOTER_LIST_FIELDS).with_age()
+
+    page = paginate(request, voters, VOTER_ORDERING)
+
     return render(request, 'residents/voters_report.html', {
-        'voters': voters
+        'voters': page.object_list,
+        'page': page,
     })
 
+@reads_from_replica
+@conditional_on('residents.Resident')
 def voters_by_precinct_report(request):
-    voters = Resident.objects.filter(
-        voters_id__gt='',
-        precinct_number__gt='',
-        is_active=True
-    ).order_by('precinct_number', 'last_name', 'first_name')
-
-    precincts = defaultdict(list)
-
-    for voter in voters:
-        precincts[voter.precinct_number].append(voter)
+    """Precinct headers with voter counts; each precinct's list is its own page"""
+    precincts = [
+        {'number': row['precinct_number'], 'total': row['total']}
+        for row in precinct_totals()
+    ]
 
     return render(request, 'residents/voters_by_precinct.html', {
-        'precincts': dict(precincts)
+        'precincts': precincts,
+        'total_voters': sum(precinct['total'] for precinct in precincts),
+    })
+
+@reads_from_replica
+@conditional_on('residents.Resident')
+def voters_precinct_report(request, precinct_number):
+    """Voters of a single precinct, paged in name order"""
+    voters = registered_voters().filter(precinct_number=precinct_number)
+    total = voters.count()
+    if not total:
+        raise Http404("No voters in this precinct")
+
+    page = paginate(request, voters.only(*VOTER_LIST_FIELDS).with_age(), PRECINCT_VOTER_ORDERING)
+
+    return render(request, 'residents/voters_precinct.html', {
+        'precinct_number': precinct_number,
+        'total': total,
+        'voters': page.object_list,
+        'page': page,
     })
 
 
+@reads_from_replica
+@conditional_on('residents.Resident')
+def voters_export(request, export_format):
+    """Download the voter list, optionally for one precinct, as CSV or XLSX"""
+    if export_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export format")
 
-def voters_report(request):
-    voters = Resident.objects.filter(
-        voters_id__gt='',
-        precinct_number__gt='',
-        is_active=True
-    ).order_by('precinct_number', 'last_name', 'first_name')
+    voters = registered_voters()
 
-    return render(request, 'residents/voters_report.html', {
-        'voters': voters
-    })
+    filename = 'voters'
+    precinct = request.GET.get('precinct')
+    if precinct:
+        voters = voters.filter(precinct_number=precinct)
+        filename = f'voters-precinct-{precinct}'
+
+    return EXPORT_FORMATS[export_format](voter_rows(voters, VOTER_ORDERING), filename)